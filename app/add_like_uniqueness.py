@@ -0,0 +1,11 @@
+"""
+Add a unique (question_id, session_id) constraint to question_likes.
+Removes duplicate likes left by double-taps first and recounts likes_count.
+
+Now migration 2 in db.migrations; this runs every pending migration.
+"""
+import asyncio
+from db.migrations import main
+
+if __name__ == "__main__":
+    asyncio.run(main())
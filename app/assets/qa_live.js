@@ -0,0 +1,102 @@
+// live Q&A updates //
+
+// Apply a server-rendered question fragment pushed over SSE instead of
+// refetching the whole list. Falls back to `refetch` when the list can't
+// be patched in place (e.g. it is still showing the empty placeholder).
+// The moderator console passes {keepHidden: true}: hidden cards stay listed.
+function applyQuestionUpdate(data, refetch, options) {
+    const question = data.question || {};
+    const list = document.getElementById('questions-list');
+    if (!list || !question.id) return;
+
+    const existing = document.getElementById('question-' + question.id);
+    const keepHidden = options && options.keepHidden;
+
+    if (data.action === 'deleted' || (question.is_visible === false && !keepHidden)) {
+        if (existing) existing.remove();
+        return;
+    }
+
+    if (data.action === 'like_updated' && !data.html) {
+        const count = document.getElementById('likes-' + question.id);
+        if (count) count.textContent = question.likes_count;
+        return;
+    }
+
+    if (!data.html) return;
+
+    const template = document.createElement('template');
+    template.innerHTML = data.html.trim();
+    const card = template.content.firstElementChild;
+    // A merged update may carry a newer like count than its rendered card
+    const count = card.querySelector('#likes-' + question.id);
+    if (count && question.likes_count !== undefined) count.textContent = question.likes_count;
+
+    if (existing) {
+        // Fragments are rendered once for everyone; keep this user's like highlight
+        const likedBefore = existing.querySelector('.fa-heart.text-red');
+        const heart = card.querySelector('.fa-heart');
+        if (likedBefore && heart) heart.classList.add('text-red');
+        existing.replaceWith(card);
+    } else if (!list.querySelector('[data-question-id]')) {
+        refetch();
+        return;
+    } else {
+        const activeTab = document.querySelector('.tab.tab-active');
+        // Fresh questions lead both the recent and trending lists
+        if (activeTab && (activeTab.id === 'recent-tab' || activeTab.id === 'trending-tab')) {
+            list.prepend(card);
+        } else {
+            // Keep the lazy-load sentinel last
+            list.insertBefore(card, document.getElementById('questions-more'));
+        }
+    }
+    htmx.process(card);
+    formatTimeAgo(card);
+}
+
+// Add pushed counter changes ({total: 1, visible: -1, ...}) to the moderator stats.
+function applyStatsDelta(deltas) {
+    Object.keys(deltas).forEach(function(name) {
+        const el = document.getElementById('stat-' + name);
+        if (el) el.textContent = Math.max(0, (parseInt(el.textContent, 10) || 0) + deltas[name]);
+    });
+}
+
+// Question cards are cached server-side, so they carry an absolute
+// <time datetime="..."> and the "5m ago" label is filled in here.
+function formatTimeAgo(root) {
+    const now = Date.now();
+    (root || document).querySelectorAll('time.time-ago').forEach(function(el) {
+        const seconds = Math.floor((now - Date.parse(el.getAttribute('datetime'))) / 1000);
+        if (isNaN(seconds)) return;
+        if (seconds >= 86400) {
+            el.textContent = Math.floor(seconds / 86400) + 'd ago';
+        } else if (seconds > 3600) {
+            el.textContent = Math.floor(seconds / 3600) + 'h ago';
+        } else if (seconds > 60) {
+            el.textContent = Math.floor(seconds / 60) + 'm ago';
+        } else {
+            el.textContent = 'just now';
+        }
+    });
+}
+
+// A card pushed live may also arrive in a page loaded later; keep the first copy.
+function dropDuplicateCards() {
+    const seen = new Set();
+    document.querySelectorAll('#questions-list [data-question-id]').forEach(function(card) {
+        const id = card.getAttribute('data-question-id');
+        if (seen.has(id)) card.remove(); else seen.add(id);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    formatTimeAgo(document);
+    // outerHTML swaps replace the target, so rescan the page
+    document.body.addEventListener('htmx:afterSwap', function() {
+        dropDuplicateCards();
+        formatTimeAgo(document);
+    });
+    setInterval(function() { formatTimeAgo(document); }, 30000);
+});
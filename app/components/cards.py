@@ -1,8 +1,10 @@
 from typing import List
 from .icon import Icon, BrandIcon
+from .image import ResponsiveImg
 from db.schemas import Speaker, Event, PrayerTime, Sponsor
 from fasthtml.components import Div, Span, Figure, Img, H2, P, Button, A
 from datetime import datetime
+from core.assets import asset_url
 
 def homepage_card(icon_name : str, title: str, card_color: str, bold_style: bool = False, **kwargs) -> A:
     custom_cls = kwargs.pop('cls', '')  # Remove 'cls' from kwargs if present
@@ -10,7 +12,7 @@ def homepage_card(icon_name : str, title: str, card_color: str, bold_style: bool
         custom_cls += ' font-bold border-2 border-pink-300 shadow-lg'
     return A(
                 P(title),
-                Img(src=icon_name),
+                Img(src=asset_url(icon_name)),
                 cls=f'card-panel gray custom-card {card_color} {custom_cls}',
                 **kwargs
             )
@@ -18,7 +20,7 @@ def homepage_card(icon_name : str, title: str, card_color: str, bold_style: bool
 def brief_speaker_card(speaker: Speaker) -> A:
     return A(
             Figure(
-                    Img(src=speaker.image_url, alt=speaker.name),
+                    ResponsiveImg(speaker.image_url, '75px', alt=speaker.name),
                     cls='figure'
                 ),
             Div(
@@ -39,8 +41,9 @@ def brief_speaker_card(speaker: Speaker) -> A:
 def speaker_page(speaker: Speaker) -> Div:
     return Div(
             Figure(
-                Img(
-                    src=speaker.image_url,
+                ResponsiveImg(
+                    speaker.image_url,
+                    '200px',
                     alt=speaker.name,
                     cls='rounded-xl'
                 ),
@@ -85,7 +88,7 @@ def prayer_times_page(prayers: List[PrayerTime]) -> Div:
 def brief_sponsor_card(sponsor: Sponsor) -> Div:
     return A(
             Figure(
-                    Img(src=f'{sponsor.image_url}', alt=sponsor.name),
+                    ResponsiveImg(f'{sponsor.image_url}', '100px', alt=sponsor.name),
                     cls='figure'
                 ),
             Div(
@@ -105,8 +108,9 @@ def brief_sponsor_card(sponsor: Sponsor) -> Div:
 def sponsor_page(sponsor: Sponsor) -> Div:
     return Div(
             Figure(
-                Img(
-                        src=f'{sponsor.image_url}',
+                ResponsiveImg(
+                        f'{sponsor.image_url}',
+                        '200px',
                         alt=sponsor.name,
                         cls='rounded'
                     ),
@@ -145,7 +149,7 @@ def session_speaker_card(session: Event, speakers: List[Speaker]) -> Div:
                     *[
                         A(
                             Div(
-                                Img(src=speaker.image_url, alt=speaker.name),
+                                ResponsiveImg(speaker.image_url, '48px', alt=speaker.name),
                                 cls='w-12 h-12 rounded-full'
                             ),
                             href=f'/speakers/{speaker.id}',
@@ -0,0 +1,9 @@
+from fasthtml.components import Img
+from core.images import responsive_images
+
+def ResponsiveImg(src: str, sizes: str, **kwargs) -> Img:
+    """Img that lets the browser pick a resized WebP variant for `sizes` (its rendered width)"""
+    srcset = responsive_images.srcset(src)
+    if srcset:
+        kwargs.update(srcset=srcset, sizes=sizes)
+    return Img(src=src, **kwargs)
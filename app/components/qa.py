@@ -1,23 +1,28 @@
 from fasthtml.common import *
 from db.models import Event
+from .timeline import CONFERENCE_TZ
+from utils.question_cache import card_cache
+
+def LikeButton(question_id: str, likes_count: int, user_liked=False):
+    """Guest like toggle; the like route swaps just this button"""
+    return Button(
+        I(cls=f"fas fa-heart {'text-red' if user_liked else ''}"),
+        Span(str(likes_count), cls="ml-2", id=f"likes-{question_id}"),
+        cls=f"btn btn-sm text-primary",
+        style="background: none; border: 1px solid var(--primary-color);",
+        hx_post=f"/qa/question/{question_id}/like",
+        hx_target="this",
+        hx_swap="outerHTML",
+        id=f"like-btn-{question_id}"
+    )
 
 def QuestionCard(question, show_admin_controls=False, user_liked=False):
     """Display a single question card"""
     question_id = str(question.id)
     
-    # Format timestamp
-    from datetime import datetime
-    now = datetime.now(question.created_at.tzinfo)
-    time_diff = now - question.created_at
-    
-    if time_diff.days > 0:
-        time_ago = f"{time_diff.days}d ago"
-    elif time_diff.seconds > 3600:
-        time_ago = f"{time_diff.seconds // 3600}h ago"
-    elif time_diff.seconds > 60:
-        time_ago = f"{time_diff.seconds // 60}m ago"
-    else:
-        time_ago = "just now"
+    # Timestamp: qa_live.js turns it into "5m ago"; the markup itself never
+    # depends on the current time, so rendered cards can be cached
+    created_at = question.created_at.astimezone(CONFERENCE_TZ)
     
     # Build the card
     card_classes = "timeline-box"
@@ -28,7 +33,11 @@ def QuestionCard(question, show_admin_controls=False, user_liked=False):
             # Question header
             Div(
                 Span(question.nickname, cls="font-semibold text-black"),
-                Span(f" • {time_ago}", cls="text-sm text-base-content/60"),
+                Span(
+                    " • ",
+                    Time(created_at.strftime("%I:%M %p").lstrip("0"), datetime=created_at.isoformat(), cls="time-ago"),
+                    cls="text-sm text-base-content/60"
+                ),
                 Span(
                     I(cls="fas fa-check-circle text-success ml-2"),
                     " Answered",
@@ -49,18 +58,11 @@ def QuestionCard(question, show_admin_controls=False, user_liked=False):
             # Actions row
             Div(
                 # Like button
-                Button(
-                    I(cls=f"fas fa-heart {'text-red' if user_liked else ''}"),
-                    Span(str(question.likes_count), cls="ml-2", id=f"likes-{question_id}"),
-                    cls=f"btn btn-sm text-primary",
-                    style="background: none; border: 1px solid var(--primary-color);",
-                    hx_post=f"/qa/question/{question_id}/like",
-                    hx_target=f"#question-{question_id}",
-                    hx_swap="outerHTML",
-                    id=f"like-btn-{question_id}"
-                ) if not show_admin_controls else Div(
+                LikeButton(question_id, question.likes_count, user_liked)
+                if not show_admin_controls else Div(
                     I(cls="fas fa-heart text-error"),
-                    Span(str(question.likes_count), cls="ml-2"),
+                    # Patched by qa_live.js on like_updated, like the guest count
+                    Span(str(question.likes_count), cls="ml-2", id=f"likes-{question_id}"),
                     cls="flex items-center gap-2"
                 ),
                 
@@ -102,6 +104,25 @@ def QuestionCard(question, show_admin_controls=False, user_liked=False):
         data_question_id=question_id  # Add this for easy querying in tests
     )
 
+def CachedQuestionCard(question, show_admin_controls=False, user_liked=False):
+    """
+    QuestionCard rendered to HTML once per (question, version, role, liked).
+    Only likes_count, is_visible and is_answered change after a question is
+    created, so together they act as the card's version.
+    """
+    user_liked = bool(user_liked) and not show_admin_controls
+    key = (
+        str(question.id),
+        (question.likes_count, question.is_visible, question.is_answered),
+        show_admin_controls,
+        user_liked
+    )
+    html = card_cache.get(key)
+    if html is None:
+        html = to_xml(QuestionCard(question, show_admin_controls, user_liked))
+        card_cache.put(key, html)
+    return NotStr(html)
+
 def SessionStatusTag(is_active: bool, text_cls="text-sm"):
     """Tag to show session status"""
     if is_active:
@@ -200,8 +221,25 @@ def QuestionForm(event_id: int, initial_nickname="Anonymous", is_active=True, sh
         cls="px-6"
     )
 
-def QuestionsListContainer(questions, show_admin_controls=False, user_likes=None):
-    """Container for list of questions"""
+def LoadMoreSentinel(next_url: str):
+    """Placeholder at the end of a page; swaps itself for the next page when scrolled into view"""
+    return Div(
+        Span(cls="loading loading-dots loading-md"),
+        id="questions-more",
+        hx_get=next_url,
+        hx_trigger="revealed",
+        hx_swap="outerHTML",
+        cls="flex justify-center py-4 text-base-content/50"
+    )
+
+def QuestionsPage(questions, show_admin_controls=False, user_likes=None, next_url=None):
+    """Cards of one page (plus the sentinel for the next), appended in place of the previous sentinel"""
+    user_likes = user_likes or set()
+    cards = [CachedQuestionCard(q, show_admin_controls, str(q.id) in user_likes) for q in questions]
+    return (*cards, LoadMoreSentinel(next_url)) if next_url else tuple(cards)
+
+def QuestionsListContainer(questions, show_admin_controls=False, user_likes=None, next_url=None):
+    """Container for list of questions; `next_url` lazily loads the following pages"""
     user_likes = user_likes or set()
     
     if not questions:
@@ -217,12 +255,36 @@ def QuestionsListContainer(questions, show_admin_controls=False, user_likes=None
         )
     
     return Div(
-        *[QuestionCard(q, show_admin_controls, str(q.id) in user_likes) for q in questions],
+        *QuestionsPage(questions, show_admin_controls, user_likes, next_url),
         id="questions-list",
         style="height: 100%;",
         cls="blue-background p-4 flex flex-col gap-4 mb-8",
     )
 
+def ModeratorStats(stats: dict):
+    """Question counters on the moderator console; ids let live deltas update them in place"""
+    return Div(
+        Div(
+            Span(str(stats["total"]), id="stat-total", cls="text-3xl font-bold"),
+            Span("Total Questions", cls="text-sm text-base-content/70"),
+            cls="stat"
+        ),
+        Div(
+            Span(str(stats["visible"]), id="stat-visible", cls="text-3xl font-bold"),
+            Span("Visible", cls="text-sm text-base-content/70"),
+            cls="stat",
+            style="color: #00A651;"
+        ),
+        Div(
+            Span(str(stats["answered"]), id="stat-answered", cls="text-3xl font-bold"),
+            Span("Answered", cls="text-sm text-base-content/70"),
+            cls="stat",
+            style="color: var(--primary-color);"
+        ),
+        id="question-stats",
+        cls="stats shadow mb-6"
+    )
+
 def SessionCard(event : Event, is_moderator: bool = False, total_questions: int = None, hidden_questions: int = None):
     """
     Session card component for Q&A sessions
@@ -1,14 +1,18 @@
 from .icon import Icon
+from .image import ResponsiveImg
 from typing import List
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from db.schemas import Event, Speaker
-from fasthtml.components import Ul, Li, Div, Hr, H3, H4, A, Img, Span
+from fasthtml.components import Ul, Li, Div, Hr, H3, H4, A, Span
+
+# Event times are shown in the conference venue's local time
+CONFERENCE_TZ = ZoneInfo('America/Chicago')
 
 def AvatarCircle(src: str, alt: str, **kwargs) -> Div:
     return Div(
             Div(
-                Img(src=src, alt=alt, cls='avatar circle'),
+                ResponsiveImg(src, '40px', alt=alt, cls='avatar circle'),
                 cls='w-10 rounded-full'
                 ),
             cls='avatar' + ' ' + kwargs.get('cls', '')
@@ -26,7 +30,7 @@ def SpeakerCardBody(speakers_data: List[Speaker]) -> List:
                 Div(
                     *[
                         Div(
-                            Img(src=speaker.image_url, alt=speaker.name, cls='avatar circle'),
+                            ResponsiveImg(speaker.image_url, '40px', alt=speaker.name, cls='avatar circle'),
                             cls='w-10 h-10 rounded-full'
                         ) for speaker in speakers_data
                     ],
@@ -51,7 +55,7 @@ def agenda_timeline(events: List[Event]):
                 cls='timeline-start'
             ),
             Div(
-                Icon('circle', cls='text-secondary' if datetime.now(ZoneInfo('America/Chicago')) > event.start_time else 'text-primary'),
+                Icon('circle', cls='text-secondary' if datetime.now(CONFERENCE_TZ) > event.start_time else 'text-primary'),
                 cls='timeline-middle'
             ),
             Div(
@@ -69,7 +73,7 @@ def agenda_timeline(events: List[Event]):
                     href=f'/session/{event.id}' if event.description else None,
                 ),
                 cls='timeline-end ml-4'),
-            Hr(cls='border-secondary' if datetime.now(ZoneInfo('America/Chicago')) > event.start_time else 'border-primary'),
+            Hr(cls='border-secondary' if datetime.now(CONFERENCE_TZ) > event.start_time else 'border-primary'),
         ) for i, event in enumerate(events)],
         cls='timeline timeline-vertical timeline-compact p-8'    
         )
@@ -82,7 +86,7 @@ def agenda_timeline_2(events: List[Event]):
                 cls='timeline-start'
             ),
             Div(
-                Icon('circle', cls='text-primary' if datetime.now(ZoneInfo('America/Chicago')).hour > event.start_time.hour else 'text-secondary'),
+                Icon('circle', cls='text-primary' if datetime.now(CONFERENCE_TZ).hour > event.start_time.hour else 'text-secondary'),
                 
                 cls='timeline-middle'
             ),
@@ -96,7 +100,7 @@ def agenda_timeline_2(events: List[Event]):
                     href=f'/session/{event.id}' if event.description else None,
                 ),
                 cls='timeline-end ml-4'),
-            Hr(cls='border-primary' if datetime.now(ZoneInfo('America/Chicago')).hour > event.end_time.hour else 'border-secondary'),
+            Hr(cls='border-primary' if datetime.now(CONFERENCE_TZ).hour > event.end_time.hour else 'border-secondary'),
         ) for i, event in enumerate(events)],
         cls='timeline timeline-vertical timeline-compact p-8'    
         )
\ No newline at end of file
@@ -1,5 +1,6 @@
 from fasthtml.common import *
 from core.static import fetch_static_files
+from core.assets import asset_url
 
 tlink = (Script(src='https://unpkg.com/tailwindcss-cdn@3.4.3/tailwindcss.js'),)
 dlink = [Link(
@@ -24,7 +25,7 @@ materialLink = Link(
 )
 htmxScript = Script(src='https://unpkg.com/htmx.org@1.9.10')
 static_fils_hdrs = fetch_static_files()
-favicon_link = Link(rel='icon', type='image/x-icon', href='/assets/favicon.ico'),
+favicon_link = Link(rel='icon', type='image/x-icon', href=asset_url('favicon.ico')),
 
 app = FastHTML(hdrs=[tlink, favicon_link, dlink, falink, fontLink, materialLink, htmxScript, *static_fils_hdrs])
 
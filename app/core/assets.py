@@ -0,0 +1,219 @@
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import FileResponse, Response
+
+from core.precompress import PRECOMPRESSED_DIR, Variant, load_variants
+
+ASSETS_DIR = Path(__file__).parent.parent / 'assets'
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Plain URLs (CSS url(), database image paths) are revalidated with the ETag
+REVALIDATE = "public, no-cache"
+
+# name.<fingerprint>.ext, as produced by AssetIndex.url()
+FINGERPRINTED = re.compile(r"^(?P<stem>.+)\.(?P<fingerprint>[0-9a-f]{10})(?P<suffix>\.[^./]+)$")
+
+@dataclass(frozen=True)
+class Asset:
+    path: str  # Relative to the assets directory, with forward slashes
+    file: Path
+    size: int
+    media_type: str
+    etag: str  # Strong validator from the content hash
+    fingerprint: str
+    body: Optional[bytes]  # Kept in memory when small enough
+    variants: Tuple[Variant, ...] = ()  # Precompressed encodings, best first
+
+    @property
+    def fingerprinted_path(self) -> str:
+        stem, dot, suffix = self.path.rpartition(".")
+        if not dot or "/" in suffix:
+            return f"{self.path}.{self.fingerprint}"
+        return f"{stem}.{self.fingerprint}.{suffix}"
+
+    @classmethod
+    def load(cls, root: Path, file: Path, max_memory_bytes: int) -> "Asset":
+        content = file.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        return cls(
+            path=file.relative_to(root).as_posix(),
+            file=file,
+            size=len(content),
+            media_type=mimetypes.guess_type(file.name)[0] or "application/octet-stream",
+            etag=f'"{digest[:32]}"',
+            fingerprint=digest[:10],
+            body=content if len(content) <= max_memory_bytes else None
+        )
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 specifies for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def choose_variant(accept_encoding: Optional[str], variants: Tuple[Variant, ...]) -> Optional[Variant]:
+    """Best precompressed variant the client accepts (highest q, then our preference), or None for identity"""
+    if not accept_encoding or not variants:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for variant in variants:
+        q = accepted.get(variant.encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = variant, q
+    return best
+
+class AssetIndex:
+    """
+    Table of the files under app/assets, built once per process: on
+    construction, or on first use when created with lazy=True.
+
+    Each file is hashed once; the hash is its strong ETag and the
+    fingerprint in the URL returned by url(), so a deploy only changes the
+    URLs of files that actually changed. Fingerprinted URLs are served as
+    immutable, plain ones with no-cache (revalidated via If-None-Match),
+    and files up to MAX_MEMORY_BYTES are served from memory without
+    touching the disk. Text-like files also get gzip/brotli variants (see
+    core.precompress), chosen per request from Accept-Encoding.
+    """
+
+    MAX_MEMORY_BYTES = int(os.getenv('ASSET_MEMORY_MAX_BYTES', 256 * 1024))
+
+    def __init__(
+        self,
+        root: Path = ASSETS_DIR,
+        max_memory_bytes: Optional[int] = None,
+        precompressed_dir: Optional[Path] = PRECOMPRESSED_DIR,
+        prefix: str = "/assets",
+        lazy: bool = False
+    ):
+        self.root = root
+        self.prefix = prefix
+        self.precompressed_dir = precompressed_dir
+        self.max_memory_bytes = self.MAX_MEMORY_BYTES if max_memory_bytes is None else max_memory_bytes
+        self._assets: Optional[Dict[str, Asset]] = None
+        self._fingerprinted: Dict[str, Asset] = {}
+        if not lazy:
+            self.rebuild()
+
+    def rebuild(self):
+        assets = {}
+        for file in sorted(self.root.rglob('*')) if self.root.is_dir() else ():
+            if file.is_file() and '__pycache__' not in file.parts:
+                asset = Asset.load(self.root, file, self.max_memory_bytes)
+                if self.precompressed_dir is not None:
+                    variants = load_variants(asset, asset.body or file.read_bytes(), self.max_memory_bytes, self.precompressed_dir)
+                    asset = replace(asset, variants=variants)
+                assets[asset.path] = asset
+        self._assets = assets
+        self._fingerprinted = {a.fingerprinted_path: a for a in assets.values()}
+
+    def _table(self) -> Dict[str, Asset]:
+        if self._assets is None:
+            self.rebuild()
+        return self._assets
+
+    def __len__(self) -> int:
+        return len(self._table())
+
+    def paths(self):
+        return self._table().keys()
+
+    def assets(self):
+        return self._table().values()
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self._table().get(path.lstrip('/'))
+
+    def url(self, path: str) -> str:
+        """Fingerprinted URL for a file in the index; other paths are returned unchanged"""
+        asset = self.get(path)
+        return f"{self.prefix}/{asset.fingerprinted_path}" if asset else path
+
+    def from_url(self, url: str) -> Optional[Asset]:
+        """Asset an app URL points at (fingerprinted, plain or the bare /<name>.<ext> form), if any"""
+        if not url.startswith("/") or url.startswith("//"):
+            return None  # External
+        path = url.split("?", 1)[0]
+        if path.startswith(self.prefix + "/"):
+            path = path[len(self.prefix) + 1:]
+        return self.lookup(path)[0]
+
+    def lookup(self, path: str):
+        """(asset, immutable) for a requested path, or (None, False)"""
+        path = path.lstrip('/')
+        assets = self._table()
+        asset = self._fingerprinted.get(path)
+        if asset is not None:
+            return asset, True
+        asset = assets.get(path)
+        if asset is None:
+            # A fingerprint from before the last deploy: serve the current file, but not as immutable
+            match = FINGERPRINTED.match(path)
+            if match:
+                asset = assets.get(match["stem"] + match["suffix"])
+        return asset, False
+
+    def response(self, request, path: str) -> Response:
+        asset, immutable = self.lookup(path)
+        if asset is None:
+            return Response("File not found", status_code=404)
+
+        headers = {"ETag": asset.etag, "Cache-Control": IMMUTABLE if immutable else REVALIDATE}
+        body, file = asset.body, asset.file
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+            variant = choose_variant(request.headers.get("accept-encoding"), asset.variants)
+            if variant is not None:
+                # Each representation needs its own strong validator
+                headers["ETag"] = f'{asset.etag[:-1]}-{variant.encoding}"'
+                headers["Content-Encoding"] = variant.encoding
+                body, file = variant.body, variant.file
+
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if body is not None:
+            return Response(body, media_type=asset.media_type, headers=headers)
+        return FileResponse(file, media_type=asset.media_type, headers=headers)
+
+    def stats(self):
+        assets = self._table().values()
+        in_memory = [a for a in assets if a.body is not None]
+        return {
+            "files": len(assets),
+            "in_memory": len(in_memory),
+            "memory_bytes": sum(a.size for a in in_memory),
+            "precompressed": sum(1 for a in assets if a.variants),
+            # Bytes each encoding saves over the identity files, summed across assets
+            "saved_bytes": {
+                encoding: sum(a.size - v.size for a in assets for v in a.variants if v.encoding == encoding)
+                for encoding in sorted({v.encoding for a in assets for v in a.variants})
+            }
+        }
+
+# Global asset index; hashed and precompressed on first use (the app's page
+# headers), so importing this module stays cheap for tools and tests
+asset_index = AssetIndex(lazy=True)
+
+def asset_url(path: str) -> str:
+    return asset_index.url(path)
@@ -0,0 +1,135 @@
+"""
+Responsive image variants.
+
+Speaker photos and sponsor logos are full-size PNG/JPEG files, shown as
+40-200px avatars and logos. Ahead of time (at image build) this resizes
+every raster image pages show with <img> to a few widths as WebP, caching the
+results on disk under names keyed by the source's content fingerprint, so
+unchanged images are not re-encoded. At runtime the variants are served
+from /images and pages list them in srcset; Pillow is only needed to
+build them (pip install '.[images]', or uv sync --extra images):
+
+    cd app && python -m core.images
+"""
+import os
+import re
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.assets import AssetIndex, asset_index
+
+IMAGE_VARIANTS_DIR = Path(os.getenv('IMAGE_VARIANTS_DIR', Path(__file__).parent.parent / '.responsive'))
+
+# Target widths in CSS pixels x device pixel ratio; sources are never upscaled
+WIDTHS = tuple(int(w) for w in os.getenv('IMAGE_WIDTHS', '80,160,320,640,1280').split(','))
+QUALITY = int(os.getenv('IMAGE_QUALITY', 80))
+
+RASTER_TYPES = {"image/png", "image/jpeg"}
+
+# Backgrounds drawn by main.css url(), which has no image-set() for them, so
+# variants would never be requested
+CSS_ONLY = tuple(os.getenv('IMAGE_CSS_ONLY', 'banner*.png,background.png').split(','))
+
+# <name>.<source fingerprint>.<width>w.webp
+VARIANT_NAME = re.compile(r"^(?P<path>.+)\.(?P<fingerprint>[0-9a-f]{10})\.(?P<width>\d+)w\.webp$")
+
+def target_widths(source_width: int) -> List[int]:
+    return [w for w in WIDTHS if w < source_width] + [source_width]
+
+def is_css_only(path: str) -> bool:
+    return any(fnmatch(path, pattern) for pattern in CSS_ONLY)
+
+def variant_path(asset, width: int) -> str:
+    return f"{asset.path.rsplit('.', 1)[0]}.{asset.fingerprint}.{width}w.webp"
+
+def build(index: AssetIndex = asset_index, out_dir: Path = IMAGE_VARIANTS_DIR) -> List[dict]:
+    """Write the missing variants of every raster image and delete stale ones; returns a row per image"""
+    from PIL import Image
+
+    rows, keep = [], set()
+    for asset in index.assets():
+        if asset.media_type not in RASTER_TYPES or is_css_only(asset.path):
+            continue
+        with Image.open(asset.file) as source:
+            source.load()
+            image = source.convert("RGBA" if source.mode in ("RGBA", "LA", "P") else "RGB")
+        row = {"path": asset.path, "size": asset.size, "variants": {}}
+        for width in target_widths(image.width):
+            file = out_dir / variant_path(asset, width)
+            keep.add(file)
+            if not file.is_file():
+                height = max(1, round(image.height * width / image.width))
+                resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                file.parent.mkdir(parents=True, exist_ok=True)
+                resized.save(file, "WEBP", quality=QUALITY, method=6)
+            row["variants"][width] = file.stat().st_size
+        rows.append(row)
+
+    for file in list(out_dir.rglob('*.webp')) if out_dir.is_dir() else ():
+        if file not in keep:
+            file.unlink()
+    return rows
+
+class ResponsiveImages:
+    """
+    srcset lookup for the variants written by build().
+
+    Variants are matched to app/assets by the source fingerprint in their
+    name, so variants left over from an older version of an image are never
+    listed. Images without variants (not built yet, or Pillow missing at
+    build time) simply keep their plain src. With lazy=True the lookup is
+    built on first use.
+    """
+
+    def __init__(self, assets: AssetIndex = asset_index, variants_dir: Path = IMAGE_VARIANTS_DIR, lazy: bool = False):
+        self.assets = assets
+        self.index = AssetIndex(variants_dir, precompressed_dir=None, prefix="/images", lazy=lazy)
+        # Source path -> ((width, url), ...) narrowest first
+        self._srcsets: Optional[Dict[str, Tuple[Tuple[int, str], ...]]] = None
+        if not lazy:
+            self.rebuild()
+
+    def rebuild(self):
+        self.index.rebuild()
+        sources = {(a.path.rsplit('.', 1)[0], a.fingerprint): a for a in self.assets.assets()}
+        found: Dict[str, List[Tuple[int, str]]] = {}
+        for path in self.index.paths():
+            match = VARIANT_NAME.match(path)
+            source = sources.get((match["path"], match["fingerprint"])) if match else None
+            if source is not None:
+                found.setdefault(source.path, []).append((int(match["width"]), self.index.url(path)))
+        self._srcsets = {path: tuple(sorted(widths)) for path, widths in found.items()}
+
+    def _table(self) -> Dict[str, Tuple[Tuple[int, str], ...]]:
+        if self._srcsets is None:
+            self.rebuild()
+        return self._srcsets
+
+    def srcset(self, src: str) -> Optional[str]:
+        """srcset value for an image URL, or None when there are no variants for it"""
+        asset = self.assets.from_url(src) if src else None
+        widths = self._table().get(asset.path) if asset else None
+        if not widths:
+            return None
+        return ", ".join(f"{url} {width}w" for width, url in widths)
+
+    def stats(self):
+        return {"images": len(self._table()), "variants": len(self.index)}
+
+# Global responsive image lookup, built on first use
+responsive_images = ResponsiveImages(lazy=True)
+
+def main():
+    try:
+        rows = build()
+    except ImportError:
+        print("❌ Pillow is not installed; no image variants were built")
+        raise
+    for row in rows:
+        variants = ", ".join(f"{w}w {size // 1024}KB" for w, size in row["variants"].items())
+        print(f"{row['path']:<24}{row['size'] // 1024:>6}KB -> {variants}")
+    print(f"✅ Built variants for {len(rows)} images in {IMAGE_VARIANTS_DIR}")
+
+if __name__ == "__main__":
+    main()
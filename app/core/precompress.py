@@ -0,0 +1,132 @@
+"""
+Precompressed variants of the static assets.
+
+Text-like assets (CSS, JS, SVG, ICO, ...) are compressed once, at image
+build or app startup, into gzip and brotli files keyed by the content
+fingerprint. The asset route then picks a variant from Accept-Encoding
+without compressing anything per request. Run at build time to write them
+and print the savings per asset (fails if brotli is missing, unless
+--allow-gzip-only is given):
+
+    cd app && python -m core.precompress
+"""
+import argparse
+import gzip
+import os
+import sys
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:  # A pinned dependency; without it only gzip variants are made
+    brotli = None
+
+PRECOMPRESSED_DIR = Path(os.getenv('ASSET_PRECOMPRESSED_DIR', Path(__file__).parent.parent / '.precompressed'))
+
+# Content-Encoding token -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# Images other than SVG/ICO are already compressed; recompressing them saves nothing
+COMPRESSIBLE_TYPES = {
+    "application/javascript", "application/json", "application/xml", "image/svg+xml",
+    "image/vnd.microsoft.icon", "image/x-icon", "text/javascript"
+}
+
+# Variants that save less than this fraction are not worth a second representation
+MIN_SAVING = 0.05
+
+class Variant(NamedTuple):
+    encoding: str
+    size: int
+    file: Path
+    body: Optional[bytes]  # Kept in memory when small enough
+
+def is_compressible(media_type: str) -> bool:
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+def available_encodings() -> List[str]:
+    return [e for e in ENCODINGS if e != "br" or brotli is not None]
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    # mtime=0 keeps the output identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def variant_file(asset, encoding: str, out_dir: Path = PRECOMPRESSED_DIR) -> Path:
+    return out_dir / f"{asset.fingerprinted_path}{ENCODINGS[encoding]}"
+
+def load_variants(asset, content: bytes, max_memory_bytes: int, out_dir: Path = PRECOMPRESSED_DIR) -> tuple:
+    """
+    Variants of one asset, read from out_dir or compressed now (and written
+    there when possible). Returns the ones worth serving, best first.
+    """
+    if not is_compressible(asset.media_type):
+        return ()
+    variants = []
+    for encoding in available_encodings():
+        file = variant_file(asset, encoding, out_dir)
+        if file.is_file():
+            data = file.read_bytes()
+        else:
+            data = compress(content, encoding)
+            try:
+                file.parent.mkdir(parents=True, exist_ok=True)
+                file.write_bytes(data)
+            except OSError:
+                pass  # Read-only image: serve from memory only
+        if len(data) <= asset.size * (1 - MIN_SAVING):
+            variants.append(Variant(encoding, len(data), file, data if len(data) <= max_memory_bytes else None))
+    return tuple(variants)
+
+def prune(index, out_dir: Path = PRECOMPRESSED_DIR) -> int:
+    """Delete variants of files that changed or were removed; returns how many"""
+    keep = {variant_file(a, e, out_dir) for a in index.assets() for e in ENCODINGS}
+    stale = [f for f in out_dir.rglob('*') if f.is_file() and f not in keep] if out_dir.is_dir() else []
+    for file in stale:
+        file.unlink()
+    return len(stale)
+
+def report(index) -> List[dict]:
+    """Bytes saved per compressible asset and encoding"""
+    rows = []
+    for asset in index.assets():
+        if not is_compressible(asset.media_type):
+            continue
+        row = {"path": asset.path, "size": asset.size}
+        for variant in asset.variants:
+            row[variant.encoding] = variant.size
+            row[f"{variant.encoding}_saved"] = asset.size - variant.size
+        rows.append(row)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Write precompressed variants of the static assets")
+    parser.add_argument("--allow-gzip-only", action="store_true", help="don't fail when brotli isn't installed")
+    args = parser.parse_args()
+    if brotli is None and not args.allow_gzip_only:
+        print("❌ brotli is not installed, so no br variants would be written (install it or pass --allow-gzip-only)")
+        sys.exit(1)
+
+    from core.assets import asset_index
+
+    removed = prune(asset_index)
+    rows = report(asset_index)
+    encodings = available_encodings()
+    print(f"{'asset':<28}{'bytes':>10}" + "".join(f"{e:>16}" for e in encodings))
+    for row in rows:
+        cells = "".join(
+            f"{row[e]:>9} ({row[f'{e}_saved'] / row['size']:>4.0%})" if e in row else f"{'-':>16}" for e in encodings
+        )
+        print(f"{row['path']:<28}{row['size']:>10}{cells}")
+    for encoding in encodings:
+        saved = sum(row.get(f"{encoding}_saved", 0) for row in rows)
+        print(f"✅ {encoding}: {saved} bytes saved across {sum(encoding in row for row in rows)} assets")
+    if brotli is None:
+        print("⚠️  brotli is not installed; only gzip variants were written")
+    if removed:
+        print(f"🧹 Removed {removed} stale variants")
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,18 @@
-from pathlib import Path
-from datetime import datetime
 from fasthtml.common import Link, Script
-
-def cache_busting():
-    return datetime.now().strftime('%Y%m%d%H%M%S')
+from core.assets import asset_index
 
 def fetch_static_files() -> list:
-    current_dir = Path(__file__).parent
-    assets_dir = current_dir.parent / 'assets'
-
     static_files = []
-    for path in assets_dir.rglob('*'):
-        if path.is_file():
-            # Get path relative to assets directory
-            relative_path = path.relative_to(assets_dir)
-
-            if path.suffix == '.css':
-                static_files.append(Link(
-                    rel='stylesheet', 
-                    href=f'/assets/{relative_path}?t={cache_busting()}', 
-                    type='text/css'
-                ))
-            elif path.suffix == '.js':
-                static_files.append(Script(
-                    src=f'/assets/{relative_path}?t={cache_busting()}'
-                ))
+    for path in sorted(asset_index.paths()):
+        if path.endswith('.css'):
+            static_files.append(Link(
+                rel='stylesheet', 
+                href=asset_index.url(path), 
+                type='text/css'
+            ))
+        elif path.endswith('.js'):
+            static_files.append(Script(
+                src=asset_index.url(path)
+            ))
 
-    return static_files
\ No newline at end of file
+    return static_files
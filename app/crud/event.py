@@ -8,6 +8,8 @@ from db.schemas import (
     EventCreate, EventUpdate,
 )
 from utils.speaker_utils import get_speaker_image_url
+from utils.catalog_cache import catalog_cache
+from utils.invalidation_bus import invalidation_bus, CATALOG
 
 def _enrich_event_speakers(event: Event) -> Event:
     """
@@ -30,6 +32,8 @@ async def create_event(db: AsyncSession, event: EventCreate) -> Event:
     
     db.add(db_event)
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_event)
     return db_event
 
@@ -65,6 +69,8 @@ async def update_event(db: AsyncSession, event_id: int, event_update: EventUpdat
         db_event.speakers = speakers.scalars().all()
     
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_event)
     return db_event
 
@@ -72,6 +78,8 @@ async def delete_event(db: AsyncSession, event_id: int) -> bool:
     """Delete an event"""
     result = await db.execute(delete(Event).where(Event.id == event_id))
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     return result.rowcount > 0
 
 async def toggle_qa_active(db: AsyncSession, event_id: int) -> Optional[Event]:
@@ -84,5 +92,7 @@ async def toggle_qa_active(db: AsyncSession, event_id: int) -> Optional[Event]:
     db_event.is_qa_active = not db_event.is_qa_active
     
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_event)
     return db_event
\ No newline at end of file
@@ -5,12 +5,16 @@ from db.models import PrayerTime
 from db.schemas import (
     PrayerTimeCreate, PrayerTimeUpdate,
 )
+from utils.catalog_cache import catalog_cache
+from utils.invalidation_bus import invalidation_bus, CATALOG
 
 async def create_prayer_time(db: AsyncSession, prayer_time: PrayerTimeCreate) -> PrayerTime:
     """Create a new prayer time"""
     db_prayer_time = PrayerTime(**prayer_time.model_dump())
     db.add(db_prayer_time)
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_prayer_time)
     return db_prayer_time
 
@@ -31,5 +35,7 @@ async def update_prayer_time(db: AsyncSession, prayer_id: int, prayer_update: Pr
         setattr(db_prayer, field, value)
     
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_prayer)
     return db_prayer
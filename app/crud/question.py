@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, func
+from sqlalchemy import and_, or_, func, text
 from db.models import Question, QuestionLike
 from db.schemas import QuestionCreate, QuestionUpdate
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Set, Dict, NamedTuple
 from datetime import datetime, timezone
+import uuid
+from utils.question_cache import question_cache
+from utils.invalidation_bus import invalidation_bus, QUESTIONS, LIKE
+from utils.question_ranking import TRENDING_GRAVITY, PAGE_SIZE, QuestionPage, encode_cursor
 
 async def create_question(
     db: AsyncSession, 
@@ -21,6 +25,8 @@ async def create_question(
     db.add(db_question)
     await db.commit()
     await db.refresh(db_question)
+    question_cache.question_changed(db_question)
+    invalidation_bus.publish(QUESTIONS, event_id=db_question.event_id)
     return db_question
 
 async def get_question(db: AsyncSession, question_id: str) -> Optional[Question]:
@@ -34,7 +40,7 @@ async def get_questions_by_event(
     db: AsyncSession, 
     event_id: int,
     visible_only: bool = True,
-    sort_by: str = "popular"  # "recent" or "popular"
+    sort_by: str = "popular"  # "recent", "popular" or "trending"
 ) -> List[Question]:
     """Get all questions for an event"""
     query = select(Question).where(Question.event_id == event_id)
@@ -42,14 +48,97 @@ async def get_questions_by_event(
     if visible_only:
         query = query.where(Question.is_visible == True)
     
-    if sort_by == "popular":
-        query = query.order_by(Question.likes_count.desc(), Question.created_at.desc())
-    else:  # recent
-        query = query.order_by(Question.created_at.desc())
-    
-    result = await db.execute(query)
+    result = await db.execute(_order_questions(query, sort_by))
     return result.scalars().all()
 
+def _order_questions(query, sort_by: str):
+    """Apply a list sort; the id tie-break matches utils.question_ranking"""
+    if sort_by == "popular":
+        return query.order_by(Question.likes_count.desc(), Question.created_at.desc(), Question.id)
+    if sort_by == "trending":
+        # Same score as utils.question_ranking.trending_scores
+        age_hours = func.greatest(func.extract('epoch', func.now() - Question.created_at), 0) / 3600
+        score = (Question.likes_count + 1) / func.power(age_hours + 2, TRENDING_GRAVITY)
+        return query.order_by(score.desc(), Question.created_at.desc(), Question.id)
+    return query.order_by(Question.created_at.desc(), Question.id)  # recent
+
+async def get_questions_page(
+    db: AsyncSession,
+    event_id: int,
+    visible_only: bool = True,
+    sort_by: str = "popular",
+    after: Optional[tuple] = None,
+    limit: int = PAGE_SIZE
+) -> QuestionPage:
+    """
+    One page of an event's questions after a decode_cursor() position.
+
+    Popular and recent use keyset pagination on (likes_count, created_at, id)
+    and (created_at, id), so each page is an index range scan however deep
+    the guest scrolls, and questions submitted meanwhile don't shift it.
+    """
+    if after and sort_by != "trending" and not _is_uuid(after[-1]):
+        after = None  # Forged cursor; start over rather than fail the cast
+    result = await db.execute(questions_page_query(event_id, visible_only, sort_by, after, limit))
+    questions = result.scalars().all()
+    if len(questions) <= limit:
+        return QuestionPage(tuple(questions), None)
+    questions = tuple(questions[:limit])
+    offset = after[0] if after and sort_by == "trending" else 0
+    return QuestionPage(questions, encode_cursor(sort_by, questions[-1], offset + limit))
+
+def questions_page_query(
+    event_id: int,
+    visible_only: bool,
+    sort_by: str,
+    after: Optional[tuple],
+    limit: int
+):
+    """SELECT for get_questions_page (tests EXPLAIN it against the indexes in db.models)"""
+    query = select(Question).where(Question.event_id == event_id)
+    if visible_only:
+        query = query.where(Question.is_visible == True)
+
+    if after and sort_by == "popular":
+        likes_count, created_at, question_id = after
+        # The leading bound lets the index seek to the cursor; the OR can't
+        query = query.where(Question.likes_count <= likes_count, or_(
+            Question.likes_count < likes_count,
+            and_(Question.likes_count == likes_count, Question.created_at < created_at),
+            and_(Question.likes_count == likes_count, Question.created_at == created_at, Question.id > question_id)
+        ))
+    elif after and sort_by == "trending":
+        # The score moves with time, so there is no stable key to seek on
+        query = query.offset(after[0])
+    elif after:
+        created_at, question_id = after
+        query = query.where(Question.created_at <= created_at, or_(
+            Question.created_at < created_at,
+            and_(Question.created_at == created_at, Question.id > question_id)
+        ))
+
+    # One extra row tells whether there is a next page
+    return _order_questions(query, sort_by).limit(limit + 1)
+
+def _is_uuid(value: str) -> bool:
+    try:
+        uuid.UUID(value)
+        return True
+    except ValueError:
+        return False
+
+async def get_question_stats(db: AsyncSession, event_id: int) -> Dict[str, int]:
+    """Total, visible and answered question counts for an event, in one query"""
+    result = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(Question.is_visible == True),
+            func.count().filter(Question.is_answered == True)
+        ).where(Question.event_id == event_id)
+    )
+    total, visible, answered = result.one()
+    return {"total": total, "visible": visible, "answered": answered}
+
 async def update_question(
     db: AsyncSession, 
     question_id: str, 
@@ -69,6 +158,8 @@ async def update_question(
         db_question.updated_at = datetime.now(timezone.utc)
         await db.commit()
         await db.refresh(db_question)
+        question_cache.question_changed(db_question)
+        invalidation_bus.publish(QUESTIONS, event_id=db_question.event_id)
     
     return db_question
 
@@ -82,68 +173,154 @@ async def delete_question(db: AsyncSession, question_id: str) -> bool:
     if db_question:
         await db.delete(db_question)
         await db.commit()
+        question_cache.question_removed(db_question.event_id, str(db_question.id))
+        invalidation_bus.publish(QUESTIONS, event_id=db_question.event_id)
         return True
     
     return False
 
+class LikeToggle(NamedTuple):
+    liked: bool
+    likes_count: int
+    event_id: int
+    is_visible: bool
+
+# Delete the session's like if there is one, otherwise insert it, and apply
+# the difference to likes_count, all in one statement. The UPDATE takes the
+# question's row lock, so concurrent toggles can't lose increments, and the
+# unique (question_id, session_id) constraint absorbs double-taps.
+TOGGLE_LIKE_SQL = text("""
+    WITH removed AS (
+        DELETE FROM question_likes
+        WHERE question_id = :question_id AND session_id = :session_id
+        RETURNING 1
+    ), added AS (
+        INSERT INTO question_likes (id, question_id, session_id, created_at)
+        SELECT gen_random_uuid(), id, :session_id, now()
+        FROM questions
+        WHERE id = :question_id AND NOT EXISTS (SELECT 1 FROM removed)
+        ON CONFLICT (question_id, session_id) DO NOTHING
+        RETURNING 1
+    )
+    UPDATE questions
+    SET likes_count = GREATEST(0, likes_count
+        + (SELECT count(*) FROM added) - (SELECT count(*) FROM removed))
+    WHERE id = :question_id
+    RETURNING NOT EXISTS (SELECT 1 FROM removed) AS liked, likes_count, event_id, is_visible
+""")
+
 async def toggle_like(
     db: AsyncSession, 
     question_id: str, 
     session_id: str
-) -> Tuple[bool, int]:
+) -> Optional[LikeToggle]:
     """
-    Toggle like for a question
-    Returns: (liked: bool, new_like_count: int)
+    Toggle like for a question in a single statement
+    Returns: (liked, likes_count, event_id, is_visible), or None if the question doesn't exist
     """
-    # Check if user already liked
     result = await db.execute(
-        select(QuestionLike).where(
-            and_(
-                QuestionLike.question_id == question_id,
-                QuestionLike.session_id == session_id
-            )
-        )
+        TOGGLE_LIKE_SQL,
+        {"question_id": question_id, "session_id": session_id}
     )
-    existing_like = result.scalar_one_or_none()
-    
-    # Get the question
-    question = await get_question(db, question_id)
-    if not question:
-        return False, 0
-    
-    if existing_like:
-        # Unlike: Remove like
-        await db.delete(existing_like)
-        question.likes_count = max(0, question.likes_count - 1)
-        liked = False
-    else:
-        # Like: Add like
-        new_like = QuestionLike(
-            question_id=question_id,
-            session_id=session_id
-        )
-        db.add(new_like)
-        question.likes_count += 1
-        liked = True
-    
+    row = result.one_or_none()
     await db.commit()
-    await db.refresh(question)
-    
-    return liked, question.likes_count
+    if not row:
+        return None
+    toggled = LikeToggle(*row)
+    question_cache.record_like(toggled.event_id, question_id, session_id, toggled.liked, toggled.likes_count)
+    invalidation_bus.publish(
+        LIKE, event_id=toggled.event_id, question_id=question_id, session_id=session_id,
+        liked=toggled.liked, likes_count=toggled.likes_count
+    )
+    return toggled
 
-async def check_user_liked(
-    db: AsyncSession, 
-    question_id: str, 
+async def get_liked_question_ids(
+    db: AsyncSession,
+    event_id: int,
     session_id: str
-) -> bool:
-    """Check if a user has liked a question"""
+) -> Set[str]:
+    """Get the IDs of every question in an event liked by a session, in one query"""
     result = await db.execute(
-        select(func.count(QuestionLike.id)).where(
+        select(QuestionLike.question_id)
+        .join(Question, Question.id == QuestionLike.question_id)
+        .where(
             and_(
-                QuestionLike.question_id == question_id,
+                Question.event_id == event_id,
                 QuestionLike.session_id == session_id
             )
         )
     )
-    count = result.scalar()
-    return count > 0
+    return {str(question_id) for question_id in result.scalars()}
+
+async def get_like_state(
+    db: AsyncSession,
+    question_id: str
+) -> Optional[Tuple[int, bool, int, Set[str]]]:
+    """
+    Load what the write-behind like aggregator needs to toggle in memory
+    Returns: (event_id, is_visible, likes_count, liker session ids), or None if the question doesn't exist
+    """
+    result = await db.execute(
+        select(Question.event_id, Question.is_visible, Question.likes_count)
+        .where(Question.id == question_id)
+    )
+    row = result.one_or_none()
+    if not row:
+        return None
+    likers = await db.execute(
+        select(QuestionLike.session_id).where(QuestionLike.question_id == question_id)
+    )
+    return row.event_id, row.is_visible, row.likes_count or 0, set(likers.scalars())
+
+# Apply a batch of final like states in one statement. Rows that are already
+# in the requested state are no-ops, so replaying a journal twice is safe, and
+# likes_count moves by the rows actually inserted or deleted.
+APPLY_LIKE_CHANGES_SQL = text("""
+    WITH changes AS (
+        SELECT *
+        FROM unnest(
+            CAST(:question_ids AS uuid[]),
+            CAST(:session_ids AS varchar[]),
+            CAST(:liked AS boolean[])
+        ) AS c(question_id, session_id, liked)
+    ), removed AS (
+        DELETE FROM question_likes l
+        USING changes c
+        WHERE NOT c.liked AND l.question_id = c.question_id AND l.session_id = c.session_id
+        RETURNING l.question_id
+    ), added AS (
+        INSERT INTO question_likes (id, question_id, session_id, created_at)
+        SELECT gen_random_uuid(), c.question_id, c.session_id, now()
+        FROM changes c
+        JOIN questions q ON q.id = c.question_id
+        WHERE c.liked
+        ON CONFLICT (question_id, session_id) DO NOTHING
+        RETURNING question_id
+    ), deltas AS (
+        SELECT question_id, sum(delta) AS delta
+        FROM (
+            SELECT question_id, 1 AS delta FROM added
+            UNION ALL
+            SELECT question_id, -1 AS delta FROM removed
+        ) d
+        GROUP BY question_id
+    )
+    UPDATE questions q
+    SET likes_count = GREATEST(0, q.likes_count + deltas.delta)
+    FROM deltas
+    WHERE q.id = deltas.question_id
+""")
+
+async def apply_like_changes(
+    db: AsyncSession,
+    changes: List[Tuple[str, str, bool]]
+) -> None:
+    """Write (question_id, session_id, liked) final states in a single batched statement"""
+    if not changes:
+        return
+    question_ids, session_ids, liked = zip(*changes)
+    await db.execute(
+        APPLY_LIKE_CHANGES_SQL,
+        {"question_ids": list(question_ids), "session_ids": list(session_ids), "liked": list(liked)}
+    )
+    await db.commit()
@@ -5,6 +5,8 @@ from sqlalchemy.orm import selectinload
 from db.models import Speaker
 from db.schemas import SpeakerCreate, SpeakerUpdate
 from utils.speaker_utils import get_speaker_image_url
+from utils.catalog_cache import catalog_cache
+from utils.invalidation_bus import invalidation_bus, CATALOG
 
 def _enrich_speaker_image(speaker: Speaker) -> Speaker:
     """
@@ -19,6 +21,8 @@ async def create_speaker(db: AsyncSession, speaker: SpeakerCreate) -> Speaker:
     db_speaker = Speaker(**speaker.model_dump())
     db.add(db_speaker)
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_speaker)
     return db_speaker
 
@@ -49,6 +53,8 @@ async def update_speaker(db: AsyncSession, speaker_id: int, speaker_update: Spea
             setattr(db_speaker, field, value)
         
         await db.commit()
+        catalog_cache.invalidate()
+        invalidation_bus.publish(CATALOG)
         await db.refresh(db_speaker)
     
     return db_speaker
@@ -61,6 +67,8 @@ async def delete_speaker(db: AsyncSession, speaker_id: int) -> bool:
     if db_speaker:
         await db.delete(db_speaker)
         await db.commit()
+        catalog_cache.invalidate()
+        invalidation_bus.publish(CATALOG)
         return True
     
     return False
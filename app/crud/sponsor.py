@@ -6,12 +6,16 @@ from db.models import Sponsor
 from db.schemas import (
     SponsorCreate, SponsorUpdate
 )
+from utils.catalog_cache import catalog_cache
+from utils.invalidation_bus import invalidation_bus, CATALOG
 
 async def create_sponsor(db: AsyncSession, sponsor: SponsorCreate) -> Sponsor:
     """Create a new sponsor"""
     db_sponsor = Sponsor(**sponsor.model_dump())
     db.add(db_sponsor)
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_sponsor)
     return db_sponsor
 
@@ -39,6 +43,8 @@ async def update_sponsor(db: AsyncSession, sponsor_id: int, sponsor_update: Spon
         setattr(db_sponsor, field, value)
     
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     await db.refresh(db_sponsor)
     return db_sponsor
 
@@ -46,4 +52,6 @@ async def delete_sponsor(db: AsyncSession, sponsor_id: int) -> bool:
     """Delete a sponsor"""
     result = await db.execute(delete(Sponsor).where(Sponsor.id == sponsor_id))
     await db.commit()
+    catalog_cache.invalidate()
+    invalidation_bus.publish(CATALOG)
     return result.rowcount > 0
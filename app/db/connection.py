@@ -1,11 +1,84 @@
+import asyncio
 import os
+from typing import Optional
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 from dotenv import load_dotenv
 from .models import Base
 
+class Listener:
+    """
+    LISTEN on a Postgres channel that comes back after the connection drops.
+
+    On a lost connection on_lost() is called, the dead connection is handed
+    back to the pool (which discards it) and LISTEN is retried every
+    RECONNECT_DELAY seconds; on_restored() is called once it succeeds.
+    Notifications sent in between are never delivered, so callers resync
+    in one of the two callbacks.
+    """
+
+    RECONNECT_DELAY = 2.0
+
+    def __init__(self, db: "DatabaseManager", channel: str, callback, on_lost=None, on_restored=None):
+        self.db = db
+        self.channel = channel
+        self.callback = callback
+        self.on_lost = on_lost
+        self.on_restored = on_restored
+        self._unlisten = None
+        self._reconnect: Optional[asyncio.Task] = None
+        self._stopped = True
+        self.reconnects = 0
+
+    async def start(self):
+        self._stopped = False
+        await self._listen()
+
+    async def stop(self):
+        self._stopped = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        await self._release()
+
+    async def _listen(self):
+        self._unlisten = await self.db.listen(self.channel, self.callback, on_lost=self._connection_lost)
+
+    async def _release(self):
+        if self._unlisten is not None:
+            unlisten, self._unlisten = self._unlisten, None
+            try:
+                await unlisten()
+            except Exception as e:
+                print(f"Releasing LISTEN {self.channel} connection failed: {e}")
+
+    def _connection_lost(self):
+        if self._stopped:
+            return
+        if self.on_lost:
+            self.on_lost()
+        if self._reconnect is None or self._reconnect.done():
+            self._reconnect = asyncio.create_task(self._relisten())
+
+    async def _relisten(self):
+        await self._release()
+        while not self._stopped:
+            await asyncio.sleep(self.RECONNECT_DELAY)
+            try:
+                await self._listen()
+            except Exception as e:
+                print(f"LISTEN {self.channel} reconnect failed: {e}")
+                continue
+            self.reconnects += 1
+            if self.on_restored:
+                self.on_restored()
+            return
+
 class DatabaseManager:
+    # Postgres rejects NOTIFY payloads of 8000 bytes or more
+    MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
     def __init__(self):
         database_url = os.getenv('DATABASE_URL')
         
@@ -59,6 +132,57 @@ class DatabaseManager:
             result = await conn.execute(text("SELECT 1"))
             return result.fetchone()
 
+    async def notify(self, channel: str, payload: str):
+        """Send a Postgres NOTIFY on a channel"""
+        async with self.engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": channel, "payload": payload}
+            )
+            await conn.commit()
+
+    async def listen(self, channel: str, callback, on_lost=None):
+        """
+        LISTEN on a Postgres channel using a dedicated pooled connection.
+
+        Args:
+            channel: Channel name to listen on
+            callback: Called with the payload string of every notification
+            on_lost: Optional callback invoked if the connection is terminated
+
+        Returns:
+            Coroutine function that stops listening and releases the connection
+        """
+        conn = await self.engine.connect()
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        def _on_notification(connection, pid, channel, payload):
+            callback(payload)
+
+        def _on_terminated(connection):
+            on_lost()
+
+        await driver_connection.add_listener(channel, _on_notification)
+        if on_lost:
+            driver_connection.add_termination_listener(_on_terminated)
+
+        async def unlisten():
+            try:
+                # The connection goes back to the pool; don't leave this listener's callbacks on it
+                if on_lost:
+                    driver_connection.remove_termination_listener(_on_terminated)
+                if not driver_connection.is_closed():
+                    await driver_connection.remove_listener(channel, _on_notification)
+            finally:
+                await conn.close()
+
+        return unlisten
+
+    def listener(self, channel: str, callback, on_lost=None, on_restored=None) -> Listener:
+        """A Listener on a channel; call start() to begin listening"""
+        return Listener(self, channel, callback, on_lost=on_lost, on_restored=on_restored)
+
     def is_postgresql(self):
         """Check if using PostgreSQL"""
         return 'postgresql' in self.database_url
@@ -0,0 +1,152 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once, in its own transaction, and is recorded in the
+schema_migrations table. A migration's DDL is written out in full, so it
+does the same thing whatever db.models looks like later; indexes and
+constraints are declared on the models too, so create_tables() and a
+migrated database end up with the same schema. Run after deploying:
+
+    cd app && python -m db.migrations
+"""
+import asyncio
+from typing import Awaitable, Callable, List, NamedTuple, Set
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from .models import Base
+
+# Any constant works; it only has to be the same for every instance
+MIGRATION_LOCK_ID = 727_001
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[AsyncConnection], Awaitable[None]]
+
+async def _qa_activation(conn: AsyncConnection):
+    await conn.execute(text("ALTER TABLE events ADD COLUMN IF NOT EXISTS is_qa_active BOOLEAN DEFAULT FALSE"))
+    await conn.execute(text(
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"
+    ))
+    await conn.execute(text(
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"
+    ))
+    await conn.execute(text("ALTER TABLE feedback_submissions ADD COLUMN IF NOT EXISTS session_id VARCHAR(255)"))
+
+async def _like_uniqueness(conn: AsyncConnection):
+    # Keep the earliest like per (question, session)
+    await conn.execute(text("""
+        DELETE FROM question_likes a
+        USING question_likes b
+        WHERE a.question_id = b.question_id
+          AND a.session_id = b.session_id
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+    """))
+    await conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint WHERE conname = 'uq_question_likes_question_session'
+            ) THEN
+                ALTER TABLE question_likes
+                    ADD CONSTRAINT uq_question_likes_question_session UNIQUE (question_id, session_id);
+            END IF;
+        END $$;
+    """))
+    # Lost read-modify-write updates may have left counts drifting
+    await conn.execute(text("""
+        UPDATE questions q
+        SET likes_count = counts.n
+        FROM (
+            SELECT q2.id, count(l.id) AS n
+            FROM questions q2
+            LEFT JOIN question_likes l ON l.question_id = q2.id
+            GROUP BY q2.id
+        ) counts
+        WHERE counts.id = q.id AND q.likes_count IS DISTINCT FROM counts.n
+    """))
+
+async def _qa_indexes(conn: AsyncConnection):
+    # Single-column indexes from migrate_qa.py, superseded by the composites
+    for name in (
+        "idx_questions_event_id", "idx_questions_is_visible", "idx_questions_created_at",
+        "idx_questions_likes_count", "idx_question_likes_question_id", "idx_question_likes_session_id"
+    ):
+        await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    # Guest lists (visible only, popular and recent), the moderator recent list
+    # and per-session like lookups
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS ix_questions_event_popular "
+        "ON questions (event_id, likes_count DESC, created_at DESC, id) WHERE is_visible",
+        "CREATE INDEX IF NOT EXISTS ix_questions_event_recent "
+        "ON questions (event_id, created_at DESC, id) WHERE is_visible",
+        "CREATE INDEX IF NOT EXISTS ix_questions_event_created ON questions (event_id, created_at DESC, id)",
+        "CREATE INDEX IF NOT EXISTS ix_question_likes_session_id ON question_likes (session_id)",
+    ):
+        await conn.execute(text(ddl))
+    await conn.execute(text("ANALYZE questions"))
+    await conn.execute(text("ANALYZE question_likes"))
+
+async def _moderator_popular_index(conn: AsyncConnection):
+    # The moderator console's default view: every question, most liked first
+    await conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_questions_event_popular_all "
+        "ON questions (event_id, likes_count DESC, created_at DESC, id)"
+    ))
+    await conn.execute(text("ANALYZE questions"))
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "qa_activation", _qa_activation),
+    Migration(2, "like_uniqueness", _like_uniqueness),
+    Migration(3, "qa_indexes", _qa_indexes),
+    Migration(4, "moderator_popular_index", _moderator_popular_index),
+]
+
+async def applied_versions(conn: AsyncConnection) -> Set[int]:
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    return {row[0] for row in result}
+
+async def migrate(engine=None) -> List[Migration]:
+    """Create missing tables, then apply pending migrations in order; returns the ones applied"""
+    if engine is None:
+        from .connection import db_manager
+        engine = db_manager.engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(100) NOT NULL,
+                applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+    applied = []
+    for migration in MIGRATIONS:
+        async with engine.begin() as conn:
+            # Serializes instances starting at once; released on commit
+            await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            if migration.version in await applied_versions(conn):
+                continue
+            await migration.apply(conn)
+            await conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                {"version": migration.version, "name": migration.name}
+            )
+        applied.append(migration)
+        print(f"✅ Applied migration {migration.version}: {migration.name}")
+    return applied
+
+async def main():
+    try:
+        applied = await migrate()
+        if not applied:
+            print("✅ Schema is up to date")
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    asyncio.run(main())
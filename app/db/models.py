@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table, JSON, UniqueConstraint, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -125,6 +125,25 @@ class Question(Base):
     event = relationship("Event", back_populates="questions")
     likes = relationship('QuestionLike', back_populates='question', cascade='all, delete-orphan')
 
+    # Match the list queries in crud.question column for column, so each page
+    # is an index range scan with no sort. The guest indexes are partial on
+    # is_visible; pending questions never reach them.
+    __table_args__ = (
+        Index(
+            'ix_questions_event_popular',
+            'event_id', likes_count.desc(), created_at.desc(), 'id',
+            postgresql_where=text('is_visible')
+        ),
+        Index(
+            'ix_questions_event_recent',
+            'event_id', created_at.desc(), 'id',
+            postgresql_where=text('is_visible')
+        ),
+        # Moderator lists and stats (all questions of an event)
+        Index('ix_questions_event_created', 'event_id', created_at.desc(), 'id'),
+        Index('ix_questions_event_popular_all', 'event_id', likes_count.desc(), created_at.desc(), 'id'),
+    )
+
 class QuestionLike(Base):
     __tablename__ = 'question_likes'
     
@@ -133,4 +152,11 @@ class QuestionLike(Base):
     session_id = Column(String(255), nullable=False)  # Track by session to allow undo
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     
-    question = relationship("Question", back_populates="likes")
\ No newline at end of file
+    question = relationship("Question", back_populates="likes")
+
+    # One like per session; the like toggle relies on this for ON CONFLICT.
+    # Its (question_id, session_id) index also serves lookups by question.
+    __table_args__ = (
+        UniqueConstraint('question_id', 'session_id', name='uq_question_likes_question_session'),
+        Index('ix_question_likes_session_id', 'session_id'),
+    )
\ No newline at end of file
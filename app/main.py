@@ -2,25 +2,25 @@ from fasthtml.common import *
 from core.app import app, rt
 import os, uvicorn
 
-# Get absolute path to assets directory
-assets_dir = Path(__file__).parent / 'assets'
+from core.assets import asset_index
+from core.images import responsive_images
 
 # Static file routes - more specific pattern to avoid conflicts
 @rt('/assets/{fname:path}')
-def get(fname:str): 
-    file_path = assets_dir / fname
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
-    return Response("File not found", status_code=404)
+def get(req, fname:str): 
+    return asset_index.response(req, fname)
+
+
+# Resized WebP variants of the images (built by python -m core.images)
+@rt('/images/{fname:path}')
+def get_image(req, fname:str): 
+    return responsive_images.index.response(req, fname)
 
 
 # Static file routes - for images
 @rt('/{fname:path}.{ext:static}')
-def get_static(fname:str, ext:str): 
-    file_path = assets_dir / f'{fname}.{ext}'
-    if file_path.exists() and file_path.is_file():
-        return FileResponse(file_path)
-    return Response("File not found", status_code=404)
+def get_static(req, fname:str, ext:str): 
+    return asset_index.response(req, f'{fname}.{ext}')
 
 # Import route modules - routes are registered on import
 import routes.main
@@ -31,10 +31,37 @@ import routes.sponsor
 import routes.feedback
 import routes.qa
 
+# Start/stop the SSE broadcast backend with the app
+from utils.sse_manager import sse_manager
+app.add_event_handler('startup', sse_manager.start)
+app.add_event_handler('shutdown', sse_manager.stop)
+
+# Replay/flush buffered likes (no-op unless LIKE_WRITE_MODE=write_behind)
+from utils.like_aggregator import like_aggregator
+app.add_event_handler('startup', like_aggregator.start)
+app.add_event_handler('shutdown', like_aggregator.stop)
+
+# Rescore the trending sort on a tick
+from utils.question_cache import question_cache
+app.add_event_handler('startup', question_cache.start)
+app.add_event_handler('shutdown', question_cache.stop)
+
+# Evict cached catalog/Q&A entries when other instances write (no-op unless CACHE_BUS=postgres)
+from utils.invalidation_bus import invalidation_bus
+app.add_event_handler('startup', invalidation_bus.start)
+app.add_event_handler('shutdown', invalidation_bus.stop)
+
+# Stop the bcrypt worker threads
+from utils.auth import password_hasher
+app.add_event_handler('shutdown', password_hasher.shutdown)
+
 # Run the FastHTML app with Uvicorn, using the SSL certificate and private key
 if __name__ == "__main__":
     uvicorn.run(
         app, 
         host=os.getenv('HOST', '0.0.0.0'),
         port=int(os.getenv('PORT', 8080)),
+        # Take scheme and client address from the proxy's X-Forwarded-* headers
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1'),
     )
\ No newline at end of file
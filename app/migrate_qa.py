@@ -5,6 +5,7 @@ Run this script to add the questions and question_likes tables.
 import asyncio
 from sqlalchemy import text
 from db.connection import db_manager
+from db.migrations import migrate as apply_migrations
 
 async def migrate():
     """Add Q&A tables to the database"""
@@ -35,33 +36,11 @@ async def migrate():
             );
         """))
         
-        # Create indexes for better performance
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_questions_event_id ON questions(event_id);
-        """))
-        
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_questions_is_visible ON questions(is_visible);
-        """))
-        
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions(created_at DESC);
-        """))
-        
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_questions_likes_count ON questions(likes_count DESC);
-        """))
-        
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_question_likes_question_id ON question_likes(question_id);
-        """))
-        
-        await db.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_question_likes_session_id ON question_likes(session_id);
-        """))
-        
         await db.commit()
         print("✓ Q&A tables created successfully!")
+    
+    # Indexes are declared on the models and created by the versioned migrations
+    await apply_migrations()
 
 if __name__ == "__main__":
     asyncio.run(migrate())
@@ -1,10 +1,16 @@
 from components.icon import Icon
 from components.page import AppContainer
-from fasthtml.common import RedirectResponse, Response
+from fasthtml.common import RedirectResponse, Response, JSONResponse
 from fasthtml.components import Button, H1, Div, Form, Label, Input, Span
 from core.app import rt
-from utils.auth import verify_password, require_moderator, get_user_by_email, is_moderator
+from utils.auth import (
+    require_moderator, get_user_by_email, is_moderator,
+    password_hasher, PasswordHasherBusy, login_throttle, client_address
+)
 from db.connection import db_manager
+from db.models import User
+from typing import NamedTuple, Optional
+import asyncio
 
 @rt('/settings')
 def get_settings(sess):
@@ -38,32 +44,63 @@ def get_settings(sess):
         is_moderator=is_moderator(sess)
     )
 
+def LoginError(message: str):
+    return Div(
+        Div(
+            Icon('exclamation-triangle', cls='text-error text-xl mr-2'),
+            Span(message, cls="font-semibold"),
+            cls="alert alert-error mb-4 flex items-center"
+        )
+    )
+
+class LoginResult(NamedTuple):
+    user: Optional[User]  # None on any failure
+    error: Optional[str]
+    status_code: int = 200
+
+async def check_login(request, username: str, password: str, require_admin: bool = False) -> LoginResult:
+    """Check credentials through the failed-login throttle and the bcrypt pool"""
+    client = client_address(request)
+    retry_after = login_throttle.retry_after(client)
+    if retry_after:
+        minutes = max(1, round(retry_after / 60))
+        return LoginResult(None, f"Too many failed attempts, try again in {minutes} minute{'s' if minutes != 1 else ''}", 429)
+    delay = login_throttle.delay(username)
+    if delay:
+        await asyncio.sleep(delay)
+
+    async with db_manager.AsyncSessionLocal() as db:
+        user = await get_user_by_email(db, username, require_admin=require_admin)
+
+    try:
+        valid = user is not None and await password_hasher.verify(password, user.password_hash)
+    except PasswordHasherBusy:
+        return LoginResult(None, "Too many logins in progress, try again in a moment", 503)
+
+    if not valid:
+        login_throttle.record_failure(client, username)
+        return LoginResult(None, "Invalid username or password", 401)
+    login_throttle.record_success(client, username)
+    return LoginResult(user, None)
+
 @rt('/admin/login')
 async def post(request, sess, username: str, password: str):
     """Handle login form submission from modal"""
-    async with db_manager.AsyncSessionLocal() as db:
-        user = await get_user_by_email(db, username)
-        
-        if user and verify_password(password, user.password_hash):
-            # Set session
-            sess['user_id'] = str(user.id)
-            sess['admin_auth'] = True
-            
-            # Close modal and refresh page
-            return Response(
-                headers={
-                    'HX-Refresh': 'true'  # Tell HTMX to refresh the page
-                }
-            )
-        else:
-            # Return error message to display in modal
-            return Div(
-                Div(
-                    Icon('exclamation-triangle', cls='text-error text-xl mr-2'),
-                    Span("Invalid username or password", cls="font-semibold"),
-                    cls="alert alert-error mb-4 flex items-center"
-                )
-            )
+    user, error, _ = await check_login(request, username, password)
+    if error:
+        # Return error message to display in modal
+        return LoginError(error)
+
+    # Set session
+    sess['user_id'] = str(user.id)
+    sess['admin_auth'] = True
+
+    # Close modal and refresh page
+    return Response(
+        headers={
+            'HX-Refresh': 'true'  # Tell HTMX to refresh the page
+        }
+    )
 
 @rt('/admin/logout')
 def get(sess):
@@ -157,21 +194,23 @@ def get(sess):
     return RedirectResponse('/', status_code=303)
 
 @rt('/admin/test_login')
-async def post(sess, username: str, password: str):
+async def post(request, sess, username: str, password: str):
     """TEST ONLY: Bypass authentication workflow for load testing"""
     
     # Authenticate user normally
-    async with db_manager.AsyncSessionLocal() as db:
-        user = await get_user_by_email(db, username, require_admin=True)
-        if not user:
-            return Response("User not found", status_code=404)
-        
-        if not verify_password(password, user.password_hash):
-            return Response("Invalid password", status_code=401)
+    user, error, status_code = await check_login(request, username, password, require_admin=True)
+    if error:
+        return Response(error, status_code=status_code)
     
     # Set session
     sess['admin_auth'] = True
     sess['user_id'] = str(user.id)
     
     print(f"✅ TEST LOGIN: {username} authenticated via test endpoint")
-    return Response("OK", status_code=200)
\ No newline at end of file
+    return Response("OK", status_code=200)
+
+@rt('/admin/auth-stats')
+@require_moderator
+async def get(req, sess):
+    """bcrypt pool queue/hash times and failed-login throttle counters"""
+    return JSONResponse({"hasher": password_hasher.stats(), "throttle": login_throttle.stats()})
@@ -3,10 +3,10 @@ from components.page import AppContainer
 from components.cards import homepage_card
 from fasthtml.common import RedirectResponse
 from components.cards import prayer_times_page
-from db.connection import db_manager
-from crud.prayer_time import get_prayer_times
+from utils.catalog_cache import catalog_cache
 from fasthtml.components import H1, H2, Div, Img, P, Span, Grid, A, Ul, Li
 from core.app import rt
+from core.assets import asset_url
 from utils.auth import is_moderator
 
 @rt('/')
@@ -40,7 +40,7 @@ def get(req, sess):
                 Div(alt='Conference banner_2', cls='hero-image cropped'),
                 Div(
                     Div(
-                        Img(src='mas-logo-square.png', alt='MAS Logo', cls='logo'),
+                        Img(src=asset_url('mas-logo-square.png'), alt='MAS Logo', cls='logo'),
                         Div( 
                             H1('3rd Annual CYP Conference', cls='h3'),
                             P('Weathering the Storm: Faith, Resilience & Action'),
@@ -51,7 +51,7 @@ def get(req, sess):
                     Div(
                         Span(
                             A(
-                                Img(src='location.png', alt='location icon', cls='hero-icon'),
+                                Img(src=asset_url('location.png'), alt='location icon', cls='hero-icon'),
                                 P('Crystal Banquet, Plano'),
                                 href='https://www.google.com/maps/search/?api=1&query=Crystal+Banquet+Hall+Plano+TX',
                                 target='_blank',
@@ -60,7 +60,7 @@ def get(req, sess):
                             cls='flex items-center justify-between',
                         ),
                         Span(
-                            Img(src='calendar.png', alt='calendar icon', cls='hero-icon'),
+                            Img(src=asset_url('calendar.png'), alt='calendar icon', cls='hero-icon'),
                             P('Oct 18, 2025'),
                             cls='flex items-center justify-between',
                         ),
@@ -123,8 +123,7 @@ def get(req, sess):
 
 @rt('/prayer-times')
 async def get(req, sess):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        prayer_times = await get_prayer_times(db_session)
+    prayer_times = await catalog_cache.prayer_times()
     return AppContainer(
             Div(
                 TopNav('Prayer Times'),
@@ -2,8 +2,12 @@ from fasthtml.common import *
 from components.page import AppContainer
 from components.qa import (
     QuestionCard,
+    CachedQuestionCard,
+    LikeButton,
     QuestionForm,
     QuestionsListContainer,
+    QuestionsPage,
+    ModeratorStats,
     SessionStatusTag,
     SessionCard,
     SessionStatusToggle
@@ -13,14 +17,21 @@ from db.schemas import QuestionCreate, QuestionUpdate
 from crud.question import (
     create_question, 
     get_questions_by_event, 
+    get_questions_page,
+    get_question_stats,
     get_question,
     update_question,
     delete_question,
     toggle_like,
-    check_user_liked
+    get_liked_question_ids
 )
-from crud.event import get_event, get_events, toggle_qa_active
-from utils.sse_manager import sse_manager
+from crud.event import toggle_qa_active
+from utils.catalog_cache import catalog_cache
+from utils.invalidation_bus import invalidation_bus
+from utils.sse_manager import sse_manager, CONNECTED_FRAME, PUBLIC, MODERATORS
+from utils.like_aggregator import like_aggregator
+from utils.question_cache import question_cache, card_cache, QuestionView
+from utils.question_ranking import SORTS, RECENT, decode_cursor
 from utils.auth import is_moderator, require_moderator
 from core.app import rt
 import asyncio
@@ -32,45 +43,87 @@ def get_nickname_from_cookie(request):
     """Get stored nickname from cookie"""
     return request.cookies.get('qa_nickname', 'Anonymous')
 
+def question_update_payload(question) -> dict:
+    """
+    Question fields for an SSE update, with the like count including any
+    unflushed likes. The cards go alongside as html/moderator_html.
+    """
+    return {
+        "id": str(question.id),
+        "nickname": question.nickname,
+        "question_text": question.question_text,
+        "is_visible": question.is_visible,
+        "is_answered": question.is_answered,
+        "likes_count": like_aggregator.likes_count(str(question.id), question.likes_count),
+        "created_at": question.created_at.isoformat()
+    }
+
+def question_card_html(question) -> Optional[str]:
+    """Guest card HTML for a visible question (hidden questions aren't pushed)"""
+    return str(CachedQuestionCard(question, show_admin_controls=False)) if question.is_visible else None
+
+def moderator_card_html(question) -> str:
+    """Moderator card HTML, patched into the console in place"""
+    return str(CachedQuestionCard(question, show_admin_controls=True))
+
+async def visible_page(event_id: int, sort: str, cursor: Optional[str] = None):
+    """One page of the guest question list, sliced from the shared per-event ranking"""
+    async def load():
+        async with db_manager.AsyncSessionLocal() as db:
+            questions = await get_questions_by_event(db, event_id, visible_only=True)
+        return tuple(
+            QuestionView.from_model(q, like_aggregator.likes_count(str(q.id), q.likes_count))
+            for q in questions
+        )
+    return await question_cache.get_page(event_id, sort, load, after=decode_cursor(sort, cursor))
+
+def next_page_url(path: str, sort: str, page) -> Optional[str]:
+    return f"{path}?sort={sort}&cursor={page.cursor}" if page.cursor else None
+
+async def session_likes(event_id: int, session_id: str):
+    """Question IDs this guest has liked, including likes not yet flushed"""
+    async def load():
+        async with db_manager.AsyncSessionLocal() as db:
+            return await get_liked_question_ids(db, event_id, session_id)
+    liked = await question_cache.get_session_likes(event_id, session_id, load)
+    return like_aggregator.liked_question_ids(session_id, liked)
+
 @rt('/qa')
 @require_conference_day
 async def get(request, sess):
     """Q&A main page - select session (accessible to everyone)"""
-    async with db_manager.AsyncSessionLocal() as db:
-        events = await get_events(db)
-        
-        # Sort events by start time
-        events = sorted(events, key=lambda e: e.start_time)
-        
-        # Build event cards - guest view
-        event_cards = [SessionCard(event, is_moderator=False) for event in events]
-        
-        return AppContainer(
+    # Already sorted by start time
+    events = await catalog_cache.events()
+    
+    # Build event cards - guest view
+    event_cards = [SessionCard(event, is_moderator=False) for event in events]
+    
+    return AppContainer(
+        Div(
+            TopNav('Q&A Sessions'),
             Div(
-                TopNav('Q&A Sessions'),
-                Div(
-                    P(
-                        "Select a session to view or ask questions",
-                        cls="text-sm"
-                    ),
-                    cls="text-center mb-8"
+                P(
+                    "Select a session to view or ask questions",
+                    cls="text-sm"
                 ),
-                Div(
-                    *event_cards if event_cards else [
-                        Div(
-                            I(cls="fas fa-inbox text-4xl text-base-content/30 mb-4"),
-                            P("No Q&A sessions available", cls="text-base-content/60"),
-                            cls="timeline-box"
-                        )
-                    ],
-                    cls="flex flex-col gap-4"
-                ),
-                id='page-content',
-                cls='container mx-auto px-4 py-8 blue-background'
+                cls="text-center mb-8"
             ),
-            is_moderator=is_moderator(sess),
-            request=request
-        )
+            Div(
+                *event_cards if event_cards else [
+                    Div(
+                        I(cls="fas fa-inbox text-4xl text-base-content/30 mb-4"),
+                        P("No Q&A sessions available", cls="text-base-content/60"),
+                        cls="timeline-box"
+                    )
+                ],
+                cls="flex flex-col gap-4"
+            ),
+            id='page-content',
+            cls='container mx-auto px-4 py-8 blue-background'
+        ),
+        is_moderator=is_moderator(sess),
+        request=request
+    )
 
 @rt('/qa/event/{event_id}')
 @require_conference_day
@@ -79,19 +132,13 @@ async def get(request, sess, event_id: int):
     session_id = get_or_create_session_id(request)
     stored_nickname = get_nickname_from_cookie(request)
     
-    async with db_manager.AsyncSessionLocal() as db:
-        event = await get_event(db, event_id)
-        if not event:
-            return Response("Event not found", status_code=404)
-        
-        # Get questions (default to recent)
-        questions = await get_questions_by_event(db, event_id, visible_only=True, sort_by="popular")
-        
-        # Check which questions user has liked
-        user_likes = set()
-        for q in questions:
-            if await check_user_liked(db, str(q.id), session_id):
-                user_likes.add(str(q.id))
+    event = await catalog_cache.event(event_id)
+    if not event:
+        return Response("Event not found", status_code=404)
+    
+    # First page of questions (default to popular) and the user's likes from the cache
+    page = await visible_page(event_id, "popular")
+    user_likes = await session_likes(event_id, session_id)
     
     # Check if QA is active
     is_active = event.is_qa_active
@@ -122,7 +169,7 @@ async def get(request, sess, event_id: int):
             # Question submission form
             QuestionForm(event_id, initial_nickname=stored_nickname, is_active=is_active),
             
-            # Tabs for Recent/Popular
+            # Tabs for Popular/Recent/Trending
             Div(
                 Div(
                     A(
@@ -143,32 +190,60 @@ async def get(request, sess, event_id: int):
                         hx_target="#questions-list",
                         hx_swap="outerHTML"
                     ),
+                    A(
+                        "Trending",
+                        role="tab",
+                        cls="tab",
+                        id="trending-tab",
+                        hx_get=f"/qa/event/{event_id}/questions?sort=trending",
+                        hx_target="#questions-list",
+                        hx_swap="outerHTML"
+                    ),
                     role="tablist",
                     cls="tabs tabs-lifted"
                 ),
                 cls="px-6"
             ),
             
-            # Questions list
-            QuestionsListContainer(questions, user_likes=user_likes),
+            # Questions list; further pages load as the guest scrolls
+            QuestionsListContainer(
+                page.questions, user_likes=user_likes,
+                next_url=next_page_url(f"/qa/event/{event_id}/questions", "popular", page)
+            ),
             
             # SSE connection for live updates
             Script(f"""
                 if (typeof(EventSource) !== "undefined") {{
                     const eventSource = new EventSource('/qa/event/{event_id}/stream');
                     
-                    eventSource.addEventListener('question_update', function(e) {{
-                        const data = JSON.parse(e.data);
-                        // Trigger HTMX refresh of questions list to show new/updated questions
-                        htmx.ajax('GET', '/qa/event/{event_id}/questions?sort=recent', {{
+                    function refreshQuestions() {{
+                        // Full list refetch, only needed on resync
+                        const activeTab = document.querySelector('.tab.tab-active');
+                        const sort = activeTab ? activeTab.id.replace('-tab', '') : 'popular';
+                        htmx.ajax('GET', '/qa/event/{event_id}/questions?sort=' + sort, {{
                             target: '#questions-list',
                             swap: 'outerHTML'
                         }});
+                    }}
+                    
+                    // Patch the pushed card into the list in place
+                    eventSource.addEventListener('question_update', function(e) {{
+                        applyQuestionUpdate(JSON.parse(e.data), refreshQuestions);
                     }});
                     
+                    // Updates merged by the server's coalescing window
+                    eventSource.addEventListener('question_batch', function(e) {{
+                        JSON.parse(e.data).updates.forEach(function(data) {{
+                            applyQuestionUpdate(data, refreshQuestions);
+                        }});
+                    }});
+                    
+                    // Sent on reconnect when missed updates are no longer buffered
+                    eventSource.addEventListener('resync', refreshQuestions);
+                    
                     eventSource.onerror = function(e) {{
-                        console.error('SSE error:', e);
-                        eventSource.close();
+                        // The browser reconnects on its own and resumes via Last-Event-ID
+                        console.warn('SSE connection lost, reconnecting...', e);
                     }};
                     
                     // Cleanup on page unload
@@ -186,22 +261,21 @@ async def get(request, sess, event_id: int):
 
 @rt('/qa/event/{event_id}/questions')
 @require_conference_day
-async def get(request, event_id: int, sort: str = "recent"):
-    """Get questions list (for tab switching) - accessible to everyone"""
+async def get(request, event_id: int, sort: str = "recent", cursor: str = None):
+    """Get questions list (for tab switching), or the page after `cursor` - accessible to everyone"""
     session_id = get_or_create_session_id(request)
+    sort = sort if sort in SORTS else RECENT
     
-    async with db_manager.AsyncSessionLocal() as db:
-        questions = await get_questions_by_event(db, event_id, visible_only=True, sort_by=sort)
-        
-        # Check which questions user has liked
-        user_likes = set()
-        for q in questions:
-            if await check_user_liked(db, str(q.id), session_id):
-                user_likes.add(str(q.id))
+    page = await visible_page(event_id, sort, cursor)
+    user_likes = await session_likes(event_id, session_id)
+    next_url = next_page_url(f"/qa/event/{event_id}/questions", sort, page)
+    
+    if cursor:
+        return QuestionsPage(page.questions, user_likes=user_likes, next_url=next_url)
     
     # Update tab active state and return components directly
     return (
-        QuestionsListContainer(questions, user_likes=user_likes),
+        QuestionsListContainer(page.questions, user_likes=user_likes, next_url=next_url),
         Script(f"""
             (function() {{
                 // Update tab active states and custom colors
@@ -230,7 +304,7 @@ async def post(request, event_id: int):
     
     async with db_manager.AsyncSessionLocal() as db:
         # Validate event exists and QA is active
-        event = await get_event(db, event_id)
+        event = await catalog_cache.event(event_id)
         if not event:
             return Div(
                 P("Event not found", cls="text-error"),
@@ -264,17 +338,12 @@ async def post(request, event_id: int):
         # Broadcast update via SSE
         await sse_manager.send_question_update(
             event_id,
-            {
-                "id": str(question.id),
-                "nickname": question.nickname,
-                "question_text": question.question_text,
-                "is_visible": question.is_visible,
-                "is_answered": question.is_answered,
-                "likes_count": question.likes_count,
-                "created_at": question.created_at.isoformat()
-            },
-            "created"
+            question_update_payload(question),
+            "created",
+            html=question_card_html(question),
+            moderator_html=moderator_card_html(question)
         )
+        await sse_manager.send_stats_update(event_id, total=1, visible=int(question.is_visible))
     
     # Return success message and reset form
     return (
@@ -293,52 +362,49 @@ async def post(request, question_id: str):
     """Toggle like on a question - accessible to everyone"""
     session_id = get_or_create_session_id(request)
     
-    async with db_manager.AsyncSessionLocal() as db:
-        question = await get_question(db, question_id)
-        if not question:
-            return Response("Question not found", status_code=404)
-        
-        # Toggle like
-        liked, new_count = await toggle_like(db, question_id, session_id)
-        
-        # Broadcast like update via SSE
-        await sse_manager.send_question_update(
-            question.event_id,
-            {
-                "id": str(question.id),
-                "likes_count": new_count
-            },
-            "like_updated"
-        )
-        
-        # Refresh question to get updated data
-        question = await get_question(db, question_id)
-        user_liked = await check_user_liked(db, question_id, session_id)
+    # Toggle like (buffered in memory when LIKE_WRITE_MODE=write_behind)
+    if like_aggregator.enabled:
+        result = await like_aggregator.toggle(question_id, session_id)
+    else:
+        async with db_manager.AsyncSessionLocal() as db:
+            result = await toggle_like(db, question_id, session_id)
+    if not result:
+        return Response("Question not found", status_code=404)
+    
+    # Broadcast like update via SSE
+    await sse_manager.send_question_update(
+        result.event_id,
+        {
+            "id": question_id,
+            "likes_count": result.likes_count,
+            "is_visible": result.is_visible
+        },
+        "like_updated"
+    )
     
     return (
-        QuestionCard(question, show_admin_controls=False, user_liked=user_liked),
+        LikeButton(question_id, result.likes_count, user_liked=result.liked),
         cookie('qa_session_id', session_id, max_age=86400*30)  # 30 days
     )
 
-@rt('/qa/event/{event_id}/stream')
-@require_conference_day
-async def get(request, event_id: int):
-    """SSE endpoint for live updates - accessible to everyone"""
+def event_stream_response(request, event_id: int, audience: str = PUBLIC):
+    """Stream one audience channel of an event as Server-Sent Events"""
+    # Sent by the browser when EventSource reconnects after a drop
+    last_event_id = request.headers.get('last-event-id')
+
     async def event_stream():
-        queue = await sse_manager.subscribe(event_id)
+        queue = await sse_manager.subscribe(event_id, last_event_id=last_event_id, audience=audience)
         try:
             # Send initial connection message
-            yield "event: connected\ndata: {\"status\": \"connected\"}\n\n"
+            yield CONNECTED_FRAME
             
-            # Keep connection alive with periodic pings
+            # Keepalives are queued by the manager's shared heartbeat ticker
             while True:
-                try:
-                    # Wait for message with timeout
-                    message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield message.format()
-                except asyncio.TimeoutError:
-                    # Send keepalive ping
-                    yield ": keepalive\n\n"
+                message = await queue.get()
+                if message is None:
+                    # Evicted by the channel's overflow policy
+                    break
+                yield message.frame
         except asyncio.CancelledError:
             pass
         finally:
@@ -354,19 +420,26 @@ async def get(request, event_id: int):
         }
     )
 
+@rt('/qa/event/{event_id}/stream')
+@require_conference_day
+async def get(request, event_id: int):
+    """SSE endpoint for live updates - accessible to everyone (visible questions only)"""
+    return event_stream_response(request, event_id, PUBLIC)
+
 # Moderator routes - require authentication via decorator
 @rt('/qa/moderator/event/{event_id}')
 @require_conference_day
 @require_moderator
 async def get(req, sess, event_id: int):
     """Moderator view for Q&A"""
+    event = await catalog_cache.event(event_id)
+    if not event:
+        return Response("Event not found", status_code=404)
+    
     async with db_manager.AsyncSessionLocal() as db:
-        event = await get_event(db, event_id)
-        if not event:
-            return Response("Event not found", status_code=404)
-        
-        # Get ALL questions (including hidden)
-        questions = await get_questions_by_event(db, event_id, visible_only=False, sort_by="popular")
+        # First page of ALL questions (including hidden)
+        page = await get_questions_page(db, event_id, visible_only=False, sort_by="popular")
+        stats = await get_question_stats(db, event_id)
     
     return AppContainer(
         Div(
@@ -400,32 +473,13 @@ async def get(req, sess, event_id: int):
                 cls="mb-8"
             ),
             
-            # Stats
+            # Stats (kept current by question_stats deltas on the stream)
             Div(
-                Div(
-                    Div(
-                        Span(str(len(questions)), cls="text-3xl font-bold"),
-                        Span("Total Questions", cls="text-sm text-base-content/70"),
-                        cls="stat"
-                    ),
-                    Div(
-                        Span(str(sum(1 for q in questions if q.is_visible)), cls="text-3xl font-bold"),
-                        Span("Visible", cls="text-sm text-base-content/70"),
-                        cls="stat",
-                        style="color: #00A651;"
-                    ),
-                    Div(
-                        Span(str(sum(1 for q in questions if q.is_answered)), cls="text-3xl font-bold"),
-                        Span("Answered", cls="text-sm text-base-content/70"),
-                        cls="stat",
-                        style="color: var(--primary-color);"
-                    ),
-                    cls="stats shadow mb-6"
-                ),
+                ModeratorStats(stats),
                 cls="px-6"
             ),
             
-            # Tabs for Recent/Popular
+            # Tabs for Popular/Recent/Trending
             Div(
                 Div(
                     A(
@@ -446,6 +500,15 @@ async def get(req, sess, event_id: int):
                         hx_target="#questions-list",
                         hx_swap="outerHTML"
                     ),
+                    A(
+                        "Trending",
+                        role="tab",
+                        cls="tab",
+                        id="trending-tab",
+                        hx_get=f"/qa/moderator/event/{event_id}/questions?sort=trending",
+                        hx_target="#questions-list",
+                        hx_swap="outerHTML"
+                    ),
                     role="tablist",
                     cls="tabs tabs-lifted"
                 ),
@@ -453,22 +516,55 @@ async def get(req, sess, event_id: int):
             ),
 
             # Questions list
-            QuestionsListContainer(questions, show_admin_controls=True),
+            QuestionsListContainer(
+                page.questions, show_admin_controls=True,
+                next_url=next_page_url(f"/qa/moderator/event/{event_id}/questions", "popular", page)
+            ),
             
             # SSE connection for live updates
             Script(f"""
                 if (typeof(EventSource) !== "undefined") {{
-                    const eventSource = new EventSource('/qa/event/{event_id}/stream');
+                    const eventSource = new EventSource('/qa/moderator/event/{event_id}/stream');
+                    // Hidden questions stay on the console; only deletes remove a card
+                    const options = {{ keepHidden: true }};
                     
+                    function refreshQuestions() {{
+                        // Full list and counter refetch, only needed on resync
+                        const activeTab = document.querySelector('.tab.tab-active');
+                        const sort = activeTab ? activeTab.id.replace('-tab', '') : 'popular';
+                        htmx.ajax('GET', '/qa/moderator/event/{event_id}/questions?sort=' + sort, {{
+                            target: '#questions-list',
+                            swap: 'outerHTML'
+                        }});
+                        htmx.ajax('GET', '/qa/moderator/event/{event_id}/stats', {{
+                            target: '#question-stats',
+                            swap: 'outerHTML'
+                        }});
+                    }}
+                    
+                    // Patch the pushed moderator card into the list in place
                     eventSource.addEventListener('question_update', function(e) {{
-                        const data = JSON.parse(e.data);
-                        // Refresh questions list to show all updates (new, visibility, answered, likes)
-                        location.reload();
+                        applyQuestionUpdate(JSON.parse(e.data), refreshQuestions, options);
+                    }});
+                    
+                    // Updates merged by the server's coalescing window
+                    eventSource.addEventListener('question_batch', function(e) {{
+                        JSON.parse(e.data).updates.forEach(function(data) {{
+                            applyQuestionUpdate(data, refreshQuestions, options);
+                        }});
                     }});
                     
+                    // Total / visible / answered counter changes
+                    eventSource.addEventListener('question_stats', function(e) {{
+                        applyStatsDelta(JSON.parse(e.data));
+                    }});
+                    
+                    // Sent on reconnect when missed updates are no longer buffered
+                    eventSource.addEventListener('resync', refreshQuestions);
+                    
                     eventSource.onerror = function(e) {{
-                        console.error('SSE error:', e);
-                        eventSource.close();
+                        // The browser reconnects on its own and resumes via Last-Event-ID
+                        console.warn('SSE connection lost, reconnecting...', e);
                     }};
                     
                     // Cleanup on page unload
@@ -485,18 +581,34 @@ async def get(req, sess, event_id: int):
         request=req
     )
 
+@rt('/qa/moderator/event/{event_id}/stats')
+@require_conference_day
+@require_moderator
+async def get(req, sess, event_id: int):
+    """Question counters for the moderator console (refetched on resync)"""
+    async with db_manager.AsyncSessionLocal() as db:
+        stats = await get_question_stats(db, event_id)
+    return ModeratorStats(stats)
+
 @rt('/qa/moderator/event/{event_id}/questions')
 @require_conference_day
 @require_moderator
-async def get(req, sess, event_id: int, sort: str = "recent"):
-    """Get questions list for moderator (for tab switching) - includes hidden questions"""
+async def get(req, sess, event_id: int, sort: str = "recent", cursor: str = None):
+    """Get questions list for moderator (for tab switching), or the page after `cursor` - includes hidden questions"""
+    sort = sort if sort in SORTS else RECENT
     async with db_manager.AsyncSessionLocal() as db:
         # Get ALL questions (including hidden)
-        questions = await get_questions_by_event(db, event_id, visible_only=False, sort_by=sort)
+        page = await get_questions_page(
+            db, event_id, visible_only=False, sort_by=sort, after=decode_cursor(sort, cursor)
+        )
+    next_url = next_page_url(f"/qa/moderator/event/{event_id}/questions", sort, page)
+    
+    if cursor:
+        return QuestionsPage(page.questions, show_admin_controls=True, next_url=next_url)
     
     # Update tab active state and return components directly
     return (
-        QuestionsListContainer(questions, show_admin_controls=True),
+        QuestionsListContainer(page.questions, show_admin_controls=True, next_url=next_url),
         Script(f"""
             (function() {{
                 // Update tab active states and custom colors
@@ -521,41 +633,62 @@ async def get(req, sess, event_id: int, sort: str = "recent"):
 @require_moderator
 async def get(req, sess):
     """Moderator main page - select session to moderate"""
-    async with db_manager.AsyncSessionLocal() as db:
-        events = await get_events(db)
-        
-        # Sort events by start time
-        events = sorted(events, key=lambda e: e.start_time)
-        
-        # Build event cards - moderator view (same appearance, different href)
-        event_cards = [SessionCard(event, is_moderator=True) for event in events]
-        
-        return AppContainer(
+    # Already sorted by start time
+    events = await catalog_cache.events()
+    
+    # Build event cards - moderator view (same appearance, different href)
+    event_cards = [SessionCard(event, is_moderator=True) for event in events]
+    
+    return AppContainer(
+        Div(
+            TopNav("Q&A Sessions"),
             Div(
-                TopNav("Q&A Sessions"),
-                Div(
-                    P(
-                        "Select a session to view or ask questions",
-                        cls="text-sm"
-                    ),
-                    cls="text-center mb-8"
+                P(
+                    "Select a session to view or ask questions",
+                    cls="text-sm"
                 ),
-                Div(
-                    *event_cards if event_cards else [
-                        Div(
-                            I(cls="fas fa-inbox text-4xl text-base-content/30 mb-4"),
-                            P("No Q&A sessions available", cls="text-base-content/60"),
-                            cls="timeline-box"
-                        )
-                    ],
-                    cls="flex flex-col gap-4"
-                ),
-                id='page-content',
-                cls='container mx-auto px-4 py-8 blue-background'
+                cls="text-center mb-8"
             ),
-            is_moderator=is_moderator(sess),
-            request=req
-        )
+            Div(
+                *event_cards if event_cards else [
+                    Div(
+                        I(cls="fas fa-inbox text-4xl text-base-content/30 mb-4"),
+                        P("No Q&A sessions available", cls="text-base-content/60"),
+                        cls="timeline-box"
+                    )
+                ],
+                cls="flex flex-col gap-4"
+            ),
+            id='page-content',
+            cls='container mx-auto px-4 py-8 blue-background'
+        ),
+        is_moderator=is_moderator(sess),
+        request=req
+    )
+
+@rt('/qa/moderator/event/{event_id}/stream')
+@require_conference_day
+@require_moderator
+async def get(req, sess, event_id: int):
+    """SSE endpoint for moderators - includes pending (hidden) questions"""
+    return event_stream_response(req, event_id, MODERATORS)
+
+@rt('/qa/moderator/sse-stats')
+@require_moderator
+async def get(req, sess):
+    """SSE fan-out counters (dropped/coalesced/evicted) for sizing queue maxsize"""
+    return JSONResponse(sse_manager.stats.as_dict())
+
+@rt('/qa/moderator/cache-stats')
+@require_moderator
+async def get(req, sess):
+    """Question list, rendered card and catalog cache hit/miss counters, plus invalidation bus traffic"""
+    return JSONResponse({
+        "lists": question_cache.stats(),
+        "cards": card_cache.stats(),
+        "catalog": catalog_cache.stats(),
+        "bus": invalidation_bus.stats()
+    })
 
 @rt('/qa/moderator/event/{event_id}/toggle-qa')
 @require_conference_day
@@ -583,16 +716,17 @@ async def post(req, sess, question_id: str):
         # Toggle visibility
         update_data = QuestionUpdate(is_visible=not question.is_visible)
         question = await update_question(db, question_id, update_data)
+        like_aggregator.set_visibility(question_id, question.is_visible)
         
-        # Broadcast update via SSE
+        # Broadcast update via SSE (guests drop the card when it is hidden)
         await sse_manager.send_question_update(
             question.event_id,
-            {
-                "id": str(question.id),
-                "is_visible": question.is_visible
-            },
-            "updated"
+            question_update_payload(question),
+            "updated" if question.is_visible else "hidden",
+            html=question_card_html(question),
+            moderator_html=moderator_card_html(question)
         )
+        await sse_manager.send_stats_update(question.event_id, visible=1 if question.is_visible else -1)
     
     return QuestionCard(question, show_admin_controls=True)
 
@@ -613,12 +747,12 @@ async def post(req, sess, question_id: str):
         # Broadcast update via SSE
         await sse_manager.send_question_update(
             question.event_id,
-            {
-                "id": str(question.id),
-                "is_answered": question.is_answered
-            },
-            "updated"
+            question_update_payload(question),
+            "updated",
+            html=question_card_html(question),
+            moderator_html=moderator_card_html(question)
         )
+        await sse_manager.send_stats_update(question.event_id, answered=1 if question.is_answered else -1)
     
     return QuestionCard(question, show_admin_controls=True)
 
@@ -633,16 +767,20 @@ async def delete(req, sess, question_id: str):
             return Response("Question not found", status_code=404)
         
         event_id = question.event_id
+        was_visible = question.is_visible
+        was_answered = question.is_answered
         
         # Delete question
         await delete_question(db, question_id)
+        like_aggregator.discard(question_id)
         
         # Broadcast update via SSE
         await sse_manager.send_question_update(
             event_id,
-            {"id": question_id},
+            {"id": question_id, "is_visible": was_visible},
             "deleted"
         )
+        await sse_manager.send_stats_update(event_id, total=-1, visible=-int(was_visible), answered=-int(was_answered))
     
     # Return empty response to remove the card
     return Response("")
@@ -2,20 +2,16 @@ from components.page import AppContainer
 from components.cards import session_speaker_card
 from components.navigation import TopNav
 from fasthtml.common import RedirectResponse
-from crud.event import get_event, get_events
-from crud.speaker import get_speaker
+from utils.catalog_cache import catalog_cache
 from fasthtml.components import H1, H3, Div, P
 from components.timeline import agenda_timeline, agenda_timeline_2
-from db.connection import db_manager
 from core.app import rt
 from utils.auth import is_moderator
 
 @rt('/agenda')
 async def get(req, sess):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        events = await get_events(db_session)
-        # sort by start_time
-        events.sort(key=lambda e: e.start_time)
+    # Already sorted by start_time
+    events = await catalog_cache.events()
     return AppContainer(
             Div(
                 TopNav('Agenda'),
@@ -31,8 +27,7 @@ async def get(req, sess):
 
 @rt('/agenda_2')
 async def get(req, sess):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        sessions = await get_events(db_session)
+    sessions = await catalog_cache.events()
     return AppContainer(
             Div(
                 Div(
@@ -50,8 +45,7 @@ async def get(req, sess):
 
 @rt('/session/{session_id}')
 async def get(req, sess, session_id: int):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        session = await get_event(db_session, session_id)
+    session = await catalog_cache.event(session_id)
     if session:
         return AppContainer(
                 Div(
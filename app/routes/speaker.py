@@ -1,17 +1,17 @@
 from fasthtml.components import Div
 from components.page import AppContainer
-from fasthtml.common import RedirectResponse
+from fasthtml.common import RedirectResponse, Response
 from components.cards import brief_speaker_card, speaker_page
-from crud.speaker import get_speakers, get_speaker
-from db.connection import db_manager
+from utils.catalog_cache import catalog_cache
+from utils.avatars import speaker_avatar
+from core.assets import IMMUTABLE, REVALIDATE, etag_matches
 from core.app import rt
 from utils.auth import is_moderator
 from components.navigation import TopNav
 
 @rt('/speakers')
 async def get(req, sess):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        speakers = await get_speakers(db_session)
+    speakers = await catalog_cache.speakers()
     return AppContainer(
             Div(
                 TopNav('Speakers'),
@@ -25,8 +25,7 @@ async def get(req, sess):
 
 @rt('/speakers/{speaker_id}')
 async def get(req, sess, speaker_id: int):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        speaker = await get_speaker(db_session, speaker_id)
+    speaker = await catalog_cache.speaker(speaker_id)
     if speaker:
         return AppContainer(
             Div(
@@ -37,4 +36,21 @@ async def get(req, sess, speaker_id: int):
             active_button_index=3,
             is_moderator=is_moderator(sess)
         )
-    return RedirectResponse('/speakers', status_code=303)
\ No newline at end of file
+    return RedirectResponse('/speakers', status_code=303)
+
+@rt('/avatars/{speaker_id}')
+async def get(req, speaker_id: int, v: str = None):
+    """Generated initials avatar for a speaker without a photo"""
+    speaker = await catalog_cache.speaker(speaker_id)
+    if speaker is None:
+        return Response("Avatar not found", status_code=404)
+
+    avatar = speaker_avatar(speaker.id, speaker.name)
+    headers = {
+        "ETag": f'"{avatar.fingerprint}"',
+        # Links from avatar_url() carry the fingerprint; a renamed speaker gets a new URL
+        "Cache-Control": IMMUTABLE if v == avatar.fingerprint else REVALIDATE
+    }
+    if etag_matches(req.headers.get('if-none-match'), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(avatar.svg, media_type="image/svg+xml", headers=headers)
@@ -2,8 +2,7 @@ from fasthtml.components import Div, H1, P
 from components.page import AppContainer
 from fasthtml.common import RedirectResponse
 from components.cards import brief_sponsor_card, sponsor_page
-from crud.sponsor import get_sponsors, get_sponsor
-from db.connection import db_manager
+from utils.catalog_cache import catalog_cache
 from core.app import rt
 from utils.auth import is_moderator
 from components.navigation import TopNav
@@ -11,8 +10,7 @@ from components.navigation import TopNav
 
 # @rt('/sponsors')
 # async def get(req, sess):
-#     async with db_manager.AsyncSessionLocal() as db_session:
-#         sponsors = await get_sponsors(db_session)
+#     sponsors = await catalog_cache.sponsors()
 #     return AppContainer(
 #             Div(
 #                 TopNav('Sponsors'),
@@ -47,8 +45,7 @@ async def get(req, sess):
 
 @rt('/sponsors/{sponsor_id}')
 async def get(req, sess, sponsor_id: int):
-    async with db_manager.AsyncSessionLocal() as db_session:
-        sponsor = await get_sponsor(db_session, sponsor_id)
+    sponsor = await catalog_cache.sponsor(sponsor_id)
     if sponsor:
         return AppContainer(
             Div(
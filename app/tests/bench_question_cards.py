@@ -0,0 +1,71 @@
+"""
+Benchmark: rendering a question list of N cards.
+
+Compares building the QuestionCard FT tree for every card on every request
+with the rendered-card cache, cold (first request after the cards changed)
+and warm (every later request).
+
+    cd app && python -m tests.bench_question_cards
+    python -m tests.bench_question_cards --questions 1000 --rounds 20
+"""
+import argparse
+import time
+from datetime import datetime, timezone, timedelta
+
+from fasthtml.common import to_xml, Div
+from components.qa import QuestionCard, QuestionsListContainer
+from utils.question_cache import QuestionView, card_cache
+
+def sample_questions(count: int) -> tuple:
+    now = datetime.now(timezone.utc)
+    return tuple(
+        QuestionView(
+            id=f"6f1c2a4e-0000-4000-8000-{n:012d}",
+            event_id=1,
+            nickname=f"Attendee {n}",
+            question_text="How can we implement this in real-world scenarios?",
+            is_visible=True,
+            is_answered=n % 5 == 0,
+            likes_count=n % 40,
+            created_at=now - timedelta(minutes=n)
+        )
+        for n in range(count)
+    )
+
+def timed(render, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        render()
+    return (time.perf_counter() - start) / rounds
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark QuestionCard rendering with and without the card cache")
+    parser.add_argument("--questions", "-q", type=int, default=1000)
+    parser.add_argument("--rounds", "-r", type=int, default=20)
+    args = parser.parse_args()
+
+    questions = sample_questions(args.questions)
+    user_likes = {q.id for q in questions[::10]}
+
+    def uncached():
+        to_xml(Div(*[QuestionCard(q, False, q.id in user_likes) for q in questions]))
+
+    def cold():
+        card_cache.clear()
+        to_xml(QuestionsListContainer(questions, user_likes=user_likes))
+
+    def warm():
+        to_xml(QuestionsListContainer(questions, user_likes=user_likes))
+
+    uncached_ms = timed(uncached, args.rounds) * 1000
+    cold_ms = timed(cold, args.rounds) * 1000
+    warm()
+    warm_ms = timed(warm, args.rounds) * 1000
+
+    print(f"{args.questions} questions, {args.rounds} rounds")
+    print(f"{'uncached FT render':>20}: {uncached_ms:8.2f} ms")
+    print(f"{'cold card cache':>20}: {cold_ms:8.2f} ms")
+    print(f"{'warm card cache':>20}: {warm_ms:8.2f} ms  ({uncached_ms / warm_ms:.0f}x faster)")
+
+if __name__ == "__main__":
+    main()
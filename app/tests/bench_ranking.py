@@ -0,0 +1,74 @@
+"""
+Benchmark: applying a like to the popular/recent index of one event.
+
+Compares the popular and recent keys kept in plain sorted lists, where
+every insort/delete shifts the tail of the list, with the SortedLists
+EventRanking uses, and the whole EventRanking.set_likes() call.
+
+    cd app && python -m tests.bench_ranking
+    python -m tests.bench_ranking --questions 1000 10000 100000 --rounds 2000
+"""
+import argparse
+import random
+import time
+from bisect import bisect_left, insort
+
+from sortedcontainers import SortedList
+
+from utils.question_ranking import EventRanking
+from tests.bench_trending import sample_questions
+
+def timed_us(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ranking updates")
+    parser.add_argument("--questions", "-q", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--rounds", "-r", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'plain list':>12} {'SortedList':>12} {'set_likes':>12}  (µs per like)")
+    for count in args.questions:
+        questions = sample_questions(count)
+        rng = random.Random(2)
+        ranking = EventRanking(questions)
+        likes = {q.id: q.likes_count for q in questions}
+        ids = list(likes)
+
+        created = {q.id: -q.created_at.timestamp() for q in questions}
+        popular = sorted((-likes[i], created[i], i) for i in ids)
+        recent = sorted((created[i], i) for i in ids)
+        sorted_popular, sorted_recent = SortedList(popular), SortedList(recent)
+        sorted_likes = dict(likes)
+
+        def like_plain():
+            # Remove and re-insert in both orders, as EventRanking.upsert does
+            question_id = rng.choice(ids)
+            del popular[bisect_left(popular, (-likes[question_id], created[question_id], question_id))]
+            del recent[bisect_left(recent, (created[question_id], question_id))]
+            likes[question_id] += 1
+            insort(popular, (-likes[question_id], created[question_id], question_id))
+            insort(recent, (created[question_id], question_id))
+
+        def like_sorted_list():
+            question_id = rng.choice(ids)
+            sorted_popular.remove((-sorted_likes[question_id], created[question_id], question_id))
+            sorted_recent.remove((created[question_id], question_id))
+            sorted_likes[question_id] += 1
+            sorted_popular.add((-sorted_likes[question_id], created[question_id], question_id))
+            sorted_recent.add((created[question_id], question_id))
+
+        def like_ranking():
+            question_id = rng.choice(ids)
+            ranking.set_likes(question_id, ranking.get(question_id).likes_count + 1)
+
+        print(
+            f"{count:>10} {timed_us(like_plain, args.rounds):>12.2f} "
+            f"{timed_us(like_sorted_list, args.rounds):>12.2f} {timed_us(like_ranking, args.rounds):>12.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
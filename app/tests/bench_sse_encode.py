@@ -0,0 +1,77 @@
+"""
+Micro-benchmark: cost of encoding one broadcast for N subscribers.
+
+Compares the old path (every subscriber stream calls json.dumps on the same
+message) with pre-encoded frames (one encode per broadcast, shared bytes).
+
+    cd app && python -m tests.bench_sse_encode
+    python -m tests.bench_sse_encode --subscribers 10 100 1000 5000 --rounds 200
+"""
+import argparse
+import json
+import time
+import asyncio
+
+from utils.sse_manager import SSEManager, SSEMessage, InProcessBackend
+
+def sample_question(n: int) -> dict:
+    return {
+        "id": f"6f1c2a4e-0000-4000-8000-{n:012d}",
+        "nickname": "Attendee",
+        "question_text": "How can we implement this in real-world scenarios?" * 2,
+        "is_visible": True,
+        "is_answered": False,
+        "likes_count": n,
+        "created_at": "2025-10-18T15:04:05+00:00",
+    }
+
+def per_subscriber_encode(subscribers: int, rounds: int) -> float:
+    """Old behaviour: one json.dumps per subscriber per message"""
+    start = time.perf_counter()
+    for n in range(rounds):
+        data = {"action": "like_updated", "question": sample_question(n)}
+        for _ in range(subscribers):
+            f"event: question_update\ndata: {json.dumps(data)}\n\n"
+    return (time.perf_counter() - start) / rounds
+
+def shared_frame_encode(subscribers: int, rounds: int) -> float:
+    """New behaviour: encode once, hand the same bytes to every queue"""
+    start = time.perf_counter()
+    for n in range(rounds):
+        message = SSEMessage("question_update", {"action": "like_updated", "question": sample_question(n)})
+        for _ in range(subscribers):
+            message.frame
+    return (time.perf_counter() - start) / rounds
+
+async def fan_out_encode_share(subscribers: int) -> float:
+    """Fraction of a real fan-out that is spent encoding (one frame per broadcast)"""
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, maxsize=10_000)
+    queues = [await manager.subscribe(1) for _ in range(subscribers)]
+    message = SSEMessage("question_update", {"action": "created", "question": sample_question(0)})
+
+    start = time.perf_counter()
+    await manager.broadcast(1, message)
+    elapsed = time.perf_counter() - start
+
+    assert all(q.qsize() == 1 for q in queues)
+    frames = {id(q._buffer[0].frame) for q in queues}
+    assert len(frames) == 1, "every subscriber should share one encoded frame"
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE frame encoding vs subscriber count")
+    parser.add_argument("--subscribers", "-s", type=int, nargs="+", default=[1, 10, 100, 1000, 5000])
+    parser.add_argument("--rounds", "-r", type=int, default=100)
+    args = parser.parse_args()
+
+    print("Encodes per broadcast: per-subscriber = N, shared frame = 1")
+    print(f"{'subscribers':>12} {'per-subscriber (ms)':>20} {'shared frame (ms)':>18} {'fan-out (ms)':>13}")
+    for count in args.subscribers:
+        old = per_subscriber_encode(count, args.rounds) * 1000
+        new = shared_frame_encode(count, args.rounds) * 1000
+        fan_out = asyncio.run(fan_out_encode_share(count)) * 1000
+        print(f"{count:>12} {old:>20.3f} {new:>18.3f} {fan_out:>13.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: event-loop CPU spent keeping N idle SSE streams alive.
+
+Compares the old per-connection loop (asyncio.wait_for on every get, one
+timer and wrapper task per stream) with the shared heartbeat ticker in
+SSEManager. The keepalive interval is shortened so a few seconds of wall
+time covers several keepalive rounds.
+
+    cd app && python -m tests.bench_sse_heartbeat
+    python -m tests.bench_sse_heartbeat --connections 5000 --interval 1 --duration 10
+"""
+import argparse
+import asyncio
+import time
+
+from utils.sse_manager import SSEManager, InProcessBackend, KEEPALIVE_FRAME
+
+async def per_connection_timers(connections: int, interval: float, duration: float) -> tuple:
+    """Old behaviour: every stream waits on its own wait_for timeout"""
+    keepalives = 0
+
+    async def stream(queue: asyncio.Queue):
+        nonlocal keepalives
+        while True:
+            try:
+                await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                keepalives += 1
+
+    tasks = [asyncio.create_task(stream(asyncio.Queue())) for _ in range(connections)]
+    cpu = await measure(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return cpu, keepalives
+
+async def shared_ticker(connections: int, interval: float, duration: float) -> tuple:
+    """New behaviour: one ticker queues the shared keepalive frame"""
+    keepalives = 0
+    manager = SSEManager(InProcessBackend())
+    manager.HEARTBEAT_INTERVAL = interval
+    manager.HEARTBEAT_JITTER = interval / 5
+    manager.HEARTBEAT_TICK = min(1.0, interval / 4)
+
+    async def stream(subscriber):
+        nonlocal keepalives
+        while True:
+            message = await subscriber.get()
+            if message.frame is KEEPALIVE_FRAME:
+                keepalives += 1
+
+    subscribers = [await manager.subscribe(n % 10) for n in range(connections)]
+    tasks = [asyncio.create_task(stream(s)) for s in subscribers]
+    cpu = await measure(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await manager.stop()
+    return cpu, keepalives
+
+async def measure(duration: float) -> float:
+    """Process CPU seconds used while the loop runs idle streams for `duration`"""
+    start = time.process_time()
+    await asyncio.sleep(duration)
+    return time.process_time() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE keepalive CPU for idle connections")
+    parser.add_argument("--connections", "-c", type=int, default=5000)
+    parser.add_argument("--interval", "-i", type=float, default=1.0, help="Keepalive interval in seconds")
+    parser.add_argument("--duration", "-d", type=float, default=10.0, help="Seconds to measure each mode")
+    args = parser.parse_args()
+
+    print(f"{args.connections} idle connections, keepalive every {args.interval}s, {args.duration}s per run")
+    print(f"{'mode':>22} {'cpu (s)':>9} {'cpu %':>7} {'keepalives':>11}")
+    for name, run in (("wait_for per stream", per_connection_timers), ("shared ticker", shared_ticker)):
+        cpu, keepalives = asyncio.run(run(args.connections, args.interval, args.duration))
+        print(f"{name:>22} {cpu:>9.3f} {cpu / args.duration * 100:>6.1f}% {keepalives:>11}")
+
+if __name__ == "__main__":
+    main()
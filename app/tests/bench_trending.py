@@ -0,0 +1,67 @@
+"""
+Benchmark: rescoring the trending sort for one event.
+
+Compares a per-question Python score + sort with the NumPy batch used by
+EventRanking.refresh_trending, and the cost of serving the trending list
+between ticks.
+
+    cd app && python -m tests.bench_trending
+    python -m tests.bench_trending --questions 10000 --rounds 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone, timedelta
+
+from utils.question_cache import QuestionView
+from utils.question_ranking import EventRanking, TRENDING_GRAVITY
+
+def sample_questions(count: int) -> list:
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    return [
+        QuestionView(
+            id=f"6f1c2a4e-0000-4000-8000-{n:012d}",
+            event_id=1,
+            nickname="Attendee",
+            question_text="How can we implement this in real-world scenarios?",
+            is_visible=True,
+            is_answered=False,
+            likes_count=int(rng.paretovariate(1.2)) - 1,
+            created_at=now - timedelta(seconds=rng.randrange(4 * 3600))
+        )
+        for n in range(count)
+    ]
+
+def python_trending(questions: list, now: float) -> list:
+    def score(q):
+        age_hours = max(now - q.created_at.timestamp(), 0) / 3600
+        return (q.likes_count + 1) / (age_hours + 2) ** TRENDING_GRAVITY
+    return [q.id for q in sorted(questions, key=lambda q: (-score(q), -q.created_at.timestamp()))]
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trending rescoring")
+    parser.add_argument("--questions", "-q", type=int, default=10_000)
+    parser.add_argument("--rounds", "-r", type=int, default=20)
+    args = parser.parse_args()
+
+    questions = sample_questions(args.questions)
+    ranking = EventRanking(questions)
+    now = time.time()
+    ranking.refresh_trending(now)
+    assert [q.id for q in ranking.ordered("trending")] == python_trending(questions, now)
+
+    print(f"{args.questions} questions, {args.rounds} rounds")
+    print(f"{'python score + sort':>24}: {timed(lambda: python_trending(questions, now), args.rounds):8.2f} ms")
+    print(f"{'numpy refresh (per tick)':>24}: {timed(lambda: ranking.refresh_trending(now), args.rounds):8.2f} ms")
+    print(f"{'serve full list':>24}: {timed(lambda: ranking.ordered('trending'), args.rounds):8.2f} ms")
+    print(f"{'serve top 50':>24}: {timed(lambda: ranking.ordered('trending', limit=50), args.rounds):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
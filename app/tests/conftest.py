@@ -0,0 +1,56 @@
+"""
+Shared test helpers.
+
+Tests that need Postgres are marked requires_postgres and only run when
+DATABASE_URL points at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests
+"""
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+requires_postgres = pytest.mark.skipif(
+    not (os.getenv('DATABASE_URL') or '').startswith('postgresql'),
+    reason="needs DATABASE_URL pointing at a local Postgres"
+)
+
+def run_async(test):
+    """Run an async test function to completion in its own event loop"""
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(test(*args, **kwargs))
+    return wrapper
+
+@asynccontextmanager
+async def database():
+    """
+    db_manager with every table created. Pooled connections belong to the
+    event loop that opened them, so they are closed on the way out.
+    """
+    from db.connection import db_manager
+
+    await db_manager.create_tables()
+    try:
+        yield db_manager
+    finally:
+        await db_manager.engine.dispose()
+
+@pytest.fixture
+def app_client(monkeypatch):
+    """
+    TestClient for main.app with every table created. Seed and clean up
+    through app_client.portal.call so the pool stays on the app's event loop.
+    """
+    from starlette.testclient import TestClient
+    from db.connection import db_manager
+    from main import app
+
+    monkeypatch.setenv('ENVIRONMENT', 'development')  # Bypass the conference-day gate
+    with TestClient(app) as client:
+        client.portal.call(db_manager.create_tables)
+        yield client
+        client.portal.call(db_manager.engine.dispose)
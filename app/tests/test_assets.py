@@ -0,0 +1,171 @@
+"""
+Tests for core.assets.
+
+The unit tests index a temporary directory. The route test serves the real
+app/assets through main.app, which needs DATABASE_URL set to import, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_assets.py
+"""
+import gzip
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from core.assets import AssetIndex, IMMUTABLE, REVALIDATE, choose_variant
+from core.precompress import Variant, prune, report
+
+requires_database_url = pytest.mark.skipif(
+    not os.getenv('DATABASE_URL'), reason="main.app needs DATABASE_URL to import"
+)
+
+def request(**headers):
+    return SimpleNamespace(headers={k.replace('_', '-'): v for k, v in headers.items()})
+
+@pytest.fixture
+def index(tmp_path):
+    root = tmp_path / "assets"
+    (root / "css").mkdir(parents=True)
+    (root / "css" / "site.css").write_text("body { color: red }")
+    (root / "big.png").write_bytes(b"\x89PNG" + b"\0" * 4096)
+    return AssetIndex(root, max_memory_bytes=1024, precompressed_dir=None)
+
+def test_fingerprinted_urls_follow_the_content(index, tmp_path):
+    url = index.url("css/site.css")
+    assert url.startswith("/assets/css/site.") and url.endswith(".css")
+    assert index.url("/missing.png") == "/missing.png"
+
+    (tmp_path / "assets" / "css" / "site.css").write_text("body { color: blue }")
+    index.rebuild()
+    assert index.url("css/site.css") != url
+    # Pages rendered before the rebuild still get the file, just not as immutable
+    asset, immutable = index.lookup(url.removeprefix("/assets/"))
+    assert asset.path == "css/site.css" and not immutable
+
+def test_lazy_index_is_built_on_first_use(tmp_path):
+    root = tmp_path / "assets"
+    root.mkdir()
+    index = AssetIndex(root, precompressed_dir=None, lazy=True)
+    (root / "site.css").write_text("body { color: red }")  # Added after construction, still indexed
+
+    assert index.url("site.css").startswith("/assets/site.")
+    assert len(index) == 1 and index.lookup("site.css")[0].path == "site.css"
+
+def test_responses_carry_validators_and_answer_304(index):
+    path = index.url("css/site.css").removeprefix("/assets/")
+    response = index.response(request(), path)
+    assert response.status_code == 200
+    assert response.body == b"body { color: red }"
+    assert response.headers["cache-control"] == IMMUTABLE
+    etag = response.headers["etag"]
+
+    plain = index.response(request(), "css/site.css")
+    assert plain.headers["cache-control"] == REVALIDATE and plain.headers["etag"] == etag
+
+    assert index.response(request(if_none_match=etag), path).status_code == 304
+    assert index.response(request(if_none_match=f'"other", W/{etag}'), "css/site.css").status_code == 304
+    assert index.response(request(if_none_match='"other"'), path).status_code == 200
+    assert index.response(request(), "nope.css").status_code == 404
+
+def test_only_small_files_are_kept_in_memory(index):
+    assert index.get("css/site.css").body is not None
+    big = index.get("big.png")
+    assert big.body is None and big.media_type == "image/png"
+    stats = index.stats()
+    assert (stats["files"], stats["in_memory"], stats["memory_bytes"]) == (2, 1, len("body { color: red }"))
+
+CSS = "body { color: red }\n" * 50
+
+def test_text_assets_are_precompressed_once(tmp_path):
+    root, out = tmp_path / "assets", tmp_path / "precompressed"
+    root.mkdir()
+    (root / "site.css").write_text(CSS)
+    (root / "photo.jpg").write_bytes(os.urandom(2048))
+
+    index = AssetIndex(root, precompressed_dir=out)
+    css = index.get("site.css")
+    assert [v.encoding for v in css.variants][-1] == "gzip"
+    assert index.get("photo.jpg").variants == ()
+    written = sorted(f.name for f in out.iterdir())
+    assert f"{css.fingerprinted_path}.gz" in written
+
+    # A restart reuses the files instead of compressing again
+    gz = out / f"{css.fingerprinted_path}.gz"
+    gz.write_bytes(gzip.compress(CSS.encode(), mtime=0))
+    assert AssetIndex(root, precompressed_dir=out).get("site.css").variants[-1].body == gz.read_bytes()
+
+    [row] = report(index)
+    assert row["path"] == "site.css" and row["gzip_saved"] == len(CSS) - css.variants[-1].size > 0
+
+    (root / "site.css").write_text(CSS + "p {}")
+    index.rebuild()
+    assert prune(index, out) == len(written)
+
+def test_brotli_variants_are_served_first(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    root = tmp_path / "assets"
+    root.mkdir()
+    (root / "site.css").write_text(CSS)
+    index = AssetIndex(root, precompressed_dir=tmp_path / "precompressed")
+
+    assert [v.encoding for v in index.get("site.css").variants] == ["br", "gzip"]
+    response = index.response(request(accept_encoding="gzip, deflate, br"), "site.css")
+    assert response.headers["content-encoding"] == "br"
+    assert brotli.decompress(response.body) == CSS.encode()
+
+def test_precompress_build_fails_without_brotli(monkeypatch):
+    import core.precompress
+
+    monkeypatch.setattr(core.precompress, "brotli", None)
+    monkeypatch.setattr("sys.argv", ["precompress"])
+    with pytest.raises(SystemExit) as exit:
+        core.precompress.main()
+    assert exit.value.code == 1
+
+def test_variant_is_negotiated_from_accept_encoding(tmp_path):
+    root = tmp_path / "assets"
+    root.mkdir()
+    (root / "site.css").write_text(CSS)
+    index = AssetIndex(root, precompressed_dir=tmp_path / "precompressed")
+    etag = index.get("site.css").etag
+
+    plain = index.response(request(), "site.css")
+    assert plain.body == CSS.encode() and "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    zipped = index.response(request(accept_encoding="deflate, gzip;q=0.8"), "site.css")
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == CSS.encode()
+    assert zipped.headers["etag"] != etag
+    assert index.response(request(accept_encoding="gzip", if_none_match=zipped.headers["etag"]), "site.css").status_code == 304
+    # The identity ETag does not validate the gzip representation
+    assert index.response(request(accept_encoding="gzip", if_none_match=etag), "site.css").status_code == 200
+
+    variants = (Variant("br", 10, None, b""), Variant("gzip", 12, None, b""))
+    assert choose_variant("gzip, br", variants).encoding == "br"
+    assert choose_variant("gzip, br;q=0.5", variants).encoding == "gzip"
+    assert choose_variant("*", variants).encoding == "br"
+    assert choose_variant("gzip;q=0, br;q=0", variants) is None
+    assert choose_variant("identity", variants) is None
+
+@requires_database_url
+def test_app_serves_fingerprinted_assets():
+    from starlette.testclient import TestClient
+    from core.assets import asset_index
+    from main import app
+
+    client = TestClient(app)
+    url = asset_index.url("main.css")
+    assert url in client.get("/about").text
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == asset_index.get("main.css").body
+    assert client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}).status_code == 304
+
+    # Unfingerprinted image paths (CSS url(), database image_url) keep working
+    image = client.get("/banner_3.png")
+    assert image.status_code == 200 and image.headers["cache-control"] == REVALIDATE
+    assert image.headers["etag"] == asset_index.get("banner_3.png").etag
+    assert len(image.content) == asset_index.get("banner_3.png").size
@@ -0,0 +1,144 @@
+"""
+Tests for the bcrypt pool and failed-login throttle in utils.auth.
+
+The login route test runs against Postgres and only runs when DATABASE_URL
+points at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_auth.py
+"""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from utils.auth import LoginThrottle, PasswordHasher, PasswordHasherBusy, client_address, hash_password
+from tests.conftest import requires_postgres, run_async
+
+EMAIL = "throttle-test@example.com"
+PASSWORD = "correct horse"
+HASH = hash_password(PASSWORD)
+
+@run_async
+async def test_verify_runs_off_the_event_loop():
+    hasher = PasswordHasher(workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        results = await asyncio.gather(hasher.verify(PASSWORD, HASH), hasher.verify("wrong", HASH))
+    finally:
+        task.cancel()
+        hasher.shutdown()
+    assert results == [True, False]
+    # bcrypt takes well over 100 ms; the loop kept ticking meanwhile
+    assert ticks >= 5
+    stats = hasher.stats()
+    assert stats["completed"] == 2 and stats["pending"] == 0 and stats["avg_hash_ms"] > 0
+
+@run_async
+async def test_verify_refuses_beyond_the_queue_bound():
+    hasher = PasswordHasher(workers=1, max_queued=1)
+    try:
+        results = await asyncio.gather(
+            *(hasher.verify(PASSWORD, HASH) for _ in range(3)), return_exceptions=True
+        )
+    finally:
+        hasher.shutdown()
+    assert results[:2] == [True, True]
+    assert isinstance(results[2], PasswordHasherBusy)
+    assert hasher.stats()["rejected"] == 1
+    # The second verify waited for the only worker
+    assert hasher.stats()["max_queue_ms"] > 0
+
+def test_throttle_blocks_clients_and_delays_usernames():
+    now = [0.0]
+    throttle = LoginThrottle(max_failures=3, window=60, max_user_delay=4, clock=lambda: now[0])
+
+    for _ in range(3):
+        assert throttle.retry_after("10.0.0.1") == 0
+        throttle.record_failure("10.0.0.1", "Mod@example.com")
+        now[0] += 10
+    assert throttle.retry_after("10.0.0.1") == 30
+    assert throttle.retry_after("10.0.0.2") == 0
+
+    # The username is never blocked, only slowed down, doubling up to the cap
+    assert throttle.delay(" mod@example.com") == 1
+    for expected in (2, 4, 4):
+        throttle.record_failure("10.0.0.9", "mod@example.com")
+        assert throttle.delay("mod@example.com") == expected
+    assert throttle.delay("someone@example.com") == 0
+
+    now[0] += 60
+    assert throttle.retry_after("10.0.0.1") == 0 and throttle.delay("mod@example.com") == 0
+    throttle.record_failure("10.0.0.1", "mod@example.com")
+    throttle.record_success("10.0.0.1", "mod@example.com")
+    stats = throttle.stats()
+    assert (stats["blocked"], stats["delayed"], stats["evicted"]) == (1, 4, 0)
+
+def test_throttle_evicts_the_stalest_key_at_its_cap():
+    throttle = LoginThrottle(max_failures=1, max_keys=4)
+    throttle.record_failure("10.0.0.1", "a")
+    throttle.record_failure("10.0.0.2", "b")
+    # Failing again moves a key to the back of the line
+    throttle.record_failure("10.0.0.1", "a")
+    throttle.record_failure("10.0.0.3", "c")
+    assert throttle.stats()["tracked_keys"] == 4 and throttle.stats()["evicted"] == 2
+    assert throttle.retry_after("10.0.0.2") == 0
+    assert throttle.retry_after("10.0.0.1") > 0 and throttle.retry_after("10.0.0.3") > 0
+
+def test_client_address_skips_spoofed_forwarded_entries():
+    def request(forwarded=None):
+        headers = {"x-forwarded-for": forwarded} if forwarded else {}
+        return SimpleNamespace(headers=headers, client=SimpleNamespace(host="169.254.1.1"))
+
+    assert client_address(request("6.6.6.6, 203.0.113.7"), trusted_hops=0) == "169.254.1.1"
+    assert client_address(request("6.6.6.6, 203.0.113.7"), trusted_hops=1) == "203.0.113.7"
+    assert client_address(request("6.6.6.6, 203.0.113.7, 35.1.1.1"), trusted_hops=2) == "203.0.113.7"
+    assert client_address(request("203.0.113.7"), trusted_hops=2) == "203.0.113.7"
+    assert client_address(request(), trusted_hops=1) == "169.254.1.1"
+
+async def add_user():
+    from db.connection import db_manager
+    from db.models import User
+
+    await delete_user()
+    async with db_manager.AsyncSessionLocal() as db:
+        db.add(User(email=EMAIL, password_hash=HASH, role="admin", is_active=True))
+        await db.commit()
+
+async def delete_user():
+    from db.connection import db_manager
+    async with db_manager.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM users WHERE email = :email"), {"email": EMAIL})
+
+@requires_postgres
+def test_login_is_throttled_before_checking_the_password(app_client, monkeypatch):
+    import routes.admin
+
+    monkeypatch.setattr(routes.admin, "login_throttle", LoginThrottle(max_failures=3, window=60))
+    hasher = routes.admin.password_hasher
+
+    app_client.portal.call(add_user)
+    try:
+        def login(password: str):
+            return app_client.post("/admin/test_login", data={"username": EMAIL, "password": password})
+
+        assert login(PASSWORD).status_code == 200
+        assert [login("wrong").status_code for _ in range(3)] == [401, 401, 401]
+
+        completed = hasher.stats()["completed"]
+        response = login(PASSWORD)
+        assert response.status_code == 429
+        assert "Too many failed attempts" in response.text
+        assert hasher.stats()["completed"] == completed  # Refused without running bcrypt
+
+        page = app_client.post("/admin/login", data={"username": EMAIL, "password": PASSWORD})
+        assert "Too many failed attempts" in page.text and "HX-Refresh" not in page.headers
+    finally:
+        app_client.portal.call(delete_user)
@@ -0,0 +1,70 @@
+"""
+Tests for utils.avatars and the /avatars route.
+
+The route test runs against Postgres and only runs when DATABASE_URL points
+at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_avatars.py
+"""
+from sqlalchemy import text
+
+from core.assets import IMMUTABLE, REVALIDATE
+from utils.avatars import avatar_url, initials, render_avatar, speaker_avatar
+from utils.catalog_cache import catalog_cache
+from tests.conftest import requires_postgres
+
+SPEAKER_ID = 9005
+
+def test_avatar_is_rendered_once_per_initials_and_color():
+    assert [initials(n) for n in ("Jane Doe", "jane van doe", "Prince", "  ")] == ["JD", "JD", "P", "?"]
+
+    render_avatar.cache_clear()
+    avatar = speaker_avatar(1, "Jane Doe")
+    assert speaker_avatar(1, "Jane Q Doe") is avatar  # Same initials and color: memoized
+    assert render_avatar.cache_info().hits == 1
+    assert b"#009688" in avatar.svg and b">JD</text>" in avatar.svg
+
+    # A rename or another color changes the URL
+    assert avatar_url(1, "Jane Doe") == f"/avatars/1?v={avatar.fingerprint}"
+    assert avatar_url(1, "John Roe") != avatar_url(1, "Jane Doe") != avatar_url(2, "Jane Doe")
+
+def test_initials_are_escaped():
+    assert b">&lt;</text>" in speaker_avatar(1, "<script>").svg
+
+async def add_speaker():
+    from db.connection import db_manager
+    from db.models import Speaker
+
+    await delete_speaker()
+    async with db_manager.AsyncSessionLocal() as db:
+        db.add(Speaker(id=SPEAKER_ID, name="Avatar Test", bio="Bio", image_url=None))
+        await db.commit()
+    catalog_cache.invalidate()
+
+async def delete_speaker():
+    from db.connection import db_manager
+    async with db_manager.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM speakers WHERE id = :id"), {"id": SPEAKER_ID})
+    catalog_cache.invalidate()
+
+@requires_postgres
+def test_speaker_pages_link_local_avatars(app_client):
+    app_client.portal.call(add_speaker)
+    try:
+        url = avatar_url(SPEAKER_ID, "Avatar Test")
+        page = app_client.get(f"/speakers/{SPEAKER_ID}").text
+        assert f'src="{url}"' in page.replace("&amp;", "&")
+        assert "ui-avatars.com" not in app_client.get("/speakers").text
+
+        response = app_client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/svg+xml"
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert b">AT</text>" in response.content
+
+        assert app_client.get(url, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+        # Without the current fingerprint the avatar is revalidated instead of kept forever
+        assert app_client.get(f"/avatars/{SPEAKER_ID}").headers["cache-control"] == REVALIDATE
+        assert app_client.get("/avatars/999999").status_code == 404
+    finally:
+        app_client.portal.call(delete_speaker)
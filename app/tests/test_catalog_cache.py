@@ -0,0 +1,100 @@
+"""
+Tests for utils.catalog_cache.
+
+The unit tests use in-memory stand-ins for the ORM rows. The route test runs
+the catalog pages against Postgres and only runs when DATABASE_URL points at
+a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_catalog_cache.py
+"""
+import asyncio
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from utils.catalog_cache import Catalog, CatalogCache, catalog_cache
+from tests.conftest import requires_postgres, run_async
+
+NOW = datetime(2025, 10, 18, 15, 0, tzinfo=timezone.utc)
+
+def sample_catalog(title: str = "Opening") -> Catalog:
+    speaker = SimpleNamespace(id=1, name="Jane Doe", image_url=None, bio="Bio")
+    later = SimpleNamespace(
+        id=2, title="Panel", description=None, start_time=NOW + timedelta(hours=1), end_time=NOW + timedelta(hours=2),
+        location="Hall", category="PANEL DISCUSSION", is_qa_active=None, speakers=[speaker]
+    )
+    first = SimpleNamespace(
+        id=1, title=title, description="Welcome", start_time=NOW, end_time=NOW + timedelta(hours=1),
+        location="Hall", category="MAIN", is_qa_active=True, speakers=[]
+    )
+    prayer = SimpleNamespace(id=1, name="DHUHR", time="13:30", iqama="13:45")
+    return Catalog.build(events=[later, first], speakers=[speaker], sponsors=[], prayer_times=[prayer])
+
+def test_catalog_is_precomputed_and_sorted():
+    catalog = sample_catalog()
+    assert [e.id for e in catalog.events] == [1, 2]
+    # Placeholder image resolved once at load time, shared by the event's speaker
+    speaker = catalog.speakers_by_id[1]
+    assert speaker.image_url.startswith("/avatars/1?v=")
+    assert catalog.events_by_id[2].speakers == (speaker,)
+    assert catalog.events_by_id[2].is_qa_active is False
+    with pytest.raises(TypeError):
+        catalog.events_by_id[3] = None  # Read-only snapshot
+
+@run_async
+async def test_cache_loads_once_and_reloads_after_invalidate():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return sample_catalog(f"Opening {len(loads)}")
+
+    cache = CatalogCache(load, max_age=0)
+    # Concurrent first requests share one load
+    events = await asyncio.gather(*(cache.events() for _ in range(10)))
+    assert len(loads) == 1 and all(e[0].title == "Opening 1" for e in events)
+
+    cache.invalidate()
+    assert (await cache.event(1)).title == "Opening 2"
+    assert await cache.speaker(99) is None
+    assert cache.stats() == {"hits": 10, "misses": 2, "loaded": True}
+
+@run_async
+async def test_write_during_load_is_not_cached():
+    cache = CatalogCache(None, max_age=0)
+    loads = []
+
+    async def load():
+        loads.append(1)
+        if len(loads) == 1:
+            cache.invalidate()  # A write commits while the catalog is being read
+        return sample_catalog()
+
+    cache._load = load
+    await cache.get()
+    await cache.get()
+    assert len(loads) == 2
+
+@requires_postgres
+def test_catalog_pages_skip_the_database(app_client):
+    from db.connection import db_manager
+
+    paths = ["/agenda", "/speakers", "/prayer-times", "/qa"]
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    catalog_cache.invalidate()
+    for path in paths:
+        assert app_client.get(path).status_code == 200
+    event.listen(db_manager.engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for path in paths:
+            assert app_client.get(path).status_code == 200
+    finally:
+        event.remove(db_manager.engine.sync_engine, "before_cursor_execute", record)
+    assert statements == []
@@ -0,0 +1,80 @@
+"""
+Tests for core.images and components.image (need Pillow to build variants).
+"""
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from core.assets import AssetIndex
+from core.images import ResponsiveImages, build
+
+from tests.test_assets import request
+
+def write_png(path, width: int, height: int):
+    Image.new("RGBA", (width, height), (0, 78, 163, 255)).save(path)
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / "assets"
+    root.mkdir()
+    write_png(root / "speaker_1.png", 200, 200)
+    write_png(root / "photo.png", 1000, 400)
+    write_png(root / "banner_1.png", 1000, 400)  # Drawn by main.css, so never built
+    (root / "logo.svg").write_text("<svg/>")
+    return AssetIndex(root, precompressed_dir=None)
+
+def test_build_writes_webp_variants_without_upscaling(assets, tmp_path):
+    out = tmp_path / "variants"
+    rows = {row["path"]: row for row in build(assets, out)}
+    assert set(rows) == {"speaker_1.png", "photo.png"}
+    assert list(rows["speaker_1.png"]["variants"]) == [80, 160, 200]
+    assert list(rows["photo.png"]["variants"]) == [80, 160, 320, 640, 1000]
+
+    speaker = assets.get("speaker_1.png")
+    with Image.open(out / f"speaker_1.{speaker.fingerprint}.80w.webp") as image:
+        assert (image.format, image.size) == ("WEBP", (80, 80))
+
+    # Unchanged images are not re-encoded; variants of replaced ones are deleted
+    cached = out / f"speaker_1.{speaker.fingerprint}.160w.webp"
+    mtime = cached.stat().st_mtime_ns
+    write_png(assets.root / "photo.png", 300, 100)
+    assets.rebuild()
+    build(assets, out)
+    assert cached.stat().st_mtime_ns == mtime
+    assert sorted(f.name.split(".")[-2] for f in out.glob("photo.*")) == ["160w", "300w", "80w"]
+
+def test_srcset_lists_current_variants_only(assets, tmp_path):
+    out = tmp_path / "variants"
+    build(assets, out)
+    images = ResponsiveImages(assets, out)
+
+    srcset = images.srcset(assets.url("speaker_1.png"))
+    assert [entry.split(" ")[1] for entry in srcset.split(", ")] == ["80w", "160w", "200w"]
+    assert all(entry.startswith("/images/speaker_1.") for entry in srcset.split(", "))
+    # Plain /<name> URLs (as stored in the database) resolve too
+    assert images.srcset("/speaker_1.png") == srcset
+    assert images.srcset("https://ui-avatars.com/api/?name=JD") is None
+    assert images.srcset(assets.url("logo.svg")) is None
+
+    # A changed source has no variants until the next build
+    write_png(assets.root / "speaker_1.png", 200, 201)
+    assets.rebuild()
+    images.rebuild()
+    assert images.srcset("/speaker_1.png") is None
+
+    smallest = srcset.split(", ")[0].split(" ")[0]
+    response = images.index.response(request(), smallest.removeprefix("/images/"))
+    assert response.status_code == 200 and response.media_type == "image/webp"
+
+def test_responsive_img_only_adds_srcset_when_there_are_variants(monkeypatch):
+    import components.image
+    from fasthtml.common import to_xml
+
+    class Variants:
+        def srcset(self, src):
+            return "/images/a.80w.webp 80w" if src == "/a.png" else None
+
+    monkeypatch.setattr(components.image, "responsive_images", Variants())
+    html = to_xml(components.image.ResponsiveImg("/a.png", "40px", alt="A"))
+    assert 'srcset="/images/a.80w.webp 80w"' in html and 'sizes="40px"' in html
+    assert "srcset" not in to_xml(components.image.ResponsiveImg("https://x/a.png", "40px", alt="A"))
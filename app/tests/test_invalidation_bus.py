@@ -0,0 +1,147 @@
+"""
+Tests for utils.invalidation_bus.
+
+The unit tests need no database. The cross-instance test runs two buses,
+each with its own caches, against Postgres LISTEN/NOTIFY and only runs when
+DATABASE_URL points at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_invalidation_bus.py
+"""
+import asyncio
+import json
+
+from sqlalchemy import text
+
+from utils.catalog_cache import CatalogCache
+from utils.invalidation_bus import InvalidationBus, CATALOG, QUESTIONS, LIKE
+from utils.question_cache import QuestionListCache
+
+from tests.test_catalog_cache import sample_catalog
+from tests.test_question_cache import view
+from tests.conftest import database, requires_postgres, run_async
+
+class Instance:
+    """One app instance's caches plus its bus, with load counters"""
+
+    def __init__(self, backend: str = "memory", **bus_options):
+        self.catalog_loads = 0
+        self.question_loads = 0
+        self.catalog = CatalogCache(self._load_catalog, max_age=0)
+        self.questions = QuestionListCache()
+        self.bus = InvalidationBus(backend, catalog=self.catalog, questions=self.questions, **bus_options)
+
+    async def _load_catalog(self):
+        self.catalog_loads += 1
+        return sample_catalog()
+
+    async def _load_questions(self):
+        self.question_loads += 1
+        return [view(0, likes=1), view(1, likes=3)]
+
+    async def popular(self):
+        return [(q.id, q.likes_count) for q in (await self.questions.get_page(1, "popular", self._load_questions)).questions]
+
+    async def warm(self):
+        await self.catalog.get()
+        await self.popular()
+
+@run_async
+async def test_apply_evicts_catalog_and_questions_and_patches_likes():
+    instance = Instance()
+    await instance.warm()
+
+    instance.bus.apply({"kind": LIKE, "event_id": 1, "question_id": "q0", "session_id": "s", "liked": True, "likes_count": 4})
+    assert await instance.popular() == [("q0", 4), ("q1", 3)]
+    assert instance.question_loads == 1
+
+    instance.bus.apply({"kind": QUESTIONS, "event_id": 1})
+    instance.bus.apply({"kind": CATALOG})
+    await instance.warm()
+    assert (instance.catalog_loads, instance.question_loads) == (2, 2)
+
+    instance.bus.refresh_all()
+    await instance.warm()
+    assert (instance.catalog_loads, instance.question_loads) == (3, 3)
+
+@run_async
+async def test_memory_bus_publishes_nothing():
+    bus = InvalidationBus("memory")
+    await bus.start()
+    bus.publish(CATALOG)
+    await bus.stop()
+    assert bus.stats()["sent"] == 0
+
+def test_pack_drops_repeats_and_splits_at_the_payload_limit():
+    bus = InvalidationBus("memory")
+    messages = [{"kind": CATALOG}] * 3 + [
+        {"kind": LIKE, "event_id": 1, "question_id": f"q{n}", "session_id": "s" * 40, "liked": True, "likes_count": n}
+        for n in range(200)
+    ]
+    payloads = bus.pack(messages, max_bytes=7900)
+    assert len(payloads) > 1
+    assert all(len(p.encode("utf-8")) <= 7900 for p in payloads)
+    unpacked = [m for p in payloads for m in json.loads(p)["messages"]]
+    assert unpacked[0] == {"kind": CATALOG}
+    assert [m["question_id"] for m in unpacked[1:]] == [f"q{n}" for n in range(200)]
+    assert {json.loads(p)["origin"] for p in payloads} == {bus.origin}
+
+@requires_postgres
+@run_async
+async def test_writes_on_one_instance_evict_the_others(monkeypatch):
+    from db.connection import Listener
+    monkeypatch.setattr(Listener, "RECONNECT_DELAY", 0.05)
+
+    options = {"channel": "cache_invalidation_test", "refresh_interval": 0}
+    a, b = Instance("postgres", **options), Instance("postgres", **options)
+    async with database() as db_manager:
+        await a.bus.start()
+        await b.bus.start()
+
+        async def settle():
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if a.bus._outbox.empty() and b.bus.received >= expected:
+                    return
+
+        try:
+            await a.warm()
+            await b.warm()
+
+            # A has already applied its own writes; B evicts, or patches the like
+            a.bus.publish(LIKE, event_id=1, question_id="q0", session_id="s", liked=True, likes_count=7)
+            a.bus.publish(CATALOG)
+            a.bus.publish(CATALOG)
+            expected = 2
+            await settle()
+            assert b.bus.received == 2
+            assert await b.popular() == [("q0", 7), ("q1", 3)]
+            await b.warm()
+            assert (b.catalog_loads, b.question_loads) == (2, 1)
+
+            a.bus.publish(QUESTIONS, event_id=1)
+            expected = 3
+            await settle()
+            await a.warm()
+            await b.warm()
+            assert (a.catalog_loads, a.question_loads) == (1, 1)
+            assert (b.catalog_loads, b.question_loads) == (2, 2)
+            assert a.bus.received == 0
+
+            # Notifications can be missed while B's LISTEN connection is down,
+            # so B drops everything and listens again
+            async with db_manager.engine.connect() as conn:
+                await conn.execute(text(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query = 'LISTEN \"cache_invalidation_test\"'"
+                ))
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if b.bus.refreshes >= 2:
+                    break
+            assert b.bus.refreshes == 2  # On losing the connection and again once listening
+            a.bus.publish(CATALOG)
+            expected = 4
+            await settle()
+            assert b.bus.received == 4
+        finally:
+            await a.bus.stop()
+            await b.bus.stop()
@@ -0,0 +1,144 @@
+"""
+Query-count regression tests for the guest Q&A pages.
+
+Runs the real routes against Postgres and counts the SQL statements each
+request executes, so an N+1 lookup shows up as a count that grows with the
+number of questions. Needs DATABASE_URL pointing at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_qa_queries.py
+"""
+import html
+import re
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from utils.catalog_cache import catalog_cache
+from utils.question_cache import question_cache
+from utils.question_ranking import PAGE_SIZE, decode_cursor
+from tests.conftest import requires_postgres
+
+EVENT_ID = 9001
+SESSION_ID = "query-count-session"
+
+async def seed_questions(count: int):
+    """Add `count` visible questions to the test event, each liked by the test session"""
+    from db.connection import db_manager
+    from db.models import Event, Question, QuestionLike
+
+    async with db_manager.AsyncSessionLocal() as db:
+        if await db.get(Event, EVENT_ID) is None:
+            now = datetime.now(timezone.utc)
+            db.add(Event(id=EVENT_ID, title="Query count", start_time=now, end_time=now + timedelta(hours=1)))
+            await db.flush()
+        for n in range(count):
+            question = Question(event_id=EVENT_ID, nickname="n", question_text=f"q{n}?", is_visible=True)
+            db.add(question)
+            await db.flush()
+            db.add(QuestionLike(question_id=question.id, session_id=SESSION_ID))
+        await db.commit()
+    # Written behind the app's back, so drop the cached lists, likes and catalog
+    question_cache.invalidate(EVENT_ID)
+    catalog_cache.invalidate()
+
+async def drop_event():
+    from db.connection import db_manager
+    async with db_manager.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+    catalog_cache.invalidate()
+
+@pytest.fixture
+def client(app_client):
+    app_client.cookies.set("qa_session_id", SESSION_ID)
+    app_client.portal.call(drop_event)
+    yield app_client
+    app_client.portal.call(drop_event)
+
+def count_queries(client, path: str) -> int:
+    from db.connection import db_manager
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_manager.engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(db_manager.engine.sync_engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return len(statements)
+
+@requires_postgres
+@pytest.mark.parametrize("path", [f"/qa/event/{EVENT_ID}", f"/qa/event/{EVENT_ID}/questions?sort=popular"])
+def test_guest_question_list_query_count_is_constant(client, path):
+    client.portal.call(seed_questions, 2)
+    few = count_queries(client, path)
+
+    client.portal.call(seed_questions, 50)
+    many = count_queries(client, path)
+
+    assert many == few
+    assert client.get(path).text.count("text-red") == PAGE_SIZE  # Every liked heart on the first page highlighted
+
+@requires_postgres
+def test_cached_question_list_skips_the_database(client):
+    client.portal.call(seed_questions, 3)
+    path = f"/qa/event/{EVENT_ID}/questions?sort=recent"
+
+    assert count_queries(client, path) > 0
+    hits = question_cache.hits
+    assert count_queries(client, path) == 0
+    assert question_cache.hits == hits + 2  # List and like set
+
+    # A like moves the question in the ranking index and patches the like set
+    question_id = client.get(path).text.split('id="like-btn-')[1].split('"')[0]
+    client.post(f"/qa/question/{question_id}/like", headers={"HX-Request": "true"})
+    assert count_queries(client, path.replace("recent", "popular")) == 0
+    assert client.get(path).text.count("text-red") == 2  # Un-liked one of the 3 seeded likes
+
+def card_ids(page: str) -> list:
+    return re.findall(r'data-question-id="([^"]+)"', page)
+
+def next_page(page: str):
+    match = re.search(r'hx-get="([^"]+)"[^>]*id="questions-more"', page)
+    return html.unescape(match.group(1)) if match else None
+
+@requires_postgres
+def test_paged_list_stays_consistent_while_questions_arrive(client):
+    from crud.question import get_questions_by_event, get_questions_page
+    from db.connection import db_manager
+
+    client.portal.call(seed_questions, PAGE_SIZE * 2 + 5)
+
+    async def expected(sort_by: str, visible_only: bool = True) -> list:
+        async with db_manager.AsyncSessionLocal() as db:
+            return [str(q.id) for q in await get_questions_by_event(db, EVENT_ID, visible_only, sort_by)]
+
+    for sort in ("recent", "popular"):
+        order = client.portal.call(expected, sort)
+        page = client.get(f"/qa/event/{EVENT_ID}/questions?sort={sort}").text
+        seen = card_ids(page)
+        assert len(seen) == PAGE_SIZE
+        # New questions land above the cursor and must not shift later pages
+        client.portal.call(seed_questions, 3)
+        while next_page(page):
+            page = client.get(next_page(page), headers={"HX-Request": "true"}).text
+            assert "<script" not in page  # Later pages are bare fragments
+            seen += card_ids(page)
+        assert seen == order
+
+    # The moderator list pages the same way straight from SQL
+    async def walk_moderator_pages(sort_by: str) -> list:
+        seen, after = [], None
+        async with db_manager.AsyncSessionLocal() as db:
+            while True:
+                page = await get_questions_page(db, EVENT_ID, False, sort_by, after=after, limit=7)
+                seen += [str(q.id) for q in page.questions]
+                if page.cursor is None:
+                    return seen
+                after = decode_cursor(sort_by, page.cursor)
+
+    for sort in ("recent", "popular", "trending"):
+        assert client.portal.call(walk_moderator_pages, sort) == client.portal.call(expected, sort, False)
@@ -0,0 +1,120 @@
+"""
+Query plan regression tests for the Q&A list queries.
+
+Runs EXPLAIN on the exact SQL built by crud.question against a migrated
+Postgres and checks each list page is served by its composite index in
+order (no Sort node), so a change to a query or to the indexes declared in
+db.models that breaks the match fails here. Also checks the versioned
+migrations create the indexes db.models declares. Needs DATABASE_URL
+pointing at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_query_plans.py
+"""
+import random
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import text
+
+from tests.conftest import database, requires_postgres, run_async
+
+EVENT_ID = 9003
+
+POPULAR_INDEXES = {"ix_questions_event_popular", "ix_questions_event_popular_all"}
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+async def explain(conn, query) -> list:
+    compiled = query.compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), params)
+    return list(plan_nodes(result.scalar()[0]["Plan"]))
+
+async def seed(conn, count: int):
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+    await conn.execute(
+        text("INSERT INTO events (id, title, start_time, end_time) VALUES (:id, 'Plans', :now, :now)"),
+        {"id": EVENT_ID, "now": now}
+    )
+    await conn.execute(
+        text("""
+            INSERT INTO questions (id, event_id, nickname, question_text, is_visible, is_answered, likes_count, created_at)
+            VALUES (:id, :event_id, 'n', 'q?', :is_visible, false, :likes_count, :created_at)
+        """),
+        [
+            {
+                "id": uuid.uuid4(), "event_id": EVENT_ID, "is_visible": rng.random() < 0.7,
+                "likes_count": int(rng.paretovariate(1.5)) - 1, "created_at": now - timedelta(seconds=n)
+            }
+            for n in range(count)
+        ]
+    )
+    await conn.execute(text("ANALYZE questions"))
+
+@requires_postgres
+@run_async
+async def test_list_pages_are_index_range_scans():
+    from crud.question import questions_page_query
+    from db.migrations import migrate
+
+    async with database() as db_manager:
+        await migrate()
+        cursor_time = datetime.now(timezone.utc) - timedelta(minutes=30)
+        cases = [
+            # (visible_only, sort, cursor, expected indexes); with few hidden questions
+            # the planner may read the guest popular list off either popular index
+            (True, "popular", None, POPULAR_INDEXES),
+            (True, "popular", (2, cursor_time, str(uuid.uuid4())), POPULAR_INDEXES),
+            (True, "recent", None, {"ix_questions_event_recent"}),
+            (True, "recent", (cursor_time, str(uuid.uuid4())), {"ix_questions_event_recent"}),
+            (False, "recent", None, {"ix_questions_event_created"}),
+            (False, "recent", (cursor_time, str(uuid.uuid4())), {"ix_questions_event_created"}),
+            # The moderator console's default view
+            (False, "popular", None, {"ix_questions_event_popular_all"}),
+            (False, "popular", (2, cursor_time, str(uuid.uuid4())), {"ix_questions_event_popular_all"}),
+        ]
+        async with db_manager.engine.begin() as conn:
+            await seed(conn, 5000)
+            for visible_only, sort, cursor, indexes in cases:
+                nodes = await explain(conn, questions_page_query(EVENT_ID, visible_only, sort, cursor, 20))
+                label = f"{sort} visible_only={visible_only} cursor={cursor is not None}"
+                used = [n["Index Name"] for n in nodes if "Index Name" in n]
+                assert len(used) == 1 and used[0] in indexes, (label, used)
+                index = used[0]
+                assert not any("Sort" in n["Node Type"] for n in nodes), label
+                if cursor:
+                    # The cursor bound is part of the index seek, not a filter over the whole event
+                    scan = next(n for n in nodes if n.get("Index Name") == index)
+                    assert ("likes_count" if sort == "popular" else "created_at") in scan["Index Cond"], label
+            await conn.rollback()
+
+async def index_definitions(conn) -> dict:
+    result = await conn.execute(text(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename IN ('questions', 'question_likes') AND indexname LIKE 'ix_%'"
+    ))
+    return dict(result.all())
+
+@requires_postgres
+@run_async
+async def test_migrations_create_the_indexes_the_models_declare():
+    from db.migrations import MIGRATIONS
+
+    qa_indexes, moderator_popular_index = (m for m in MIGRATIONS if m.version in (3, 4))
+    async with database() as db_manager:
+        async with db_manager.engine.begin() as conn:
+            declared = await index_definitions(conn)  # Created from db.models
+            for name in declared:
+                await conn.execute(text(f"DROP INDEX {name}"))
+
+            # Each migration creates its own fixed set of indexes
+            await qa_indexes.apply(conn)
+            assert set(await index_definitions(conn)) == set(declared) - {"ix_questions_event_popular_all"}
+            await moderator_popular_index.apply(conn)
+            assert await index_definitions(conn) == declared
+            await conn.rollback()
@@ -0,0 +1,178 @@
+"""
+Unit tests for utils.question_ranking and utils.question_cache (no database needed).
+"""
+import random
+from dataclasses import replace
+from datetime import datetime, timezone, timedelta
+
+from utils.question_cache import QuestionListCache, QuestionView
+from utils.question_ranking import EventRanking, decode_cursor
+from tests.conftest import run_async
+
+NOW = datetime(2025, 10, 18, 15, 0, tzinfo=timezone.utc)
+
+def view(n: int, likes: int = 0, visible: bool = True, event_id: int = 1) -> QuestionView:
+    return QuestionView(
+        id=f"q{n}", event_id=event_id, nickname="n", question_text=f"q{n}?",
+        is_visible=visible, is_answered=False, likes_count=likes,
+        created_at=NOW - timedelta(minutes=n % 7)  # Plenty of ties on created_at
+    )
+
+def sql_order(questions, sort: str):
+    """Same ordering as get_questions_by_event, plus the id tie-break"""
+    visible = [q for q in questions.values() if q.is_visible]
+    if sort == "popular":
+        key = lambda q: (-q.likes_count, -q.created_at.timestamp(), q.id)
+    else:
+        key = lambda q: (-q.created_at.timestamp(), q.id)
+    return [q.id for q in sorted(visible, key=key)]
+
+def test_ranking_matches_full_sort_after_random_updates():
+    rng = random.Random(7)
+    reference = {f"q{n}": view(n, likes=rng.randrange(5)) for n in range(40)}
+    ranking = EventRanking(reference.values())
+
+    for _ in range(500):
+        question_id = f"q{rng.randrange(45)}"
+        op = rng.random()
+        if op < 0.6 and question_id in reference:
+            likes = max(0, reference[question_id].likes_count + rng.choice((-1, 1)))
+            reference[question_id] = replace(reference[question_id], likes_count=likes)
+            ranking.set_likes(question_id, likes)
+        elif op < 0.8:
+            question = reference.get(question_id) or view(int(question_id[1:]))
+            reference[question_id] = replace(question, is_visible=not question.is_visible)
+            ranking.upsert(reference[question_id])
+        else:
+            reference.pop(question_id, None)
+            ranking.remove(question_id)
+
+    for sort in ("popular", "recent"):
+        assert [q.id for q in ranking.ordered(sort)] == sql_order(reference, sort)
+    assert [q.id for q in ranking.ordered("popular", limit=5)] == sql_order(reference, "popular")[:5]
+
+@run_async
+async def test_cache_serves_writes_from_the_ranking_without_reloading():
+    cache = QuestionListCache()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return [view(0, likes=1), view(1, likes=3), view(2, visible=False)]
+
+    assert [q.id for q in (await cache.get_page(1, "popular", load)).questions] == ["q1", "q0"]
+
+    cache.record_like(1, "q0", "guest", True, likes_count=5)
+    assert [q.id for q in (await cache.get_page(1, "popular", load)).questions] == ["q0", "q1"]
+
+    cache.question_changed(view(2))  # Made visible
+    cache.question_removed(1, "q1")
+    assert [q.id for q in (await cache.get_page(1, "recent", load)).questions] == ["q0", "q2"]
+    assert [q.id for q in (await cache.get_page(1, "popular", load, limit=1)).questions] == ["q0"]
+    assert len(loads) == 1
+
+    # Writes elsewhere (or a resync) rebuild the index from the database
+    cache.invalidate(1)
+    await cache.get_page(1, "popular", load)
+    assert len(loads) == 2
+
+    # A write landing mid-load may be missing from what was loaded, so it isn't kept
+    async def racing_load():
+        cache.record_like(2, "q0", "guest", True, likes_count=1)
+        return await load()
+
+    await cache.get_page(2, "popular", racing_load)
+    await cache.get_page(2, "popular", load)
+    assert len(loads) == 4
+
+@run_async
+async def test_like_sets_load_per_session_and_follow_toggles():
+    cache = QuestionListCache()
+    loaded = []
+
+    def load_for(session_id, liked):
+        async def load():
+            loaded.append(session_id)
+            return liked
+        return load
+
+    assert await cache.get_session_likes(1, "a", load_for("a", ["q1"])) == {"q1"}
+    cache.record_like(1, "q2", "a", True, likes_count=1)
+    cache.record_like(1, "q1", "b", True, likes_count=2)  # b isn't loaded; nothing to patch
+    assert await cache.get_session_likes(1, "a", load_for("a", [])) == {"q1", "q2"}
+    assert await cache.get_session_likes(1, "b", load_for("b", ["q1"])) == {"q1"}
+    assert loaded == ["a", "b"]
+
+@run_async
+async def test_cache_evicts_least_recently_used_event():
+    cache = QuestionListCache(max_events=2)
+
+    async def load():
+        return [view(0)]
+
+    for event_id in (1, 2, 1, 3):
+        await cache.get_page(event_id, "recent", load)
+    assert cache.stats()["events"] == 2
+    misses = cache.misses
+    await cache.get_page(2, "recent", load)
+    assert cache.misses == misses + 1  # Event 2 was evicted, event 1 was not
+
+def test_card_times_are_shown_in_conference_time():
+    from fasthtml.common import to_xml
+    from components.qa import QuestionCard
+
+    morning = replace(view(0), created_at=datetime(2025, 10, 18, 14, 5, tzinfo=timezone.utc))
+    assert ">9:05 AM</time>" in to_xml(QuestionCard(morning))
+    assert ">10:00 AM</time>" in to_xml(QuestionCard(view(0)))
+
+@run_async
+async def test_moderator_cards_take_like_updates():
+    from fasthtml.common import to_xml
+    from components.qa import QuestionCard
+    from utils.sse_manager import SSEManager, InProcessBackend, MODERATORS
+
+    manager = SSEManager(InProcessBackend())
+    await manager.start()
+    moderators = await manager.subscribe(1, audience=MODERATORS)
+    await manager.send_question_update(1, {"id": "q0", "likes_count": 5, "is_visible": True}, "like_updated")
+    message = await moderators.get()
+    await manager.stop()
+
+    # Like updates carry no card; qa_live.js patches #likes-<id> in place
+    assert message.data == {"action": "like_updated", "question": {"id": "q0", "likes_count": 5, "is_visible": True}}
+    assert 'id="likes-q0" class="ml-2">4</span>' in to_xml(QuestionCard(view(0, likes=4), show_admin_controls=True))
+
+def test_trending_lets_fresh_questions_overtake_old_popular_ones():
+    now = NOW.timestamp()
+    old_popular = replace(view(0, likes=20), created_at=NOW - timedelta(hours=10))
+    fresh = replace(view(1, likes=3), created_at=NOW - timedelta(minutes=5))
+    stale = replace(view(2, likes=1), created_at=NOW - timedelta(hours=10))
+    ranking = EventRanking([old_popular, fresh, stale])
+
+    ranking.refresh_trending(now)
+    assert [q.id for q in ranking.ordered("popular")] == ["q0", "q1", "q2"]
+    assert [q.id for q in ranking.ordered("trending")] == ["q1", "q0", "q2"]
+
+    # Shown before the next tick scores it
+    ranking.upsert(replace(view(3), created_at=NOW))
+    assert ranking.ordered("trending", limit=2)[0].id == "q3"
+
+def test_pages_follow_the_ranking_order_across_writes():
+    ranking = EventRanking(view(n, likes=n % 3) for n in range(25))
+    for sort in ("popular", "recent", "trending"):
+        order = [q.id for q in ranking.ordered(sort)]
+        seen, page = [], ranking.page(sort, limit=10)
+        seen += [q.id for q in page.questions]
+        while page.cursor:
+            page = ranking.page(sort, decode_cursor(sort, page.cursor), limit=10)
+            seen += [q.id for q in page.questions]
+        assert seen == order
+
+    # A question added above the cursor doesn't repeat or skip the next page
+    page = ranking.page("recent", limit=10)
+    expected = [q.id for q in ranking.ordered("recent")[10:20]]
+    ranking.upsert(replace(view(99), created_at=NOW + timedelta(minutes=1)))
+    after = decode_cursor("recent", page.cursor)
+    assert [q.id for q in ranking.page("recent", after, limit=10).questions] == expected
+
+    assert decode_cursor("popular", "not-a-cursor") is None
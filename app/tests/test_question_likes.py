@@ -0,0 +1,168 @@
+"""
+Concurrency tests for crud.question.toggle_like against a real Postgres.
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_question_likes.py
+"""
+import asyncio
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import text, func, select
+
+from tests.conftest import database, requires_postgres, run_async
+
+EVENT_ID = 9002
+
+async def create_question() -> str:
+    from db.connection import db_manager
+    from db.models import Event, Question
+
+    async with db_manager.engine.begin() as conn:
+        await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+    async with db_manager.AsyncSessionLocal() as db:
+        now = datetime.now(timezone.utc)
+        db.add(Event(id=EVENT_ID, title="Likes", start_time=now, end_time=now + timedelta(hours=1)))
+        await db.flush()
+        question = Question(event_id=EVENT_ID, nickname="n", question_text="q?", is_visible=True, likes_count=0)
+        db.add(question)
+        await db.commit()
+        return str(question.id)
+
+async def toggle(question_id: str, session_id: str):
+    from db.connection import db_manager
+    from crud.question import toggle_like
+
+    async with db_manager.AsyncSessionLocal() as db:
+        return await toggle_like(db, question_id, session_id)
+
+async def like_rows(question_id: str) -> int:
+    from db.connection import db_manager
+    from db.models import QuestionLike
+
+    async with db_manager.AsyncSessionLocal() as db:
+        result = await db.execute(select(func.count()).where(QuestionLike.question_id == question_id))
+        return result.scalar()
+
+@requires_postgres
+@run_async
+async def test_concurrent_likes_are_not_lost():
+    async with database() as db_manager:
+        try:
+            question_id = await create_question()
+            results = await asyncio.gather(*(toggle(question_id, f"s{n}") for n in range(20)))
+
+            assert all(r.liked and r.event_id == EVENT_ID for r in results)
+            assert max(r.likes_count for r in results) == 20 == await like_rows(question_id)
+
+            unliked = await toggle(question_id, "s0")
+            assert not unliked.liked and unliked.likes_count == 19
+        finally:
+            async with db_manager.engine.begin() as conn:
+                await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+
+@requires_postgres
+@run_async
+async def test_double_tap_never_duplicates_a_like():
+    async with database() as db_manager:
+        try:
+            question_id = await create_question()
+            await asyncio.gather(*(toggle(question_id, "same-session") for _ in range(5)))
+
+            rows = await like_rows(question_id)
+            assert rows <= 1
+            final = await toggle(question_id, "other")
+            assert final.likes_count == rows + 1
+
+            assert await toggle("00000000-0000-4000-8000-000000000000", "same-session") is None
+        finally:
+            async with db_manager.engine.begin() as conn:
+                await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+
+async def likes_count(question_id: str) -> int:
+    from db.connection import db_manager
+    from crud.question import get_question
+
+    async with db_manager.AsyncSessionLocal() as db:
+        return (await get_question(db, question_id)).likes_count
+
+@requires_postgres
+@run_async
+async def test_write_behind_flushes_net_changes_in_one_batch(tmp_path):
+    from utils.like_aggregator import LikeAggregator, WRITE_BEHIND
+
+    async with database() as db_manager:
+        aggregator = LikeAggregator(WRITE_BEHIND, flush_ms=60_000, journal_path=str(tmp_path / "likes.jsonl"))
+        try:
+            question_id = await create_question()
+            await aggregator.start()
+            for n in range(10):
+                result = await aggregator.toggle(question_id, f"s{n}")
+            await aggregator.toggle(question_id, "s0")  # Net: s0 unliked again
+            assert result.likes_count == 10
+            assert await likes_count(question_id) == 0  # Nothing written yet
+
+            await aggregator.flush()
+            assert await likes_count(question_id) == 9 == await like_rows(question_id)
+            assert (tmp_path / "likes.jsonl").read_text() == ""
+            assert await aggregator.toggle("00000000-0000-4000-8000-000000000000", "s1") is None
+        finally:
+            await aggregator.stop()
+            async with db_manager.engine.begin() as conn:
+                await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+
+@requires_postgres
+@run_async
+async def test_write_behind_replays_journal_after_crash(tmp_path):
+    from utils.like_aggregator import LikeAggregator, WRITE_BEHIND
+
+    async with database() as db_manager:
+        journal = str(tmp_path / "likes.jsonl")
+        crashed = LikeAggregator(WRITE_BEHIND, flush_ms=60_000, journal_path=journal)
+        try:
+            question_id = await create_question()
+            await crashed.start()
+            for n in range(3):
+                await crashed.toggle(question_id, f"s{n}")
+            crashed._task.cancel()  # Dies without flushing
+            with open(journal, "a") as torn:
+                torn.write('{"q": "')
+
+            restarted = LikeAggregator(WRITE_BEHIND, flush_ms=60_000, journal_path=journal)
+            await restarted.start()
+            assert await likes_count(question_id) == 3 == await like_rows(question_id)
+            await restarted.stop()
+        finally:
+            async with db_manager.engine.begin() as conn:
+                await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
+
+@requires_postgres
+@run_async
+async def test_stop_during_a_flush_still_writes_the_batch(tmp_path, monkeypatch):
+    import utils.like_aggregator
+    from utils.like_aggregator import LikeAggregator, WRITE_BEHIND
+
+    writing = asyncio.Event()
+    apply_like_changes = utils.like_aggregator.apply_like_changes
+
+    async def slow_apply(db, changes):
+        writing.set()
+        await asyncio.sleep(0.2)
+        await apply_like_changes(db, changes)
+
+    async with database() as db_manager:
+        journal = tmp_path / "likes.jsonl"
+        aggregator = LikeAggregator(WRITE_BEHIND, flush_ms=10, journal_path=str(journal))
+        try:
+            question_id = await create_question()
+            await aggregator.start()
+            monkeypatch.setattr(utils.like_aggregator, "apply_like_changes", slow_apply)
+            for n in range(3):
+                await aggregator.toggle(question_id, f"s{n}")
+            assert len(journal.read_text().splitlines()) == 3
+
+            await writing.wait()
+            await aggregator.stop()  # Cancels the flush loop mid-write
+            assert await likes_count(question_id) == 3 == await like_rows(question_id)
+            assert journal.read_text() == ""
+        finally:
+            async with db_manager.engine.begin() as conn:
+                await conn.execute(text("DELETE FROM events WHERE id = :id"), {"id": EVENT_ID})
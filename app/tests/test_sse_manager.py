@@ -0,0 +1,348 @@
+"""
+Unit tests for utils.sse_manager.
+
+The Postgres backend tests simulate two app instances against a real database
+and only run when DATABASE_URL points at a local Postgres, e.g.:
+
+    DATABASE_URL=postgresql://postgres@localhost:5432/conference pytest tests/test_sse_manager.py
+"""
+import asyncio
+
+from utils.sse_manager import (
+    SSEManager,
+    SSEMessage,
+    InProcessBackend,
+    PostgresBackend,
+    DROP_OLDEST,
+    COALESCE,
+    DISCONNECT,
+    KEEPALIVE_FRAME,
+    PUBLIC,
+    MODERATORS,
+)
+from tests.conftest import database, requires_postgres, run_async
+
+@run_async
+async def test_in_process_broadcast_reaches_subscribers():
+    manager = SSEManager(InProcessBackend())
+    await manager.start()
+    first = await manager.subscribe(1)
+    second = await manager.subscribe(1)
+    other_event = await manager.subscribe(2)
+
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True}, "created")
+
+    assert (await first.get()).data["question"]["id"] == "q1"
+    assert (await second.get()).data["action"] == "created"
+    assert other_event.empty()
+    await manager.stop()
+
+@run_async
+async def test_drop_oldest_policy_keeps_newest_messages():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, maxsize=2, policy=DROP_OLDEST)
+    subscriber = await manager.subscribe(1)
+
+    for n in range(3):
+        await manager.send_question_update(1, {"id": f"q{n}", "is_visible": True}, "created")
+
+    assert [(await subscriber.get()).data["question"]["id"] for _ in range(2)] == ["q1", "q2"]
+    assert manager.stats.dropped == 1
+
+@run_async
+async def test_coalesce_policy_merges_same_question_updates():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, maxsize=2, policy=COALESCE)
+    subscriber = await manager.subscribe(1)
+
+    await manager.send_question_update(1, {"id": "q1", "likes_count": 1, "is_visible": True}, "like_updated")
+    await manager.send_question_update(1, {"id": "q2", "is_visible": True}, "created")
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True}, "updated")
+
+    first = await subscriber.get()
+    assert first.data == {"action": "updated", "question": {"id": "q1", "likes_count": 1, "is_visible": True}}
+    assert (await subscriber.get()).data["question"]["id"] == "q2"
+    assert manager.stats.coalesced == 1 and manager.stats.dropped == 0
+
+@run_async
+async def test_disconnect_policy_evicts_slow_subscriber_without_blocking_others():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, maxsize=1, policy=DISCONNECT)
+    slow = await manager.subscribe(1)
+    fast = await manager.subscribe(1)
+
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True}, "created")
+    assert (await fast.get()).data["question"]["id"] == "q1"
+    await manager.send_question_update(1, {"id": "q2", "is_visible": True}, "created")
+
+    assert manager.stats.evicted == 1
+    assert (await slow.get()).data["question"]["id"] == "q1"
+    assert await slow.get() is None  # Closed after draining
+    assert (await fast.get()).data["question"]["id"] == "q2"
+
+@run_async
+async def test_coalescing_window_batches_like_storm():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, coalesce_ms=20, max_batch=10)
+    subscriber = await manager.subscribe(1)
+
+    for likes in range(1, 6):
+        await manager.send_question_update(1, {"id": "q1", "likes_count": likes, "is_visible": True}, "like_updated")
+    await manager.send_question_update(1, {"id": "q2", "likes_count": 1, "is_visible": True}, "like_updated")
+    assert subscriber.empty()
+
+    batch = await asyncio.wait_for(subscriber.get(), timeout=1)
+    assert batch.event == "question_batch"
+    assert [u["question"]["likes_count"] for u in batch.data["updates"]] == [5, 1]
+    assert subscriber.empty()
+    # Same saving on the moderator channel: 6 broadcasts -> 1 frame, twice
+    assert manager.stats.suppressed == 10 and manager.stats.batches == 2
+
+@run_async
+async def test_coalescing_window_flushes_before_unkeyed_messages():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, coalesce_ms=10_000, max_batch=2)
+    subscriber = await manager.subscribe(1)
+
+    await manager.send_question_update(1, {"id": "q1", "likes_count": 1, "is_visible": True}, "like_updated")
+    await manager.send_question_update(1, {"id": "q2", "is_visible": True}, "created")
+    assert (await subscriber.get()).data["action"] == "like_updated"
+    assert (await subscriber.get()).data["action"] == "created"
+
+    # max_batch reached: sent without waiting for the window
+    await manager.send_question_update(1, {"id": "q1", "likes_count": 2, "is_visible": True}, "like_updated")
+    await manager.send_question_update(1, {"id": "q2", "likes_count": 1, "is_visible": True}, "like_updated")
+    assert (await subscriber.get()).event == "question_batch"
+
+class FlakyBackend(InProcessBackend):
+    """Fails the first `failures` publishes, as a dropped NOTIFY connection would"""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    async def publish(self, event_id, message, audience=PUBLIC):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("NOTIFY failed")
+        await super().publish(event_id, message, audience)
+
+@run_async
+async def test_coalesced_batch_is_kept_when_publishing_fails():
+    manager = SSEManager(FlakyBackend(failures=2))  # Both the moderator and the public flush
+    manager.configure_channel(1, coalesce_ms=20, max_batch=10)
+    subscriber = await manager.subscribe(1)
+
+    await manager.send_question_update(1, {"id": "q1", "likes_count": 1, "is_visible": True}, "like_updated")
+    await manager.send_question_update(1, {"id": "q2", "likes_count": 1, "is_visible": True}, "like_updated")
+    await asyncio.sleep(0.03)
+    assert manager.stats.failed_flushes == 2 and subscriber.empty()
+
+    # Held with the failed batch and sent by the retry
+    await manager.send_question_update(1, {"id": "q1", "likes_count": 2, "is_visible": True}, "like_updated")
+    batch = await asyncio.wait_for(subscriber.get(), timeout=1)
+    assert [(u["question"]["id"], u["question"]["likes_count"]) for u in batch.data["updates"]] == [("q1", 2), ("q2", 1)]
+    await manager.stop()
+
+@run_async
+async def test_heartbeat_pings_only_idle_subscribers():
+    manager = SSEManager(InProcessBackend())
+    manager.HEARTBEAT_INTERVAL, manager.HEARTBEAT_JITTER, manager.HEARTBEAT_TICK = 0.05, 0, 0.01
+    idle = await manager.subscribe(1)
+    busy = await manager.subscribe(2)
+    await manager.send_question_update(2, {"id": "q1", "is_visible": True}, "created")
+
+    assert (await asyncio.wait_for(idle.get(), timeout=1)).frame == KEEPALIVE_FRAME
+    # The unread update is still the only thing queued for the busy stream
+    assert busy.qsize() == 1
+    await manager.stop()
+
+@run_async
+async def test_hidden_questions_only_reach_moderators():
+    manager = SSEManager(InProcessBackend())
+    guest = await manager.subscribe(1, audience=PUBLIC)
+    moderator = await manager.subscribe(1, audience=MODERATORS)
+
+    pending = {"id": "q1", "question_text": "secret?", "is_visible": False}
+    await manager.send_question_update(1, pending, "created")
+    assert guest.empty()
+    assert (await moderator.get()).data["question"]["question_text"] == "secret?"
+
+    approved = {**pending, "is_visible": True}
+    await manager.send_question_update(1, approved, "updated", html="<div></div>")
+    assert (await guest.get()).data["html"] == "<div></div>"
+    assert "html" not in (await moderator.get()).data
+
+    await manager.send_question_update(1, pending, "hidden")
+    assert (await guest.get()).data == {"action": "hidden", "question": {"id": "q1", "is_visible": False}}
+    assert manager.stats.bytes_by_audience[PUBLIC] > 0
+
+@run_async
+async def test_moderator_console_gets_its_own_cards_and_stat_deltas():
+    manager = SSEManager(InProcessBackend())
+    manager.configure_channel(1, coalesce_ms=50, max_batch=50)
+    guest = await manager.subscribe(1, audience=PUBLIC)
+    moderator = await manager.subscribe(1, audience=MODERATORS)
+
+    question = {"id": "q1", "likes_count": 0, "is_visible": True}
+    await manager.send_question_update(1, question, "updated", html="<guest/>", moderator_html="<moderator/>")
+    await manager.send_question_update(1, {**question, "likes_count": 1}, "like_updated")
+    # Counter deltas aren't merged away; they flush the pending card first
+    await manager.send_stats_update(1, visible=1, answered=0)
+    await manager.send_stats_update(1, visible=-1)
+
+    card = await moderator.get()
+    assert card.data["html"] == "<moderator/>" and card.data["question"]["likes_count"] == 1
+    assert (await moderator.get()).data == {"visible": 1}
+    assert (await moderator.get()).data == {"visible": -1}
+    assert (await asyncio.wait_for(guest.get(), timeout=1)).data["html"] == "<guest/>"
+    assert guest.empty()
+
+@run_async
+async def test_subscriber_filter_skips_rejected_messages():
+    manager = SSEManager(InProcessBackend())
+    answered_only = await manager.subscribe(
+        1, accept=lambda m: m.data["question"].get("is_answered", False)
+    )
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True}, "created")
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True, "is_answered": True}, "updated")
+
+    assert answered_only.qsize() == 1
+    assert (await answered_only.get()).data["action"] == "updated"
+
+@run_async
+async def test_reconnect_replays_only_missed_frames():
+    manager = SSEManager(InProcessBackend())
+    first_connection = await manager.subscribe(1)
+    await manager.send_question_update(1, {"id": "q1", "is_visible": True}, "created")
+    seen = await first_connection.get()
+    manager.unsubscribe(1, first_connection)
+
+    # Broadcasts while the phone is offline
+    await manager.send_question_update(1, {"id": "q2", "is_visible": True}, "created")
+    await manager.send_question_update(1, {"id": "q3", "is_visible": True}, "created")
+
+    reconnected = await manager.subscribe(1, last_event_id=seen.id)
+    replayed = [await reconnected.get() for _ in range(reconnected.qsize())]
+    assert [m.data["question"]["id"] for m in replayed] == ["q2", "q3"]
+    assert b"id: " + replayed[-1].id.encode() in replayed[-1].frame
+
+@run_async
+async def test_frames_encoded_before_fan_out_still_carry_their_id():
+    manager = SSEManager(InProcessBackend())
+    subscriber = await manager.subscribe(1)
+    message = SSEMessage("question_update", {"id": "q1"})
+    assert b"id: " not in message.frame  # Encoded before it had an id
+
+    await manager.broadcast(1, message)
+    await manager.broadcast(1, message)  # Rebroadcast of the same object
+    delivered = [await subscriber.get() for _ in range(2)]
+    assert [m.id for m in delivered] == [f"{manager._epoch}-1", f"{manager._epoch}-2"]
+    for sent in delivered:
+        assert f"id: {sent.id}\n".encode() in sent.frame
+
+    # Resuming from the first frame replays the second, with its own id
+    resumed = await manager.subscribe(1, last_event_id=delivered[0].id)
+    replayed = await resumed.get()
+    assert replayed.frame == delivered[1].frame
+
+@run_async
+async def test_reconnect_with_stale_id_gets_single_resync():
+    manager = SSEManager(InProcessBackend())
+    manager.REPLAY_BUFFER_SIZE = 2
+    for n in range(5):
+        await manager.send_question_update(1, {"id": f"q{n}", "is_visible": True}, "created")
+
+    too_old = await manager.subscribe(1, last_event_id=f"{manager._epoch}-1")
+    other_process = await manager.subscribe(1, last_event_id="deadbeef-4")
+    for subscriber in (too_old, other_process):
+        assert subscriber.qsize() == 1
+        resync = await subscriber.get()
+        assert resync.event == "resync"
+        assert resync.id == f"{manager._epoch}-5"
+    assert manager.stats.resyncs == 2
+
+@requires_postgres
+@run_async
+async def test_postgres_backend_fans_out_across_instances():
+
+    async with database():
+        instance_a = SSEManager(PostgresBackend(channel="qa_sse_test"))
+        instance_b = SSEManager(PostgresBackend(channel="qa_sse_test"))
+        await instance_a.start()
+        await instance_b.start()
+        try:
+            listener_a = await instance_a.subscribe(7)
+            listener_b = await instance_b.subscribe(7)
+
+            # Published once on A, delivered on both A and B
+            await instance_a.send_question_update(7, {"id": "q1", "is_visible": True}, "created")
+
+            message_a = await asyncio.wait_for(listener_a.get(), timeout=5)
+            message_b = await asyncio.wait_for(listener_b.get(), timeout=5)
+            assert message_a.data == message_b.data == {"action": "created", "question": {"id": "q1", "is_visible": True}}
+        finally:
+            await instance_a.stop()
+            await instance_b.stop()
+
+@requires_postgres
+@run_async
+async def test_postgres_backend_downgrades_oversized_payloads():
+
+    async with database():
+        instance = SSEManager(PostgresBackend(channel="qa_sse_test"))
+        await instance.start()
+        try:
+            listener = await instance.subscribe(7)
+            await instance.send_question_update(7, {"id": "q1", "is_visible": True, "question_text": "x" * 10000}, "created")
+
+            message = await asyncio.wait_for(listener.get(), timeout=5)
+            assert message.event == "resync"
+        finally:
+            await instance.stop()
+
+@requires_postgres
+@run_async
+async def test_postgres_backend_relistens_without_leaking_connections(monkeypatch):
+    from sqlalchemy import text
+    from db.connection import Listener
+    monkeypatch.setattr(Listener, "RECONNECT_DELAY", 0.05)
+
+    async with database() as db_manager:
+        backend = PostgresBackend(channel="qa_sse_reconnect_test")
+        instance = SSEManager(backend)
+        await instance.start()
+        try:
+            checked_out = db_manager.engine.pool.checkedout()
+            for attempt in range(1, 3):
+                async with db_manager.engine.connect() as conn:
+                    await conn.execute(text(
+                        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query = 'LISTEN \"qa_sse_reconnect_test\"'"
+                    ))
+                for _ in range(100):
+                    await asyncio.sleep(0.02)
+                    if backend._listener.reconnects == attempt:
+                        break
+                assert backend._listener.reconnects == attempt
+                # The dead connection went back to the pool; only the new one is held
+                assert db_manager.engine.pool.checkedout() == checked_out
+
+            listener = await instance.subscribe(7)
+            await instance.send_question_update(7, {"id": "q1", "is_visible": True}, "created")
+            message = await asyncio.wait_for(listener.get(), timeout=5)
+            assert message.data["question"]["id"] == "q1"
+        finally:
+            await instance.stop()
+
+@requires_postgres
+@run_async
+async def test_unlisten_leaves_no_callbacks_on_the_pooled_connection():
+    async with database() as db_manager:
+        for _ in range(3):
+            unlisten = await db_manager.listen("qa_sse_unlisten_test", lambda payload: None, on_lost=lambda: None)
+            await unlisten()
+
+        assert db_manager.engine.pool.checkedin() == 1  # Every cycle reused the same connection
+        async with db_manager.engine.connect() as conn:
+            driver_connection = (await conn.get_raw_connection()).driver_connection
+            assert not driver_connection._termination_listeners
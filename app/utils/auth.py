@@ -1,10 +1,14 @@
 from passlib.context import CryptContext
 from fasthtml.common import RedirectResponse
 from functools import wraps
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import threading
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional
+from typing import Any, Deque, Dict, Optional
 from db.models import User
 from datetime import datetime, date
 from zoneinfo import ZoneInfo
@@ -32,6 +36,205 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         print(f"Password verification error: {e}")
         return False
 
+class PasswordHasherBusy(Exception):
+    """Raised instead of queueing when too many hashes are already waiting"""
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small dedicated thread pool instead of on the event loop.
+
+    A bcrypt hash or verify takes a few hundred milliseconds of CPU; run
+    inline it stalls every SSE stream and page render on the instance. At
+    most WORKERS run at once (bcrypt releases the GIL, so they overlap with
+    the loop) and at most MAX_QUEUED wait behind them; beyond that verify()
+    raises PasswordHasherBusy straight away rather than letting logins pile
+    up. Queue and hash times are recorded for stats().
+    """
+
+    WORKERS = int(os.getenv('AUTH_HASH_WORKERS', 2))
+    MAX_QUEUED = int(os.getenv('AUTH_HASH_MAX_QUEUED', 16))
+
+    def __init__(self, workers: Optional[int] = None, max_queued: Optional[int] = None):
+        self.workers = workers or self.WORKERS
+        self.max_queued = self.MAX_QUEUED if max_queued is None else max_queued
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        # Timings are recorded from the pool threads
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.queue_seconds = 0.0
+        self.max_queue_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.workers + self.max_queued:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._timed, time.perf_counter(), fn, *args
+            )
+        finally:
+            self._pending -= 1
+
+    def _timed(self, queued_at: float, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            queued, took = started - queued_at, time.perf_counter() - started
+            with self._lock:
+                self.completed += 1
+                self.queue_seconds += queued
+                self.max_queue_seconds = max(self.max_queue_seconds, queued)
+                self.hash_seconds += took
+                self.max_hash_seconds = max(self.max_hash_seconds, took)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_queue_ms": round(self.queue_seconds / completed * 1000, 1),
+                "max_queue_ms": round(self.max_queue_seconds * 1000, 1),
+                "avg_hash_ms": round(self.hash_seconds / completed * 1000, 1),
+                "max_hash_ms": round(self.max_hash_seconds * 1000, 1)
+            }
+
+# Proxies in front of the app that append to X-Forwarded-For (1 for Cloud Run,
+# 2 with a load balancer in front of it). Entries to the left of theirs are
+# whatever the client sent and can't be trusted.
+TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+
+def client_address(request, trusted_hops: Optional[int] = None) -> Optional[str]:
+    """Address of the client that connected to the first trusted proxy (or to us, without proxies)"""
+    hops = TRUSTED_PROXY_HOPS if trusted_hops is None else trusted_hops
+    if hops:
+        forwarded = [h.strip() for h in request.headers.get('x-forwarded-for', '').split(',') if h.strip()]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+    return request.client.host if request.client else None
+
+class LoginThrottle:
+    """
+    Counts failed logins per client address and per username in a sliding window.
+
+    A client with MAX_FAILURES recent failures is refused before any
+    password is checked until its oldest failure leaves the window, so a
+    credential-stuffing burst costs a dictionary lookup instead of a bcrypt
+    run. Usernames are never blocked, since anyone could lock a known
+    moderator out that way; instead, past MAX_FAILURES each further attempt
+    on the username waits twice as long, up to MAX_USER_DELAY seconds. A
+    successful login clears the failures of its client and username.
+
+    At most MAX_KEYS keys are tracked; past that the key whose last failure
+    is oldest is dropped.
+    """
+
+    MAX_FAILURES = int(os.getenv('LOGIN_MAX_FAILURES', 5))
+    WINDOW = float(os.getenv('LOGIN_FAILURE_WINDOW_SECONDS', 300))
+    MAX_USER_DELAY = float(os.getenv('LOGIN_MAX_USER_DELAY_SECONDS', 10))
+    MAX_KEYS = 10_000
+
+    def __init__(
+        self,
+        max_failures: Optional[int] = None,
+        window: Optional[float] = None,
+        max_user_delay: Optional[float] = None,
+        max_keys: Optional[int] = None,
+        clock=time.monotonic
+    ):
+        self.max_failures = max_failures or self.MAX_FAILURES
+        self.window = self.WINDOW if window is None else window
+        self.max_user_delay = self.MAX_USER_DELAY if max_user_delay is None else max_user_delay
+        self.max_keys = max_keys or self.MAX_KEYS
+        self._clock = clock
+        # Ordered by last failure, oldest first
+        self._failures: Dict[str, Deque[float]] = {}
+        self.blocked = 0
+        self.delayed = 0
+        self.evicted = 0
+
+    @staticmethod
+    def _client_key(client: Optional[str]) -> str:
+        return f"client:{client or 'unknown'}"
+
+    @staticmethod
+    def _user_key(username: str) -> str:
+        return f"user:{username.strip().lower()}"
+
+    def _recent(self, key: str, now: float) -> Deque[float]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and now - failures[0] >= self.window:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+        return failures
+
+    def retry_after(self, client: Optional[str]) -> float:
+        """Seconds until the client may try again; 0 if allowed now"""
+        now = self._clock()
+        failures = self._recent(self._client_key(client), now)
+        if len(failures) < self.max_failures:
+            return 0.0
+        self.blocked += 1
+        return failures[-self.max_failures] + self.window - now
+
+    def delay(self, username: str) -> float:
+        """Seconds to hold an attempt on this username before checking it"""
+        failures = self._recent(self._user_key(username), self._clock())
+        excess = len(failures) - self.max_failures
+        if excess < 0:
+            return 0.0
+        self.delayed += 1
+        return min(self.max_user_delay, 2.0 ** excess)
+
+    def record_failure(self, client: Optional[str], username: str):
+        now = self._clock()
+        for key in (self._client_key(client), self._user_key(username)):
+            # Re-inserted so the dict stays ordered by last failure
+            failures = self._failures.pop(key, None)
+            if failures is None:
+                # Usernames keep enough failures to grow the delay to its cap
+                failures = deque(maxlen=self.max_failures + 8)
+            failures.append(now)
+            self._failures[key] = failures
+        while len(self._failures) > self.max_keys:
+            del self._failures[next(iter(self._failures))]
+            self.evicted += 1
+
+    def record_success(self, client: Optional[str], username: str):
+        self._failures.pop(self._client_key(client), None)
+        self._failures.pop(self._user_key(username), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tracked_keys": len(self._failures), "blocked": self.blocked, "delayed": self.delayed, "evicted": self.evicted}
+
+# Global instances
+password_hasher = PasswordHasher()
+login_throttle = LoginThrottle()
+
 def is_moderator(sess):
     """Check if user is a moderator"""
     return sess.get('admin_auth', False)
@@ -0,0 +1,51 @@
+import hashlib
+from functools import lru_cache
+from typing import NamedTuple
+from xml.sax.saxutils import escape
+
+# Colors from main.css
+AVATAR_COLORS = [
+    '004EA3',  # primary-color (blue)
+    '009688',  # teal
+    '012B59',  # dark blue
+    '8395b5',  # light blue-gray
+    'A5C7F3',  # light blue
+    'C7C7CC',  # secondary-color (gray)
+]
+
+class Avatar(NamedTuple):
+    svg: bytes
+    fingerprint: str  # Changes with the initials or color, so URLs carrying it can be cached forever
+
+def initials(name: str) -> str:
+    parts = (name or "").strip().split()
+    if len(parts) >= 2:
+        return f"{parts[0][0]}{parts[-1][0]}".upper()
+    return parts[0][0].upper() if parts else "?"
+
+def avatar_color(speaker_id: int) -> str:
+    """Consistent color per speaker"""
+    return AVATAR_COLORS[speaker_id % len(AVATAR_COLORS)]
+
+@lru_cache(maxsize=1024)
+def render_avatar(letters: str, color: str) -> Avatar:
+    """Initials on a colored circle, as ui-avatars.com drew them (rounded, bold, white, half-height text)"""
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="400" height="400" viewBox="0 0 400 400">'
+        f'<circle cx="200" cy="200" r="200" fill="#{color}"/>'
+        '<text x="50%" y="50%" dy=".35em" text-anchor="middle" fill="#ffffff" font-size="200" font-weight="bold" '
+        'font-family="Inter, -apple-system, BlinkMacSystemFont, \'Segoe UI\', Helvetica, Arial, sans-serif">'
+        f'{escape(letters)}</text></svg>'
+    ).encode()
+    return Avatar(svg, hashlib.sha256(svg).hexdigest()[:10])
+
+def speaker_avatar(speaker_id: int, name: str) -> Avatar:
+    return render_avatar(initials(name), avatar_color(speaker_id))
+
+def avatar_url(speaker_id: int, name: str) -> str:
+    """
+    URL of a speaker's generated avatar. Served by /avatars/{speaker_id}
+    (no file extension, so the static catch-all route can't claim it); the
+    fingerprint lets the response be cached as immutable.
+    """
+    return f"/avatars/{speaker_id}?v={speaker_avatar(speaker_id, name).fingerprint}"
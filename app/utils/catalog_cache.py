@@ -0,0 +1,218 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from core.assets import asset_url
+
+@dataclass(frozen=True)
+class SpeakerView:
+    """Speaker with its display image already resolved (real photo or placeholder)"""
+    id: int
+    name: str
+    image_url: str
+    bio: Optional[str]
+
+    @classmethod
+    def from_model(cls, speaker) -> "SpeakerView":
+        from utils.speaker_utils import get_speaker_image_url
+        return cls(
+            id=speaker.id,
+            name=speaker.name,
+            image_url=get_speaker_image_url(speaker.id, speaker.name, speaker.image_url),
+            bio=speaker.bio
+        )
+
+@dataclass(frozen=True)
+class EventView:
+    id: int
+    title: str
+    description: Optional[str]
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str]
+    category: Optional[str]
+    is_qa_active: bool
+    speakers: Tuple[SpeakerView, ...]
+
+    @classmethod
+    def from_model(cls, event, speakers: Mapping[int, SpeakerView]) -> "EventView":
+        return cls(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            start_time=event.start_time,
+            end_time=event.end_time,
+            location=event.location,
+            category=event.category,
+            is_qa_active=bool(event.is_qa_active),
+            speakers=tuple(speakers.get(s.id) or SpeakerView.from_model(s) for s in event.speakers)
+        )
+
+@dataclass(frozen=True)
+class SponsorView:
+    id: int
+    name: str
+    image_url: Optional[str]
+    description: Optional[str]
+    website: Optional[str]
+    facebook: Optional[str]
+    instagram: Optional[str]
+    twitter: Optional[str]
+
+    @classmethod
+    def from_model(cls, sponsor) -> "SponsorView":
+        return cls(
+            id=sponsor.id,
+            name=sponsor.name,
+            image_url=asset_url(sponsor.image_url) if sponsor.image_url else sponsor.image_url,
+            description=sponsor.description,
+            website=sponsor.website,
+            facebook=sponsor.facebook,
+            instagram=sponsor.instagram,
+            twitter=sponsor.twitter
+        )
+
+@dataclass(frozen=True)
+class PrayerTimeView:
+    id: int
+    name: str
+    time: Optional[str]
+    iqama: Optional[str]
+
+    @classmethod
+    def from_model(cls, prayer_time) -> "PrayerTimeView":
+        return cls(id=prayer_time.id, name=prayer_time.name, time=prayer_time.time, iqama=prayer_time.iqama)
+
+@dataclass(frozen=True)
+class Catalog:
+    """One immutable snapshot of the conference catalog, shared by every request"""
+    events: Tuple[EventView, ...]  # By start time, as the agenda shows them
+    speakers: Tuple[SpeakerView, ...]
+    sponsors: Tuple[SponsorView, ...]
+    prayer_times: Tuple[PrayerTimeView, ...]
+    events_by_id: Mapping[int, EventView]
+    speakers_by_id: Mapping[int, SpeakerView]
+    sponsors_by_id: Mapping[int, SponsorView]
+
+    @classmethod
+    def build(cls, events, speakers, sponsors, prayer_times) -> "Catalog":
+        speaker_views = tuple(SpeakerView.from_model(s) for s in speakers)
+        speakers_by_id = {s.id: s for s in speaker_views}
+        event_views = tuple(sorted(
+            (EventView.from_model(e, speakers_by_id) for e in events),
+            key=lambda e: e.start_time
+        ))
+        sponsor_views = tuple(SponsorView.from_model(s) for s in sponsors)
+        return cls(
+            events=event_views,
+            speakers=speaker_views,
+            sponsors=sponsor_views,
+            prayer_times=tuple(PrayerTimeView.from_model(p) for p in prayer_times),
+            events_by_id=MappingProxyType({e.id: e for e in event_views}),
+            speakers_by_id=MappingProxyType(speakers_by_id),
+            sponsors_by_id=MappingProxyType({s.id: s for s in sponsor_views})
+        )
+
+async def load_catalog() -> Catalog:
+    """Read the whole catalog in one session (a handful of queries)"""
+    # Imported here: the crud modules import catalog_cache for their write hooks
+    from db.connection import db_manager
+    from crud.event import get_events
+    from crud.speaker import get_speakers
+    from crud.sponsor import get_sponsors
+    from crud.prayer_time import get_prayer_times
+
+    async with db_manager.AsyncSessionLocal() as db:
+        return Catalog.build(
+            events=await get_events(db, limit=None),
+            speakers=await get_speakers(db, limit=None),
+            sponsors=await get_sponsors(db, limit=None),
+            prayer_times=await get_prayer_times(db)
+        )
+
+class CatalogCache:
+    """
+    Read-through cache of the conference catalog: events with their
+    speakers, speakers, sponsors and prayer times.
+
+    The catalog changes a few times a day, so it is loaded whole into a
+    Catalog snapshot that pages read without touching the database. Writes
+    through crud call invalidate(); the next read reloads it once, however
+    many requests are waiting. MAX_AGE bounds staleness after writes made
+    by other processes (e.g. sync_data.py).
+    """
+
+    MAX_AGE = float(os.getenv('CATALOG_MAX_AGE_SECONDS', 300))
+
+    def __init__(self, load: Callable[[], Awaitable[Catalog]] = load_catalog, max_age: Optional[float] = None):
+        self._load = load
+        self.max_age = self.MAX_AGE if max_age is None else max_age
+        self._catalog: Optional[Catalog] = None
+        self._loaded_at = 0.0
+        self._version = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        """Drop the snapshot after a catalog write; the next read reloads it"""
+        self._version += 1
+        self._catalog = None
+
+    def _fresh(self) -> Optional[Catalog]:
+        if self._catalog is not None and (not self.max_age or time.monotonic() - self._loaded_at < self.max_age):
+            return self._catalog
+        return None
+
+    async def get(self) -> Catalog:
+        catalog = self._fresh()
+        if catalog is not None:
+            self.hits += 1
+            return catalog
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another request may have reloaded it while this one waited
+            catalog = self._fresh()
+            if catalog is not None:
+                self.hits += 1
+                return catalog
+            self.misses += 1
+            version = self._version
+            catalog = await self._load()
+            # A write during the load may be missing from it; reload next time
+            if version == self._version:
+                self._catalog, self._loaded_at = catalog, time.monotonic()
+            return catalog
+
+    async def events(self) -> Tuple[EventView, ...]:
+        return (await self.get()).events
+
+    async def event(self, event_id: int) -> Optional[EventView]:
+        return (await self.get()).events_by_id.get(event_id)
+
+    async def speakers(self) -> Tuple[SpeakerView, ...]:
+        return (await self.get()).speakers
+
+    async def speaker(self, speaker_id: int) -> Optional[SpeakerView]:
+        return (await self.get()).speakers_by_id.get(speaker_id)
+
+    async def sponsors(self) -> Tuple[SponsorView, ...]:
+        return (await self.get()).sponsors
+
+    async def sponsor(self, sponsor_id: int) -> Optional[SponsorView]:
+        return (await self.get()).sponsors_by_id.get(sponsor_id)
+
+    async def prayer_times(self) -> Tuple[PrayerTimeView, ...]:
+        return (await self.get()).prayer_times
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "loaded": self._catalog is not None}
+
+# Global catalog cache instance
+catalog_cache = CatalogCache()
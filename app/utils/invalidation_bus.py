@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import uuid
+from typing import Any, Dict, List, Optional
+
+from utils.catalog_cache import catalog_cache
+from utils.question_cache import question_cache
+
+# Message kinds
+CATALOG = "catalog"      # events, speakers, sponsors or prayer times changed
+QUESTIONS = "questions"  # one event's questions changed: {event_id}
+LIKE = "like"            # one like toggle: {event_id, question_id, session_id, liked, likes_count}
+
+class InvalidationBus:
+    """
+    Keeps the catalog and Q&A caches of every app instance in step.
+
+    Crud writes update this instance's caches directly and publish() a
+    typed message; the bus batches messages into Postgres NOTIFY payloads
+    and every other instance evicts the matching entries (likes are
+    patched in place, as they are locally). Notifications sent while an
+    instance's LISTEN connection is down are lost, so it drops all cached
+    entries when the connection drops and again when it is back, and on
+    REFRESH_INTERVAL as a backstop.
+
+    With CACHE_BUS=memory (the default, one instance) publish() is a no-op.
+    """
+
+    CHANNEL = "cache_invalidation"
+    # Seconds between full refreshes; 0 disables them
+    REFRESH_INTERVAL = float(os.getenv('CACHE_REFRESH_SECONDS', 300))
+
+    def __init__(
+        self,
+        backend: Optional[str] = None,
+        channel: str = CHANNEL,
+        refresh_interval: Optional[float] = None,
+        catalog=catalog_cache,
+        questions=question_cache
+    ):
+        self.backend = (backend or os.getenv('CACHE_BUS', 'memory')).lower()
+        if self.backend not in ('memory', 'postgres'):
+            raise ValueError(f"Unknown cache bus: {self.backend}")
+        self.channel = channel
+        self.refresh_interval = self.REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self.catalog = catalog
+        self.questions = questions
+        # Lets an instance skip its own messages, which it has already applied
+        self.origin = uuid.uuid4().hex
+        self._outbox: Optional[asyncio.Queue] = None
+        self._listener = None
+        self._tasks: List[asyncio.Task] = []
+        self.sent = 0
+        self.received = 0
+        self.refreshes = 0
+
+    @property
+    def _db(self):
+        # Imported lazily so the memory bus works without a database
+        from db.connection import db_manager
+        return db_manager
+
+    async def start(self):
+        if self.backend != 'postgres' or self._outbox is not None:
+            return
+        self._outbox = asyncio.Queue()
+        self._tasks.append(asyncio.create_task(self._send_outbox()))
+        if self.refresh_interval:
+            self._tasks.append(asyncio.create_task(self._refresh_tick()))
+        self._listener = self._db.listener(
+            self.channel, self._on_payload, on_lost=self.refresh_all, on_restored=self.refresh_all
+        )
+        await self._listener.start()
+
+    async def stop(self):
+        self._outbox = None
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._listener:
+            await self._listener.stop()
+            self._listener = None
+
+    def publish(self, kind: str, **fields):
+        """Queue a message for the other instances; never waits on the database"""
+        if self._outbox is not None:
+            self._outbox.put_nowait({"kind": kind, **fields})
+
+    def pack(self, messages: List[Dict[str, Any]], max_bytes: Optional[int] = None) -> List[str]:
+        """Group messages into as few NOTIFY payloads as fit, dropping repeats"""
+        max_bytes = max_bytes or self._db.MAX_NOTIFY_PAYLOAD_BYTES
+        unique = list(dict.fromkeys(json.dumps(m, sort_keys=True) for m in messages))
+        envelope = '{"origin": "%s", "messages": [%s]}'
+        payloads, batch = [], []
+        for message in unique:
+            candidate = batch + [message]
+            if batch and len((envelope % (self.origin, ", ".join(candidate))).encode("utf-8")) > max_bytes:
+                payloads.append(envelope % (self.origin, ", ".join(batch)))
+                candidate = [message]
+            batch = candidate
+        if batch:
+            payloads.append(envelope % (self.origin, ", ".join(batch)))
+        return payloads
+
+    async def _send_outbox(self):
+        while True:
+            # Everything queued while the last NOTIFY was in flight goes out together
+            messages = [await self._outbox.get()]
+            while not self._outbox.empty():
+                messages.append(self._outbox.get_nowait())
+            for payload in self.pack(messages):
+                try:
+                    await self._db.notify(self.channel, payload)
+                    self.sent += 1
+                except Exception as e:
+                    # The other instances catch up on their next full refresh
+                    print(f"Cache bus failed to publish: {e}")
+
+    def _on_payload(self, payload: str):
+        # Called from the asyncpg protocol; applying is synchronous, so order is kept
+        try:
+            raw = json.loads(payload)
+            if raw["origin"] == self.origin:
+                return
+            for message in raw["messages"]:
+                self.apply(message)
+        except Exception as e:
+            print(f"Cache bus dropped malformed notification: {e}")
+
+    def apply(self, message: Dict[str, Any]):
+        """Evict (or patch) the cache entries a message from another instance refers to"""
+        kind = message["kind"]
+        if kind == CATALOG:
+            self.catalog.invalidate()
+        elif kind == QUESTIONS:
+            self.questions.invalidate(int(message["event_id"]))
+        elif kind == LIKE:
+            self.questions.record_like(
+                int(message["event_id"]), message["question_id"], message["session_id"],
+                bool(message["liked"]), int(message["likes_count"])
+            )
+        else:
+            raise ValueError(f"Unknown cache bus message: {kind}")
+        self.received += 1
+
+    def refresh_all(self):
+        """Drop every cached entry; the next reads reload from the database"""
+        self.catalog.invalidate()
+        self.questions.clear()
+        self.refreshes += 1
+
+    async def _refresh_tick(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            self.refresh_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "sent": self.sent,
+            "received": self.received,
+            "refreshes": self.refreshes
+        }
+
+# Global invalidation bus instance
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from db.connection import db_manager
+from crud.question import LikeToggle, get_like_state, apply_like_changes
+from utils.question_cache import question_cache
+from utils.invalidation_bus import invalidation_bus, LIKE
+
+# LIKE_WRITE_MODE: "sync" commits every tap; "write_behind" batches them
+SYNC = "sync"
+WRITE_BEHIND = "write_behind"
+WRITE_MODES = (SYNC, WRITE_BEHIND)
+
+class _QuestionLikes:
+    """In-memory like state of one question: DB state plus unflushed toggles"""
+    __slots__ = ("event_id", "is_visible", "likes_count", "likers")
+
+    def __init__(self, event_id: int, is_visible: bool, likes_count: int, likers: Set[str]):
+        self.event_id = event_id
+        self.is_visible = is_visible
+        self.likes_count = likes_count
+        self.likers = likers
+
+class LikeAggregator:
+    """
+    Write-behind buffer for question likes.
+
+    Toggles are applied to in-memory state right away and the caller
+    broadcasts the new count; a background task writes the net changes to
+    question_likes and questions.likes_count in one statement every
+    flush interval. Each toggle is appended to a local journal first, so
+    changes that were not flushed before a crash are replayed on start.
+    Journal reads and writes run in order on one dedicated thread, so a
+    slow disk holds up the tapping request but not the event loop.
+
+    Counts are this process's view; with several instances, use sync mode
+    or accept that counts converge as each instance flushes.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        flush_ms: Optional[int] = None,
+        journal_path: Optional[str] = None
+    ):
+        self.mode = mode or os.getenv('LIKE_WRITE_MODE', SYNC)
+        if self.mode not in WRITE_MODES:
+            raise ValueError(f"Unknown like write mode: {self.mode}")
+        self.flush_interval = (flush_ms if flush_ms is not None else int(os.getenv('LIKE_FLUSH_MS', 250))) / 1000
+        self.journal_path = journal_path or os.getenv('LIKE_JOURNAL_PATH', 'like_journal.jsonl')
+
+        self._questions: Dict[str, _QuestionLikes] = {}
+        # (question_id, session_id) -> final liked state not yet in the database
+        self._pending: Dict[Tuple[str, str], bool] = {}
+        self._journal = None  # Only used on the journal thread
+        self._journal_executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode == WRITE_BEHIND
+
+    async def start(self):
+        """Replay any journaled changes and start the flush loop (call once on app startup)"""
+        if not self.enabled or self._task is not None:
+            return
+        self._journal_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="like-journal")
+        replayed = await self._journal_io(self._read_journal)
+        if replayed:
+            print(f"Replaying {len(replayed)} journaled like changes")
+            self._pending.update(replayed)
+        # Compact before appending so a torn last line can't corrupt new entries
+        await self._journal_io(self._rewrite_journal, self._journal_lines())
+        await self.flush()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Flush what is pending and stop (call on app shutdown)"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            # A flush interrupted mid-write puts its batch back in _pending
+            await task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+        await self._journal_io(self._close_journal)
+        self._journal_executor.shutdown()
+        self._journal_executor = None
+
+    async def toggle(self, question_id: str, session_id: str) -> Optional[LikeToggle]:
+        """
+        Toggle a like in memory.
+        Returns: (liked, likes_count, event_id, is_visible), or None if the question doesn't exist
+        """
+        state = await self._state(question_id)
+        if state is None:
+            return None
+
+        liked = session_id not in state.likers
+        if liked:
+            state.likers.add(session_id)
+            state.likes_count += 1
+        else:
+            state.likers.discard(session_id)
+            state.likes_count = max(0, state.likes_count - 1)
+
+        self._pending[(question_id, session_id)] = liked
+        await self._journal_io(self._append_journal, journal_line(question_id, session_id, liked))
+        question_cache.record_like(state.event_id, question_id, session_id, liked, state.likes_count)
+        invalidation_bus.publish(
+            LIKE, event_id=state.event_id, question_id=question_id, session_id=session_id,
+            liked=liked, likes_count=state.likes_count
+        )
+        return LikeToggle(liked, state.likes_count, state.event_id, state.is_visible)
+
+    def likes_count(self, question_id: str, default: int) -> int:
+        """Current count including unflushed likes, for pages rendered from the database"""
+        state = self._questions.get(question_id)
+        return state.likes_count if state else default
+
+    def liked_question_ids(self, session_id: str, liked_ids: Set[str]) -> Set[str]:
+        """Overlay a session's unflushed toggles on the liked ids read from the database"""
+        if not self._pending:
+            return liked_ids
+        liked_ids = set(liked_ids)
+        for (question_id, pending_session), liked in self._pending.items():
+            if pending_session == session_id:
+                (liked_ids.add if liked else liked_ids.discard)(question_id)
+        return liked_ids
+
+    def set_visibility(self, question_id: str, is_visible: bool):
+        """Keep cached visibility in step with moderator changes, so like updates reach the right channel"""
+        state = self._questions.get(question_id)
+        if state:
+            state.is_visible = is_visible
+
+    def discard(self, question_id: str):
+        """Forget a deleted question"""
+        self._questions.pop(question_id, None)
+        for key in [k for k in self._pending if k[0] == question_id]:
+            del self._pending[key]
+
+    async def flush(self):
+        """Write all pending toggles in one batched statement"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            async with db_manager.AsyncSessionLocal() as db:
+                await apply_like_changes(db, [(q, s, liked) for (q, s), liked in batch.items()])
+        except asyncio.CancelledError:
+            # stop() cancelled the flush loop mid-write; its own flush writes the batch
+            # again (final states, so writing a batch twice is harmless)
+            self._restore(batch)
+            raise
+        except Exception as e:
+            self._restore(batch)
+            print(f"Like flush failed, will retry: {e}")
+            return
+
+        # Only toggles made while flushing still need journaling
+        await self._journal_io(self._rewrite_journal, self._journal_lines())
+        # Reload untouched questions next time so other instances' likes show up
+        touched = {question_id for question_id, _ in self._pending}
+        for question_id in {q for q, _ in batch} - touched:
+            self._questions.pop(question_id, None)
+
+    def _restore(self, batch: Dict[Tuple[str, str], bool]):
+        """Put back a batch that wasn't written, keeping newer toggles made meanwhile"""
+        for key, liked in batch.items():
+            self._pending.setdefault(key, liked)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _state(self, question_id: str) -> Optional[_QuestionLikes]:
+        state = self._questions.get(question_id)
+        if state is not None:
+            return state
+        async with db_manager.AsyncSessionLocal() as db:
+            loaded = await get_like_state(db, question_id)
+        if loaded is None:
+            return None
+        # A concurrent toggle may have loaded it while we waited
+        return self._questions.setdefault(question_id, _QuestionLikes(*loaded))
+
+    def _journal_io(self, fn, *args) -> asyncio.Future:
+        """Run fn on the journal thread; calls run in the order they are made"""
+        return asyncio.get_running_loop().run_in_executor(self._journal_executor, fn, *args)
+
+    def _journal_lines(self) -> List[str]:
+        return [journal_line(q, s, liked) for (q, s), liked in self._pending.items()]
+
+    def _read_journal(self) -> Dict[Tuple[str, str], bool]:
+        changes = {}
+        if not os.path.exists(self.journal_path):
+            return changes
+        with open(self.journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from the crash; everything before it is intact
+                    continue
+                changes[(entry["q"], entry["s"])] = entry["liked"]
+        return changes
+
+    def _append_journal(self, line: str):
+        self._journal.write(line)
+        self._journal.flush()
+
+    def _rewrite_journal(self, lines: List[str]):
+        temp_path = f"{self.journal_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            journal.writelines(lines)
+        self._close_journal()
+        os.replace(temp_path, self.journal_path)
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+def journal_line(question_id: str, session_id: str, liked: bool) -> str:
+    return json.dumps({"q": question_id, "s": session_id, "liked": liked}) + "\n"
+
+# Global like aggregator instance (mode chosen by LIKE_WRITE_MODE env var)
+like_aggregator = LikeAggregator()
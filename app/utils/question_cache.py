@@ -0,0 +1,232 @@
+import asyncio
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, Optional
+from utils.question_ranking import EventRanking, QuestionPage, PAGE_SIZE
+
+@dataclass(frozen=True)
+class QuestionView:
+    """Immutable snapshot of a visible question, shared by every guest"""
+    id: str
+    event_id: int
+    nickname: str
+    question_text: str
+    is_visible: bool
+    is_answered: bool
+    likes_count: int
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, question, likes_count: Optional[int] = None) -> "QuestionView":
+        return cls(
+            id=str(question.id),
+            event_id=question.event_id,
+            nickname=question.nickname,
+            question_text=question.question_text,
+            is_visible=question.is_visible,
+            is_answered=question.is_answered,
+            likes_count=question.likes_count if likes_count is None else likes_count,
+            created_at=question.created_at
+        )
+
+class _EventEntry:
+    __slots__ = ("ranking", "likes")
+
+    def __init__(self):
+        # Every sort order, updated in place by every write; rebuilt from the DB when missing
+        self.ranking: Optional[EventRanking] = None
+        # session_id -> liked question ids, for sessions loaded so far; patched in place on every toggle
+        self.likes: Dict[str, FrozenSet[str]] = {}
+
+class QuestionListCache:
+    """
+    Per-event cache of the guest question lists.
+
+    Every write to an event's questions is applied to the event's ranking
+    index, and pages are sliced from the index rather than re-queried. The
+    index is loaded from the database on first use and again after
+    invalidate() (startup or resync); a write that lands while a load is in
+    flight discards the loaded copy. Each session's like set is loaded once,
+    kept beside the index and updated in place, so overlaying a guest's
+    highlights only queries the database on their first page. Events are evicted LRU beyond max_events.
+    """
+
+    MAX_EVENTS = int(os.getenv('QA_CACHE_MAX_EVENTS', 64))
+    # Seconds between trending rescoring passes
+    TRENDING_TICK = float(os.getenv('QA_TRENDING_TICK_SECONDS', 5))
+
+    def __init__(self, max_events: Optional[int] = None):
+        self.max_events = max_events or self.MAX_EVENTS
+        # event_id -> writes seen, to spot writes racing a load
+        self._writes: Dict[int, int] = {}
+        self._entries: "OrderedDict[int, _EventEntry]" = OrderedDict()
+        self._trending_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    async def start(self):
+        """Start the trending tick (call once on app startup)"""
+        if self._trending_task is None:
+            self._trending_task = asyncio.create_task(self._trending_tick())
+
+    async def stop(self):
+        if self._trending_task is not None:
+            self._trending_task.cancel()
+            self._trending_task = None
+
+    async def _trending_tick(self):
+        while True:
+            await asyncio.sleep(self.TRENDING_TICK)
+            self.refresh_trending()
+
+    def refresh_trending(self):
+        """Rescore trending for every cached event"""
+        for entry in self._entries.values():
+            if entry.ranking is not None:
+                entry.ranking.refresh_trending()
+
+    def _write_count(self, event_id: int) -> int:
+        return self._writes.get(event_id, 0)
+
+    def _wrote(self, event_id: int):
+        self._writes[event_id] = self._write_count(event_id) + 1
+
+    def invalidate(self, event_id: int):
+        """Drop everything cached for an event, for writes made outside this process"""
+        self._wrote(event_id)
+        self._entries.pop(event_id, None)
+
+    def clear(self):
+        """Drop every event, e.g. after missing notifications from other instances"""
+        for event_id in list(self._entries):
+            self.invalidate(event_id)
+
+    def question_changed(self, question):
+        """Apply a created or updated question (ORM model or QuestionView)"""
+        self._wrote(question.event_id)
+        ranking = self._ranking(question.event_id)
+        if ranking is None:
+            return
+        if not isinstance(question, QuestionView):
+            # The index tracks every like, including ones not yet flushed to the row
+            current = ranking.get(str(question.id))
+            question = QuestionView.from_model(question, current.likes_count if current else None)
+        ranking.upsert(question)
+
+    def question_removed(self, event_id: int, question_id: str):
+        self._wrote(event_id)
+        ranking = self._ranking(event_id)
+        if ranking is not None:
+            ranking.remove(question_id)
+
+    def record_like(self, event_id: int, question_id: str, session_id: str, liked: bool, likes_count: int):
+        """Apply a like toggle to the ranking and the cached like sets"""
+        self._wrote(event_id)
+        entry = self._entries.get(event_id)
+        if entry is None:
+            return
+        if entry.ranking is not None:
+            entry.ranking.set_likes(question_id, likes_count)
+        liked_ids = entry.likes.get(session_id)
+        if liked_ids is not None:
+            entry.likes[session_id] = liked_ids | {question_id} if liked else liked_ids - {question_id}
+
+    async def get_page(
+        self,
+        event_id: int,
+        sort: str,
+        load: Callable[[], Awaitable[Iterable[QuestionView]]],
+        after: Optional[tuple] = None,
+        limit: int = PAGE_SIZE
+    ) -> QuestionPage:
+        """One page of visible questions after a decode_cursor() position, sliced from the ranking index"""
+        ranking = await self._load_ranking(event_id, load)
+        return ranking.page(sort, after, limit)
+
+    async def _load_ranking(self, event_id: int, load) -> EventRanking:
+        ranking = self._entry(event_id).ranking
+        if ranking is not None:
+            self.hits += 1
+            return ranking
+        self.misses += 1
+        writes = self._write_count(event_id)
+        ranking = EventRanking(await load())
+        # A write during the load may be missing from it; rebuild next time
+        if writes == self._write_count(event_id):
+            self._entry(event_id).ranking = ranking
+        return ranking
+
+    async def get_session_likes(
+        self,
+        event_id: int,
+        session_id: str,
+        load: Callable[[], Awaitable[Iterable[str]]]
+    ) -> FrozenSet[str]:
+        """Question ids a session has liked in an event; `load` fetches that session's likes on a miss"""
+        liked = self._entry(event_id).likes.get(session_id)
+        if liked is not None:
+            self.hits += 1
+            return liked
+
+        self.misses += 1
+        writes = self._write_count(event_id)
+        liked = frozenset(await load())
+        # A toggle during the load may be missing from it; reload next time
+        if writes == self._write_count(event_id):
+            self._entry(event_id).likes[session_id] = liked
+        return liked
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "events": len(self._entries)}
+
+    def _ranking(self, event_id: int) -> Optional[EventRanking]:
+        entry = self._entries.get(event_id)
+        return entry.ranking if entry is not None else None
+
+    def _entry(self, event_id: int) -> _EventEntry:
+        entry = self._entries.get(event_id)
+        if entry is None:
+            entry = self._entries[event_id] = _EventEntry()
+            while len(self._entries) > self.max_events:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(event_id)
+        return entry
+
+class FragmentCache:
+    """Bounded LRU of rendered HTML fragments"""
+
+    MAX_SIZE = int(os.getenv('QA_CARD_CACHE_SIZE', 4096))
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or self.MAX_SIZE
+        self._fragments: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        html = self._fragments.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._fragments.move_to_end(key)
+        return html
+
+    def put(self, key: Hashable, html: str):
+        self._fragments[key] = html
+        if len(self._fragments) > self.max_size:
+            self._fragments.popitem(last=False)
+
+    def clear(self):
+        self._fragments.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._fragments)}
+
+# Global question list cache instance
+question_cache = QuestionListCache()
+# Rendered QuestionCard HTML, keyed by question, version and role
+card_cache = FragmentCache()
@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+import os
+import time
+from dataclasses import replace
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sortedcontainers import SortedList
+
+POPULAR = "popular"
+RECENT = "recent"
+TRENDING = "trending"
+SORTS = (POPULAR, RECENT, TRENDING)
+
+# Trending score = (likes + 1) / (age_hours + 2) ** gravity, as on Hacker News;
+# higher gravity lets older questions sink faster
+TRENDING_GRAVITY = float(os.getenv('QA_TRENDING_GRAVITY', 1.5))
+
+# Cards per page of the question list; later pages load on scroll
+PAGE_SIZE = int(os.getenv('QA_PAGE_SIZE', 20))
+
+class QuestionPage(NamedTuple):
+    questions: tuple
+    cursor: Optional[str]  # Opaque cursor for the next page, None on the last one
+
+def encode_cursor(sort: str, question=None, offset: int = 0) -> str:
+    """
+    Cursor for the page after `question`. Popular and recent are keyset
+    cursors on the last question's sort key, so questions added above it
+    don't shift later pages; trending is re-scored on a tick, so it pages
+    by offset.
+    """
+    if sort == POPULAR:
+        value = [question.likes_count, question.created_at.isoformat(), str(question.id)]
+    elif sort == TRENDING:
+        value = [offset]
+    else:
+        value = [question.created_at.isoformat(), str(question.id)]
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+def decode_cursor(sort: str, cursor: Optional[str]) -> Optional[tuple]:
+    """
+    Cursor fields for `sort`: (likes_count, created_at, id) for popular,
+    (created_at, id) for recent, (offset,) for trending. None for a missing
+    or malformed cursor, i.e. the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if sort == POPULAR:
+            likes_count, created_at, question_id = value
+            return int(likes_count), datetime.fromisoformat(created_at), str(question_id)
+        if sort == TRENDING:
+            (offset,) = value
+            return (max(int(offset), 0),)
+        created_at, question_id = value
+        return datetime.fromisoformat(created_at), str(question_id)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+
+def trending_scores(likes: np.ndarray, created_at: np.ndarray, now: float, gravity: float = TRENDING_GRAVITY) -> np.ndarray:
+    """Vectorized trending scores; created_at and now are Unix timestamps"""
+    age_hours = np.maximum(now - created_at, 0) / 3600
+    return (likes + 1) / (age_hours + 2) ** gravity
+
+class EventRanking:
+    """
+    Visible questions of one event, kept in "popular" and "recent" order.
+
+    Each order is a SortedList of keys (a list of bounded sublists with a
+    positional index), so a like, unlike, visibility change or delete is
+    O(log n) for the lookup plus a shift within one sublist, instead of
+    re-sorting (or re-querying) the whole event. Key order matches the SQL in
+    get_questions_by_event: likes_count DESC, created_at DESC for popular and
+    created_at DESC for recent, with the id as a stable tie-break.
+
+    Trending scores change with time, not just with writes, so that order is
+    recomputed for the whole event in one NumPy batch by refresh_trending()
+    on a tick. Questions that became visible since the last tick are shown
+    first, newest first.
+    """
+
+    def __init__(self, questions: Iterable = ()):
+        # question id -> QuestionView
+        self._questions: Dict[str, object] = {q.id: q for q in questions if q.is_visible}
+        self._orders: Dict[str, SortedList] = {
+            POPULAR: SortedList(map(self._popular_key, self._questions.values())),
+            RECENT: SortedList(map(self._recent_key, self._questions.values()))
+        }
+        self._trending: Tuple[str, ...] = ()
+        self._trending_ids: frozenset = frozenset()
+        # Visible questions not scored yet (added since the last tick)
+        self._unscored: set = set()
+        self.refresh_trending()
+
+    @staticmethod
+    def _popular_key(question) -> tuple:
+        return (-question.likes_count, -question.created_at.timestamp(), question.id)
+
+    @staticmethod
+    def _recent_key(question) -> tuple:
+        return (-question.created_at.timestamp(), question.id)
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def __contains__(self, question_id: str) -> bool:
+        return question_id in self._questions
+
+    def get(self, question_id: str):
+        return self._questions.get(question_id)
+
+    def upsert(self, question):
+        """Add or reposition a question; hidden questions are removed"""
+        self.remove(question.id)
+        if not question.is_visible:
+            return
+        self._questions[question.id] = question
+        if question.id not in self._trending_ids:
+            self._unscored.add(question.id)
+        self._orders[POPULAR].add(self._popular_key(question))
+        self._orders[RECENT].add(self._recent_key(question))
+
+    def remove(self, question_id: str):
+        question = self._questions.pop(question_id, None)
+        if question is None:
+            return
+        self._orders[POPULAR].remove(self._popular_key(question))
+        self._orders[RECENT].remove(self._recent_key(question))
+
+    def set_likes(self, question_id: str, likes_count: int):
+        """Move a question to its new place after a like or unlike"""
+        question = self._questions.get(question_id)
+        if question is not None and question.likes_count != likes_count:
+            self.upsert(replace(question, likes_count=likes_count))
+
+    def refresh_trending(self, now: Optional[float] = None):
+        """Rescore every question and rebuild the trending order"""
+        ids = list(self._questions)
+        questions = self._questions.values()
+        likes = np.fromiter((q.likes_count for q in questions), dtype=np.float64, count=len(ids))
+        created_at = np.fromiter((q.created_at.timestamp() for q in questions), dtype=np.float64, count=len(ids))
+        scores = trending_scores(likes, created_at, time.time() if now is None else now)
+        # Highest score first, newest first on ties
+        order = np.lexsort((-created_at, -scores))
+        self._trending = tuple(ids[i] for i in order)
+        self._trending_ids = frozenset(ids)
+        self._unscored = set()
+
+    def ordered(self, sort: str, limit: Optional[int] = None) -> Tuple:
+        """Questions in `sort` order ("popular", "trending", anything else for recent); top-K with limit"""
+        if sort == TRENDING:
+            return self._ordered_trending(limit)
+        keys = self._orders[POPULAR if sort == POPULAR else RECENT].islice(stop=limit)
+        return tuple(self._questions[key[-1]] for key in keys)
+
+    def page(self, sort: str, after: Optional[tuple] = None, limit: int = PAGE_SIZE) -> QuestionPage:
+        """One page of `sort` order after a decode_cursor() position"""
+        if sort == TRENDING:
+            offset = after[0] if after else 0
+            questions = self._ordered_trending(offset + limit + 1)[offset:]
+            more = len(questions) > limit
+            questions = questions[:limit]
+            return QuestionPage(questions, encode_cursor(sort, offset=offset + limit) if more else None)
+
+        if sort == POPULAR:
+            keys = self._orders[POPULAR]
+            start = keys.bisect_right((-after[0], -after[1].timestamp(), after[2])) if after else 0
+        else:
+            keys = self._orders[RECENT]
+            start = keys.bisect_right((-after[0].timestamp(), after[1])) if after else 0
+        questions = tuple(self._questions[key[-1]] for key in keys.islice(start, start + limit))
+        more = start + limit < len(keys)
+        return QuestionPage(questions, encode_cursor(sort, questions[-1]) if more else None)
+
+    def _ordered_trending(self, limit: Optional[int]) -> Tuple:
+        unscored = sorted(
+            (self._questions[i] for i in self._unscored if i in self._questions),
+            key=self._recent_key
+        )
+        scored = (self._questions[i] for i in self._trending if i in self._questions)
+        questions = unscored + list(islice(scored, None if limit is None else max(limit - len(unscored), 0)))
+        return tuple(questions[:limit] if limit is not None else questions)
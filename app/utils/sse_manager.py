@@ -1,69 +1,622 @@
 import asyncio
 import json
-from typing import Dict, Set
-from collections import defaultdict
-from dataclasses import dataclass, asdict
+import os
+import random
+import uuid
+from typing import Dict, Set, Callable, Optional, Tuple
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
 
-@dataclass
 class SSEMessage:
-    """Represents an SSE message"""
-    event: str
-    data: dict
-    
+    """
+    Represents an SSE message.
+    The wire frame is encoded once and the same bytes are handed to every
+    subscriber, so treat a message as immutable once it has been broadcast.
+    """
+    __slots__ = ("event", "data", "key", "id", "_frame")
+
+    def __init__(self, event: str, data: dict, key: Optional[str] = None, id: Optional[str] = None):
+        self.event = event
+        self.data = data
+        # Messages sharing a key may be merged when a subscriber's queue overflows
+        self.key = key
+        self.id = id
+        self._frame: Optional[bytes] = None
+
+    def __repr__(self) -> str:
+        return f"SSEMessage(event={self.event!r}, id={self.id!r}, key={self.key!r}, data={self.data!r})"
+
+    @property
+    def frame(self) -> bytes:
+        """Encoded event/id/data frame, computed on first use"""
+        if self._frame is None:
+            head = f"event: {self.event}\n"
+            if self.id is not None:
+                head += f"id: {self.id}\n"
+            self._frame = f"{head}data: {json.dumps(self.data, separators=(',', ':'))}\n\n".encode("utf-8")
+        return self._frame
+
+    def with_id(self, id: str) -> "SSEMessage":
+        """Copy carrying a sequence id; the copy encodes its own frame"""
+        return SSEMessage(self.event, self.data, key=self.key, id=id)
+
     def format(self) -> str:
         """Format as SSE message"""
-        return f"event: {self.event}\ndata: {json.dumps(self.data)}\n\n"
+        return self.frame.decode("utf-8")
+
+# Frames that never change are encoded once at import
+CONNECTED_FRAME = b"retry: 3000\n" + SSEMessage("connected", {"status": "connected"}).frame
+KEEPALIVE_FRAME = b": keepalive\n\n"
+# Queued by the heartbeat ticker; streams write its frame like any other message
+KEEPALIVE = SSEMessage("keepalive", {})
+KEEPALIVE._frame = KEEPALIVE_FRAME
+
+# Audiences: each event has a public channel and a moderator channel
+PUBLIC = "public"
+MODERATORS = "moderators"
+AUDIENCES = (PUBLIC, MODERATORS)
+
+# Overflow policies applied when a subscriber's queue is full
+DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+COALESCE = "coalesce"        # Merge into a queued update for the same question, else drop oldest
+DISCONNECT = "disconnect"    # Evict the subscriber; the client reconnects and refetches
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+@dataclass
+class ChannelConfig:
+    """Per-event subscriber queue and broadcast coalescing settings"""
+    maxsize: int = int(os.getenv('SSE_QUEUE_MAXSIZE', 100))
+    policy: str = os.getenv('SSE_OVERFLOW_POLICY', COALESCE)
+    # Hold keyed updates this long and send them as one batch (0 = off)
+    coalesce_ms: int = int(os.getenv('SSE_COALESCE_WINDOW_MS', 0))
+    # Flush early once this many distinct questions are pending
+    max_batch: int = int(os.getenv('SSE_COALESCE_MAX_BATCH', 50))
+
+    def __post_init__(self):
+        if self.policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {self.policy}")
+        if self.coalesce_ms < 0 or self.max_batch < 1:
+            raise ValueError("coalesce_ms must be >= 0 and max_batch >= 1")
+
+@dataclass
+class SSEStats:
+    """Fan-out counters, used to size queue maxsize"""
+    delivered: int = 0   # Messages queued to a subscriber
+    dropped: int = 0     # Queued messages discarded on overflow
+    coalesced: int = 0   # Messages merged into an already queued update
+    evicted: int = 0     # Subscribers disconnected on overflow
+    max_depth: int = 0   # Deepest queue seen
+    replayed: int = 0    # Frames resent to reconnecting clients
+    resyncs: int = 0     # Reconnects whose gap was too old to replay
+    suppressed: int = 0  # Broadcasts folded into a batch by the coalescing window
+    batches: int = 0     # Batched frames sent by the coalescing window
+    failed_flushes: int = 0  # Coalesced batches the backend failed to publish (kept and retried)
+    bytes_by_audience: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(AUDIENCES, 0))
+
+    def as_dict(self) -> dict:
+        return {**self.__dict__, "bytes_by_audience": dict(self.bytes_by_audience)}
+
+def merge_question_updates(older: SSEMessage, newer: SSEMessage) -> SSEMessage:
+    """Fold two queued updates for the same question into the latest state"""
+    if "question" not in newer.data:
+        return newer
+    older_action = older.data.get("action")
+    newer_action = newer.data.get("action")
+    data = {
+        "action": newer_action if older_action == newer_action else "updated",
+        "question": {**older.data.get("question", {}), **newer.data.get("question", {})}
+    }
+    # Keep the latest rendered card; clients patch the merged like count into it
+    html = newer.data.get("html") or older.data.get("html")
+    if html:
+        data["html"] = html
+    return SSEMessage(event=newer.event, data=data, key=newer.key, id=newer.id)
+
+class Subscriber:
+    """
+    Bounded outbox for one SSE connection.
+    offer() never suspends, so a slow client can't stall the broadcaster.
+    """
+    __slots__ = ("config", "audience", "accept", "closed", "active", "due", "_buffer", "_waiter")
+
+    def __init__(self, config: ChannelConfig, audience: str = PUBLIC,
+                 accept: Optional[Callable[[SSEMessage], bool]] = None):
+        self.config = config
+        self.audience = audience
+        # Optional per-subscriber filter; rejected messages are skipped
+        self.accept = accept
+        self.closed = False
+        # Heartbeat bookkeeping: set on every delivery, checked by the ticker
+        self.active = False
+        self.due = 0.0
+        self._buffer: deque = deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def qsize(self) -> int:
+        return len(self._buffer)
+
+    def empty(self) -> bool:
+        return not self._buffer
+
+    def offer(self, message: SSEMessage, stats: SSEStats) -> bool:
+        """Queue a message without waiting. Returns False if the subscriber was evicted."""
+        if self.closed:
+            return False
+        if self.accept is not None and not self.accept(message):
+            return True
+
+        if len(self._buffer) >= self.config.maxsize:
+            if self.config.policy == DISCONNECT:
+                stats.evicted += 1
+                self.close()
+                return False
+            if self.config.policy == COALESCE and message.key is not None:
+                for index, queued in enumerate(self._buffer):
+                    if queued.key == message.key:
+                        self._buffer[index] = merge_question_updates(queued, message)
+                        stats.coalesced += 1
+                        return True
+            self._buffer.popleft()
+            stats.dropped += 1
+
+        self._buffer.append(message)
+        stats.delivered += 1
+        stats.bytes_by_audience[self.audience] += len(message.frame)
+        if len(self._buffer) > stats.max_depth:
+            stats.max_depth = len(self._buffer)
+        self.active = True
+        self._wake()
+        return True
+
+    def keepalive(self):
+        """Queue a keepalive comment if nothing else is waiting to be sent"""
+        if not self.closed and not self._buffer:
+            self._buffer.append(KEEPALIVE)
+            self._wake()
+
+    async def get(self) -> Optional[SSEMessage]:
+        """Wait for the next message. Returns None once the subscriber is closed."""
+        while not self._buffer:
+            if self.closed:
+                return None
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._buffer.popleft()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+class ReplayBuffer:
+    """Ring buffer of an event's most recent frames, for Last-Event-ID resume"""
+    __slots__ = ("seq", "frames")
+
+    def __init__(self, size: int):
+        self.seq = 0  # Monotonically increasing per event
+        self.frames: deque = deque(maxlen=size)
+
+    def append(self, message: SSEMessage) -> int:
+        self.seq += 1
+        self.frames.append((self.seq, message))
+        return self.seq
+
+    def since(self, seq: int) -> Optional[list]:
+        """Messages after seq, or None if the gap is no longer buffered"""
+        if seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        if not self.frames or self.frames[0][0] > seq + 1:
+            return None
+        return [message for frame_seq, message in self.frames if frame_seq > seq]
+
+# Callback used by backends to hand a message to this process's subscribers
+DeliverFn = Callable[[int, SSEMessage, str], None]
+
+class InProcessBackend:
+    """Broadcast backend that only reaches subscribers in this process (default)"""
+
+    def __init__(self):
+        self._deliver: Optional[DeliverFn] = None
+
+    async def start(self, deliver: DeliverFn):
+        self._deliver = deliver
+
+    async def stop(self):
+        self._deliver = None
+
+    async def publish(self, event_id: int, message: SSEMessage, audience: str = PUBLIC):
+        if self._deliver:
+            self._deliver(event_id, message, audience)
+
+class PostgresBackend:
+    """
+    Broadcast backend that publishes each message once with Postgres NOTIFY.
+    Every instance (including the publisher) LISTENs on the channel and fans
+    the message out to its own subscribers.
+    """
+
+    CHANNEL = "qa_sse"
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._deliver: Optional[DeliverFn] = None
+        self._listener = None
+        self._inbox: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def _db(self):
+        # Imported lazily so the in-process backend works without a database
+        from db.connection import db_manager
+        return db_manager
+
+    async def start(self, deliver: DeliverFn):
+        self._deliver = deliver
+        self._inbox = asyncio.Queue()
+        self._worker = asyncio.create_task(self._drain_inbox())
+        self._listener = self._db.listener(self.channel, self._on_payload)
+        await self._listener.start()
+
+    async def stop(self):
+        self._deliver = None
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+        if self._listener:
+            await self._listener.stop()
+            self._listener = None
+
+    async def publish(self, event_id: int, message: SSEMessage, audience: str = PUBLIC):
+        payload = json.dumps({
+            "event_id": event_id,
+            "audience": audience,
+            "event": message.event,
+            "data": message.data,
+            "key": message.key
+        })
+        if len(payload.encode("utf-8")) > self._db.MAX_NOTIFY_PAYLOAD_BYTES:
+            # Too large for NOTIFY: clients are told to refetch instead
+            payload = json.dumps({
+                "event_id": event_id,
+                "audience": audience,
+                "event": "resync",
+                "data": {"reason": "payload_too_large"}
+            })
+        await self._db.notify(self.channel, payload)
+
+    def _on_payload(self, payload: str):
+        # Called from the asyncpg protocol; keep ordering by queueing for one worker
+        self._inbox.put_nowait(payload)
+
+    async def _drain_inbox(self):
+        while True:
+            payload = await self._inbox.get()
+            try:
+                raw = json.loads(payload)
+                message = SSEMessage(event=raw["event"], data=raw["data"], key=raw.get("key"))
+                self._deliver(raw["event_id"], message, raw.get("audience", PUBLIC))
+            except Exception as e:
+                print(f"SSE backend dropped malformed notification: {e}")
+
+def create_backend(name: Optional[str] = None):
+    """Create the broadcast backend selected by SSE_BACKEND ("memory" or "postgres")"""
+    name = (name or os.getenv('SSE_BACKEND', 'memory')).lower()
+    if name == 'postgres':
+        return PostgresBackend()
+    if name == 'memory':
+        return InProcessBackend()
+    raise ValueError(f"Unknown SSE backend: {name}")
 
 class SSEManager:
     """Manages Server-Sent Events for Q&A updates"""
-    
-    def __init__(self):
-        # Dictionary mapping event_id -> set of queues
-        self._connections: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
-    
-    async def subscribe(self, event_id: int) -> asyncio.Queue:
-        """Subscribe to updates for a specific event"""
-        queue = asyncio.Queue(maxsize=100)
-        self._connections[event_id].add(queue)
-        return queue
-    
-    def unsubscribe(self, event_id: int, queue: asyncio.Queue):
+
+    REPLAY_BUFFER_SIZE = int(os.getenv('SSE_REPLAY_BUFFER', 256))
+    # Idle streams get a keepalive every interval plus up to jitter seconds,
+    # spread out so thousands of connections don't all ping on the same tick
+    HEARTBEAT_INTERVAL = float(os.getenv('SSE_HEARTBEAT_SECONDS', 30))
+    HEARTBEAT_JITTER = float(os.getenv('SSE_HEARTBEAT_JITTER', 5))
+    HEARTBEAT_TICK = 1.0
+
+    def __init__(self, backend=None):
+        # Dictionary mapping (event_id, audience) -> set of subscribers
+        self._connections: Dict[Tuple[int, str], Set[Subscriber]] = defaultdict(set)
+        self._channel_config: Dict[int, ChannelConfig] = {}
+        # Frame ids are "<epoch>-<seq>"; the epoch changes on restart so ids
+        # from another process (or instance) trigger a resync, not a bad replay
+        self._epoch = uuid.uuid4().hex[:8]
+        self._replay: Dict[Tuple[int, str], ReplayBuffer] = {}
+        self._backend = backend or InProcessBackend()
+        self._started = False
+        # Keyed updates held by the coalescing window, per (event_id, audience)
+        self._pending: Dict[Tuple[int, str], Dict[str, SSEMessage]] = {}
+        self._flush_tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.stats = SSEStats()
+
+    async def start(self):
+        """Start the broadcast backend (call once on app startup)"""
+        if not self._started:
+            await self._backend.start(self._fan_out)
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+            self._started = True
+
+    async def stop(self):
+        """Stop the broadcast backend (call on app shutdown)"""
+        for channel in list(self._pending):
+            await self._flush(channel)
+        # Batches that still failed are dropped; clients resync when they reconnect
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        self._pending.clear()
+        if self._started:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+            await self._backend.stop()
+            self._started = False
+
+    def configure_channel(
+        self,
+        event_id: int,
+        maxsize: Optional[int] = None,
+        policy: Optional[str] = None,
+        coalesce_ms: Optional[int] = None,
+        max_batch: Optional[int] = None
+    ):
+        """
+        Override settings for an event.
+        maxsize and policy apply to new subscribers; coalesce_ms and max_batch
+        apply to the next broadcast.
+        """
+        current = self.channel_config(event_id)
+        self._channel_config[event_id] = ChannelConfig(
+            maxsize=maxsize if maxsize is not None else current.maxsize,
+            policy=policy or current.policy,
+            coalesce_ms=coalesce_ms if coalesce_ms is not None else current.coalesce_ms,
+            max_batch=max_batch if max_batch is not None else current.max_batch
+        )
+
+    def channel_config(self, event_id: int) -> ChannelConfig:
+        return self._channel_config.get(event_id) or ChannelConfig()
+
+    async def subscribe(
+        self,
+        event_id: int,
+        last_event_id: Optional[str] = None,
+        audience: str = PUBLIC,
+        accept: Optional[Callable[[SSEMessage], bool]] = None
+    ) -> Subscriber:
+        """
+        Subscribe to updates for a specific event.
+
+        Args:
+            event_id: Event to follow
+            last_event_id: Last-Event-ID sent by a reconnecting EventSource. Missed
+                frames are replayed from the ring buffer; if the gap is too old a
+                single "resync" frame is queued instead.
+            audience: PUBLIC (guests) or MODERATORS
+            accept: Optional filter; messages it rejects are not queued
+        """
+        if not self._started:
+            await self.start()
+        subscriber = Subscriber(self.channel_config(event_id), audience, accept)
+        subscriber.due = asyncio.get_running_loop().time() + self._heartbeat_delay()
+        if last_event_id:
+            self._resume(event_id, subscriber, last_event_id)
+        self._connections[(event_id, audience)].add(subscriber)
+        return subscriber
+
+    def _heartbeat_delay(self) -> float:
+        return self.HEARTBEAT_INTERVAL + random.uniform(0, self.HEARTBEAT_JITTER)
+
+    async def _heartbeat(self):
+        """
+        One ticker per process keeps every idle stream alive.
+        Streams that received a frame since the last tick are pushed back;
+        the rest get the shared keepalive frame once their deadline passes.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.HEARTBEAT_TICK)
+            now = loop.time()
+            for subscribers in list(self._connections.values()):
+                for subscriber in subscribers:
+                    if subscriber.active:
+                        subscriber.active = False
+                        subscriber.due = now + self._heartbeat_delay()
+                    elif now >= subscriber.due:
+                        subscriber.keepalive()
+                        subscriber.due = now + self._heartbeat_delay()
+
+    def _replay_buffer(self, event_id: int, audience: str) -> ReplayBuffer:
+        buffer = self._replay.get((event_id, audience))
+        if buffer is None:
+            buffer = self._replay[(event_id, audience)] = ReplayBuffer(self.REPLAY_BUFFER_SIZE)
+        return buffer
+
+    def _frame_id(self, seq: int) -> str:
+        return f"{self._epoch}-{seq}"
+
+    def _resume(self, event_id: int, subscriber: Subscriber, last_event_id: str):
+        """Queue the frames a reconnecting client missed"""
+        buffer = self._replay_buffer(event_id, subscriber.audience)
+        epoch, _, seq = last_event_id.partition("-")
+        missed = buffer.since(int(seq)) if epoch == self._epoch and seq.isdigit() else None
+
+        if missed is not None and len(missed) <= subscriber.config.maxsize:
+            for message in missed:
+                subscriber.offer(message, self.stats)
+            self.stats.replayed += len(missed)
+        else:
+            # Carry the current id so the next reconnect resumes from here
+            resync = SSEMessage("resync", {"reason": "gap_too_old"}, id=self._frame_id(buffer.seq))
+            subscriber.offer(resync, self.stats)
+            self.stats.resyncs += 1
+
+    def unsubscribe(self, event_id: int, subscriber: Subscriber):
         """Unsubscribe from updates"""
-        if event_id in self._connections:
-            self._connections[event_id].discard(queue)
-            if not self._connections[event_id]:
-                del self._connections[event_id]
-    
-    async def broadcast(self, event_id: int, message: SSEMessage):
-        """Broadcast a message to all subscribers of an event"""
-        if event_id not in self._connections:
+        channel = (event_id, subscriber.audience)
+        if channel in self._connections:
+            self._connections[channel].discard(subscriber)
+            if not self._connections[channel]:
+                del self._connections[channel]
+
+    async def broadcast(self, event_id: int, message: SSEMessage, audience: str = PUBLIC):
+        """
+        Broadcast a message to one audience of an event, on every instance.
+
+        With a coalescing window configured, keyed updates are held and merged
+        per question, then sent as a single "question_batch" frame when the
+        window closes or max_batch questions are pending. Unkeyed messages
+        (creates, deletes) flush anything pending first to keep ordering.
+        """
+        if not self._started:
+            await self.start()
+
+        channel = (event_id, audience)
+        config = self.channel_config(event_id)
+        if config.coalesce_ms and message.key:
+            pending = self._pending.setdefault(channel, {})
+            if message.key in pending:
+                pending[message.key] = merge_question_updates(pending[message.key], message)
+                self.stats.suppressed += 1
+            else:
+                pending[message.key] = message
+
+            if len(pending) >= config.max_batch:
+                await self._flush(channel)
+            elif channel not in self._flush_tasks:
+                self._flush_tasks[channel] = asyncio.create_task(
+                    self._flush_later(channel, config.coalesce_ms / 1000)
+                )
             return
-        
-        # Create list to avoid modification during iteration
-        queues = list(self._connections[event_id])
-        
-        for queue in queues:
-            try:
-                # Non-blocking put with timeout
-                await asyncio.wait_for(queue.put(message), timeout=1.0)
-            except asyncio.TimeoutError:
-                # Remove slow consumers
-                self.unsubscribe(event_id, queue)
-            except Exception:
-                # Remove failed queues
-                self.unsubscribe(event_id, queue)
-    
-    async def send_question_update(self, event_id: int, question_data: dict, action: str):
-        """Send a question update (new, updated, deleted)"""
-        message = SSEMessage(
+
+        if channel in self._pending:
+            await self._flush(channel)
+        await self._backend.publish(event_id, message, audience)
+
+    async def _flush_later(self, channel: Tuple[int, str], delay: float):
+        await asyncio.sleep(delay)
+        await self._flush(channel)
+
+    async def _flush(self, channel: Tuple[int, str]):
+        """Publish the updates held for a channel as one frame"""
+        task = self._flush_tasks.pop(channel, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        pending = self._pending.pop(channel, None)
+        if not pending:
+            return
+
+        updates = list(pending.values())
+        if len(updates) == 1:
+            message = updates[0]
+        else:
+            message = SSEMessage("question_batch", {"updates": [m.data for m in updates]})
+        event_id, audience = channel
+        try:
+            await self._backend.publish(event_id, message, audience)
+        except Exception as e:
+            # Runs in a fire-and-forget task, so nothing else would see the error
+            self.stats.failed_flushes += 1
+            print(f"SSE batch publish failed, will retry: {e}")
+            self._restore(channel, pending)
+            return
+        if len(updates) > 1:
+            self.stats.suppressed += len(updates) - 1
+            self.stats.batches += 1
+
+    def _restore(self, channel: Tuple[int, str], batch: Dict[str, SSEMessage]):
+        """Put back a batch that wasn't published, merging newer updates held meanwhile, and retry after a window"""
+        newer = self._pending.get(channel, {})
+        restored = dict(batch)
+        for key, message in newer.items():
+            restored[key] = merge_question_updates(restored[key], message) if key in restored else message
+        self._pending[channel] = restored
+        if channel not in self._flush_tasks:
+            delay = self.channel_config(channel[0]).coalesce_ms / 1000
+            self._flush_tasks[channel] = asyncio.create_task(self._flush_later(channel, delay))
+
+    def _fan_out(self, event_id: int, message: SSEMessage, audience: str = PUBLIC):
+        """
+        Deliver a message to this process's subscribers of an event channel.
+        Runs in O(subscribers) without suspending; full queues are handled
+        by the channel's overflow policy instead of waiting on the client.
+        """
+        # Sequence and buffer every frame, even with no local subscribers,
+        # so clients reconnecting to this instance can catch up
+        buffer = self._replay_buffer(event_id, audience)
+        # A copy, so a frame already encoded without (or with another) id is never reused
+        message = message.with_id(self._frame_id(buffer.seq + 1))
+        buffer.append(message)
+
+        subscribers = self._connections.get((event_id, audience))
+        if not subscribers:
+            return
+
+        # Encode once; every queue shares the same immutable frame
+        message.frame
+        evicted = [s for s in subscribers if not s.offer(message, self.stats)]
+        for subscriber in evicted:
+            self.unsubscribe(event_id, subscriber)
+
+    async def send_question_update(
+        self,
+        event_id: int,
+        question_data: dict,
+        action: str,
+        html: Optional[str] = None,
+        moderator_html: Optional[str] = None
+    ):
+        """
+        Send a question update ("created", "updated", "like_updated", "hidden", "deleted").
+
+        Moderators get every update. Guests only hear about visible questions,
+        plus an id-only notice when one leaves their list, so pending question
+        text is never fanned out to the public channel.
+        html and moderator_html are the guest and moderator cards, rendered
+        once on the server for clients to swap in.
+        """
+        await self.broadcast(event_id, self._question_message(question_data, action, moderator_html), audience=MODERATORS)
+
+        question_id = question_data["id"]
+        if action == "hidden" or (action == "deleted" and question_data.get("is_visible", True)):
+            public = self._question_message({"id": question_id, "is_visible": False}, action)
+        elif question_data.get("is_visible") is True:
+            public = self._question_message(question_data, action, html)
+        else:
+            return
+        await self.broadcast(event_id, public, audience=PUBLIC)
+
+    @staticmethod
+    def _question_message(question_data: dict, action: str, html: Optional[str] = None) -> SSEMessage:
+        data = {"action": action, "question": question_data}
+        if html is not None:
+            data["html"] = html
+        return SSEMessage(
             event="question_update",
-            data={
-                "action": action,  # "created", "updated", "deleted"
-                "question": question_data
-            }
+            data=data,
+            # Only in-place updates may be merged; creates and deletes must arrive
+            key=f"question:{question_data['id']}" if action in ("updated", "like_updated") else None
         )
-        await self.broadcast(event_id, message)
-    
+
+    async def send_stats_update(self, event_id: int, **deltas: int):
+        """
+        Send changes to the moderator question counters (total, visible, answered).
+        Deltas are never merged by the coalescing window, so each one is applied once.
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if deltas:
+            await self.broadcast(event_id, SSEMessage(event="question_stats", data=deltas), audience=MODERATORS)
+
     async def send_like_update(self, event_id: int, question_id: str, likes_count: int):
         """Send a like count update"""
         message = SSEMessage(
@@ -71,9 +624,10 @@ class SSEManager:
             data={
                 "question_id": question_id,
                 "likes_count": likes_count
-            }
+            },
+            key=f"likes:{question_id}"
         )
         await self.broadcast(event_id, message)
 
-# Global SSE manager instance
-sse_manager = SSEManager()
+# Global SSE manager instance (backend chosen by SSE_BACKEND env var)
+sse_manager = SSEManager(create_backend())